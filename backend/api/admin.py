@@ -0,0 +1,135 @@
+"""
+Admin endpoints for library maintenance
+"""
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Depends, Header
+from backend.app.config import settings
+from backend.app.models import ReindexRequest, ReindexJob, IndexGenerationInfo
+from backend.services.reindex import reindex_service
+from backend.services.index_generations import index_manager
+from backend.services.maintenance import maintenance_service
+from dataclasses import asdict
+from typing import List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Reject requests without the configured admin token (admin routes are disabled when unset)"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if x_admin_token != settings.admin_token:
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", dependencies=[Depends(require_admin)])
+
+
+async def run_reindex_job(job_id: str):
+    """Background task wrapper; errors are recorded on the job row"""
+    try:
+        await reindex_service.run(job_id)
+    except Exception as e:
+        logger.error(f"Reindex job {job_id} failed: {e}")
+
+
+@router.post("/reindex", response_model=ReindexJob)
+async def start_reindex(request: ReindexRequest, background_tasks: BackgroundTasks):
+    """
+    Re-chunk and re-embed videos from their stored transcripts
+    
+    No YouTube or Whisper calls are made. When the embedding model or chunk
+    parameters differ from the active index, a new index generation is
+    built alongside it and activated once complete. Each index partition
+    (default, multilingual) is reindexed by its own job. Poll
+    GET /admin/reindex/{job_id} for progress.
+    """
+    job_id = await reindex_service.create_job(
+        video_ids=request.video_ids,
+        chunk_size=request.chunk_size,
+        chunk_overlap=request.chunk_overlap,
+        batch_size=request.batch_size,
+        concurrency=request.concurrency,
+        embedding_model=request.embedding_model,
+        partition=request.partition
+    )
+    background_tasks.add_task(run_reindex_job, job_id)
+    return ReindexJob(**await reindex_service.get_job(job_id))
+
+
+@router.get("/reindex", response_model=List[ReindexJob])
+async def list_reindex_jobs(limit: int = 20):
+    """Most recent reindex jobs"""
+    return [ReindexJob(**job) for job in await reindex_service.list_jobs(limit)]
+
+
+@router.get("/reindex/{job_id}", response_model=ReindexJob)
+async def get_reindex_job(job_id: str):
+    """Progress of a reindex job"""
+    job = await reindex_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+    return ReindexJob(**job)
+
+
+@router.post("/reindex/{job_id}/resume", response_model=ReindexJob)
+async def resume_reindex_job(job_id: str, background_tasks: BackgroundTasks):
+    """Continue an interrupted or failed job with the videos not yet done"""
+    job = await reindex_service.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reindex job not found")
+    if reindex_service.is_running(job_id):
+        raise HTTPException(status_code=409, detail="Reindex job is already running")
+    
+    background_tasks.add_task(run_reindex_job, job_id)
+    return ReindexJob(**job)
+
+
+@router.get("/index/generations", response_model=List[IndexGenerationInfo])
+async def list_index_generations():
+    """Every index generation with its model, dimension and chunk parameters"""
+    return [IndexGenerationInfo(**asdict(g)) for g in await index_manager.list_generations()]
+
+
+@router.post("/index/generations/{generation_id}/activate", response_model=IndexGenerationInfo)
+async def activate_index_generation(generation_id: int):
+    """Flip queries to a generation (also rolls back to a retired, uncollected one)"""
+    try:
+        generation = await index_manager.activate(generation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return IndexGenerationInfo(**asdict(generation))
+
+
+@router.post("/index/generations/{generation_id}/retire")
+async def retire_index_generation(generation_id: int):
+    """Abandon a generation that is still being built"""
+    try:
+        await index_manager.retire(generation_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"generation_id": generation_id, "status": "retired"}
+
+
+@router.post("/index/gc")
+async def collect_index_garbage(grace_seconds: Optional[float] = None):
+    """Drop generations retired longer than the grace period"""
+    return {"collected": await index_manager.collect_garbage(grace_seconds)}
+
+
+@router.post("/maintenance")
+async def run_maintenance():
+    """Run a maintenance pass now (orphan cleanup, incremental VACUUM, PRAGMA optimize)"""
+    try:
+        return await maintenance_service.run()
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/maintenance")
+async def get_maintenance_status():
+    """Result of the last maintenance pass"""
+    return {
+        "interval_seconds": settings.maintenance_interval_seconds,
+        "last_run": maintenance_service.last_run
+    }
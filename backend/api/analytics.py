@@ -0,0 +1,91 @@
+"""
+Library analytics endpoint
+"""
+from fastapi import APIRouter
+from backend.app.models import AnalyticsResponse, ChannelStats, StageTiming, DailyIngestions
+from backend.database.db import db
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+@router.get("/analytics", response_model=AnalyticsResponse)
+async def get_analytics(top_channels: int = 10, days: int = 7):
+    """
+    Get aggregated library statistics
+    
+    Totals, status counts and per-channel/per-stage figures are read from
+    summary tables that triggers keep up to date on every insert, status
+    transition and delete, so the cost does not grow with the library.
+    """
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            "SELECT status, video_count, total_duration FROM video_status_stats"
+        )
+        status_rows = await cursor.fetchall()
+        
+        cursor = await conn.execute("SELECT name, value FROM library_counters")
+        counters = {row[0]: row[1] for row in await cursor.fetchall()}
+        
+        cursor = await conn.execute(
+            """SELECT channel_name, video_count, completed_count, total_duration
+               FROM channel_stats WHERE video_count > 0
+               ORDER BY video_count DESC LIMIT ?""",
+            (top_channels,)
+        )
+        channel_rows = await cursor.fetchall()
+        
+        cursor = await conn.execute(
+            """SELECT stage, run_count, total_ms, max_ms
+               FROM stage_stats WHERE run_count > 0 ORDER BY total_ms DESC"""
+        )
+        stage_rows = await cursor.fetchall()
+        
+        # Range scan over idx_videos_created_id, bounded by the window not the library
+        cursor = await conn.execute(
+            """SELECT date(created_at) AS day, COUNT(*) FROM videos
+               WHERE created_at >= datetime('now', ?)
+               GROUP BY day ORDER BY day ASC""",
+            (f"-{days} days",)
+        )
+        daily_rows = await cursor.fetchall()
+    finally:
+        await conn.close()
+    
+    status_counts = {row[0]: row[1] for row in status_rows if row[1] > 0}
+    total_videos = sum(status_counts.values())
+    total_duration = sum(row[2] for row in status_rows)
+    completed = status_counts.get("completed", 0)
+    completed_duration = next((row[2] for row in status_rows if row[0] == "completed"), 0.0)
+    
+    return AnalyticsResponse(
+        total_videos=total_videos,
+        status_counts=status_counts,
+        success_rate=round(completed / total_videos * 100, 1) if total_videos else 0.0,
+        total_duration=total_duration,
+        completed_duration=completed_duration,
+        average_duration=total_duration / total_videos if total_videos else 0.0,
+        total_chunks=int(counters.get("total_chunks", 0)),
+        total_segments=int(counters.get("total_segments", 0)),
+        top_channels=[
+            ChannelStats(
+                channel_name=c[0],
+                video_count=c[1],
+                completed_count=c[2],
+                total_duration=c[3]
+            )
+            for c in channel_rows
+        ],
+        stage_timings=[
+            StageTiming(
+                stage=s[0],
+                run_count=s[1],
+                average_ms=s[2] / s[1],
+                max_ms=s[3]
+            )
+            for s in stage_rows
+        ],
+        daily_ingestions=[DailyIngestions(date=d[0], count=d[1]) for d in daily_rows]
+    )
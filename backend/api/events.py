@@ -0,0 +1,128 @@
+"""
+Live ingestion progress endpoints (Server-Sent Events and WebSocket)
+"""
+from fastapi import APIRouter, HTTPException, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.progress import progress_bus, TERMINAL_STATUSES
+from typing import Dict, Optional
+import asyncio
+import json
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+async def _stored_progress(video_id: str) -> Optional[Dict]:
+    """Progress snapshot from SQLite for videos without an active job"""
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            "SELECT status, progress_step, progress_percent, error_message FROM videos WHERE video_id = ?",
+            (video_id,)
+        )
+        row = await cursor.fetchone()
+    finally:
+        await conn.close()
+
+    if not row:
+        return None
+    event = {"video_id": video_id, "status": row[0], "step": row[1], "percent": row[2], "ts": time.time()}
+    if row[3]:
+        event["error"] = row[3]
+    return event
+
+
+def _format_sse(event: Dict) -> str:
+    return f"event: progress\ndata: {json.dumps(event)}\n\n"
+
+
+@router.get("/videos/{video_id}/events")
+async def video_events(video_id: str, request: Request):
+    """
+    Stream ingestion progress for one video as Server-Sent Events
+
+    The first event is the current state; the stream ends after the
+    completed/failed event. Comment lines are sent as keep-alives.
+    """
+    # Subscribe before reading the snapshot so no event falls in between
+    subscription = progress_bus.subscribe({video_id})
+    initial = progress_bus.snapshot(video_id) or await _stored_progress(video_id)
+    if initial is None:
+        progress_bus.unsubscribe(subscription)
+        raise HTTPException(status_code=404, detail="Video not found")
+
+    async def stream():
+        try:
+            yield _format_sse(initial)
+            if initial.get("status") in TERMINAL_STATUSES:
+                return
+            while not await request.is_disconnected():
+                event = await subscription.get(timeout=settings.progress_heartbeat_seconds)
+                if event is None:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield _format_sse(event)
+                if event.get("status") in TERMINAL_STATUSES:
+                    return
+        finally:
+            progress_bus.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.websocket("/ws/progress")
+async def progress_socket(websocket: WebSocket, video_ids: Optional[str] = None):
+    """
+    Multiplexed progress feed for all active ingestion jobs
+
+    Sends {"type": "snapshot", "jobs": [...]} on connect, then one
+    {"type": "progress", ...event} message per update. Pass a comma
+    separated ``video_ids`` query parameter to only follow some videos.
+    """
+    await websocket.accept()
+    wanted = {v for v in video_ids.split(",") if v} if video_ids else None
+    subscription = progress_bus.subscribe(wanted)
+    try:
+        jobs = [job for job in progress_bus.snapshot() if subscription.wants(job["video_id"])]
+        await websocket.send_json({"type": "snapshot", "jobs": jobs})
+
+        # Incoming messages are ignored, but reading them notices disconnects
+        receiver = asyncio.create_task(_drain(websocket))
+        try:
+            while True:
+                getter = asyncio.create_task(subscription.queue.get())
+                done, _ = await asyncio.wait(
+                    {getter, receiver},
+                    timeout=settings.progress_heartbeat_seconds,
+                    return_when=asyncio.FIRST_COMPLETED
+                )
+                if getter not in done:
+                    getter.cancel()
+                if receiver in done:
+                    break
+                if getter in done:
+                    await websocket.send_json({"type": "progress", **getter.result()})
+                else:
+                    await websocket.send_json({"type": "heartbeat", "ts": time.time()})
+        finally:
+            receiver.cancel()
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        progress_bus.unsubscribe(subscription)
+
+
+async def _drain(websocket: WebSocket):
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
@@ -2,21 +2,37 @@
 Video ingestion endpoint
 """
 from fastapi import APIRouter, HTTPException, BackgroundTasks
+from backend.app.config import settings
 from backend.app.models import IngestRequest, IngestResponse, IngestionStatus
 from backend.database.db import db
 from backend.services.whisper_service import whisper_service
-from backend.services.chunking import chunking_service
+from backend.services.chunking import ChunkingService
 from backend.services.embedding_service import embedding_service
 from backend.services.vector_store import vector_store
 from backend.services.youtube_metadata import youtube_metadata_service
-from backend.services.question_generator import question_generator_service
+from backend.services.suggestions import suggestion_service
+from backend.services.summaries import summary_service
+from backend.services.tracing import tracer, Trace
+from backend.services.metrics import videos_ingested, chunks_indexed, segments_stored
+from backend.services.progress import progress_bus
+from backend.services.fetch_cache import fetch_cache
+from backend.services.transcript_store import transcript_store
+from backend.services.index_generations import index_manager, IndexGeneration, partition_for_language
+from backend.services.audio_stream import AudioSegmentStream
+from backend.services.audio_segmentation import (
+    PlannedSegment, detect_silences, plan_segments, stitch_transcripts, target_segment_bytes,
+    whisper_encoder_args
+)
 from youtube_transcript_api import YouTubeTranscriptApi
 from youtube_transcript_api._errors import TranscriptsDisabled, NoTranscriptFound
 import yt_dlp
+import asyncio
+import json
 import os
 from pathlib import Path
 import logging
 import re
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -38,46 +54,99 @@ def extract_video_id(youtube_url: str) -> str:
     raise ValueError("Invalid YouTube URL")
 
 
-async def get_youtube_transcript(video_id: str) -> tuple[list[dict], str, float]:
+def select_transcript(transcripts: list):
+    """
+    Pick the best caption track in any language
+    
+    Order: a manual track in a preferred language (settings.transcript_languages,
+    in order), a generated one in a preferred language, a manual track in the
+    spoken language (the language of YouTube's generated track), any generated
+    track, then any manual track. Nothing is machine-translated.
+    """
+    manual = [t for t in transcripts if not t.is_generated]
+    generated = [t for t in transcripts if t.is_generated]
+    
+    for code in settings.preferred_transcript_languages:
+        for transcript in manual:
+            if transcript.language_code == code:
+                return transcript
+    for code in settings.preferred_transcript_languages:
+        for transcript in generated:
+            if transcript.language_code == code:
+                return transcript
+    spoken = {t.language_code for t in generated}
+    for transcript in manual:
+        if transcript.language_code in spoken:
+            return transcript
+    if generated:
+        return generated[0]
+    if manual:
+        return manual[0]
+    raise LookupError("Transcript list is empty")
+
+
+async def get_youtube_transcript(video_id: str) -> tuple[list[dict], str, float, str | None]:
     """
     Get transcript from YouTube's official API (preferred method)
     
     Returns:
-        (segments, title, duration) where segments = [{"text": str, "start": float, "end": float}, ...]
+        (segments, title, duration, language) where segments = [{"text": str, "start": float, "end": float}, ...]
+        and language is the caption track's language code
+    
+    Transcripts are kept in the fetch cache per preferred-language list, so
+    changing TRANSCRIPT_LANGUAGES selects tracks afresh. The fact that a video
+    has none is cached for settings.transcript_miss_cache_seconds only; title
+    and duration come from the cached yt-dlp info dict.
     """
+    variant = "youtube:" + ",".join(settings.preferred_transcript_languages)
     try:
-        # Get transcript
-        transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
-        
-        # Try to get English transcript, or the first available one
+        cached = fetch_cache.get(video_id, "transcript", variant)
+        if cached is not None and cached.get("error"):
+            if time.time() - cached.get("cached_at", 0) < settings.transcript_miss_cache_seconds:
+                raise LookupError(f"No transcript available (cached): {cached['error']}")
+            cached = None  # Expired: captions may have been added since
+        
+        if cached is not None:
+            segments, language = cached["segments"], cached.get("language")
+        else:
+            # Get transcript list (off the event loop: metadata is fetched concurrently).
+            # Raises TranscriptsDisabled/NoTranscriptFound right here for videos without captions.
+            transcript_list = await asyncio.to_thread(YouTubeTranscriptApi.list_transcripts, video_id)
+            
+            transcript = select_transcript(list(transcript_list))
+            language = transcript.language_code
+            
+            entries = await asyncio.to_thread(transcript.fetch)
+            
+            # Convert to our format
+            segments = []
+            for entry in entries:
+                segments.append({
+                    "text": entry['text'],
+                    "start": entry['start'],
+                    "end": entry['start'] + entry['duration']
+                })
+            fetch_cache.put(video_id, "transcript", {"segments": segments, "language": language}, variant)
+        
+        # Shares the extraction done by the (concurrent) metadata step
         try:
-            transcript = transcript_list.find_transcript(['en', 'en-US', 'en-GB'])
-        except:
-            transcript = transcript_list.find_generated_transcript(['en', 'en-US', 'en-GB'])
-        
-        entries = transcript.fetch()
-        
-        # Convert to our format
-        segments = []
-        for entry in entries:
-            segments.append({
-                "text": entry['text'],
-                "start": entry['start'],
-                "end": entry['start'] + entry['duration']
-            })
-        
-        # Get video metadata using yt-dlp (no download)
-        ydl_opts = {'quiet': True, 'no_warnings': True}
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False)
-            title = info.get('title', 'Unknown')
-            duration = info.get('duration', 0)
+            info = await youtube_metadata_service.get_info(video_id)
+        except Exception as e:
+            # The transcript is still usable without title and duration
+            logger.warning(f"yt-dlp info unavailable for {video_id}: {e}")
+            info = {}
+        title = info.get('title', 'Unknown')
+        duration = info.get('duration') or (segments[-1]["end"] if segments else 0)
         
-        logger.info(f"Retrieved YouTube transcript for {video_id} ({len(segments)} segments)")
-        return segments, title, float(duration)
+        logger.info(f"Retrieved YouTube transcript for {video_id} ({len(segments)} segments, {language})")
+        return segments, title, float(duration), language
         
     except (TranscriptsDisabled, NoTranscriptFound) as e:
         logger.warning(f"No transcript available for {video_id}: {e}")
+        fetch_cache.put(video_id, "transcript", {"error": type(e).__name__, "cached_at": time.time()}, variant)
+        raise
+    except LookupError as e:
+        logger.warning(f"{e} for {video_id}")
         raise
     except Exception as e:
         logger.error(f"Failed to get transcript for {video_id}: {e}")
@@ -115,13 +184,17 @@ async def download_audio(youtube_url: str, video_id: str) -> tuple[str, str, flo
         },
     }
     
-    try:
+    def _download():
         with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(youtube_url, download=True)
-            title = info.get('title', 'Unknown')
-            duration = info.get('duration', 0)
-            ext = info.get('ext', 'm4a')
-            
+            return ydl.extract_info(youtube_url, download=True)
+    
+    try:
+        # In a thread so the concurrent metadata fetch keeps running
+        info = await asyncio.to_thread(_download)
+        title = info.get('title', 'Unknown')
+        duration = info.get('duration', 0)
+        ext = info.get('ext', 'm4a')
+        
         audio_path = str(output_dir / f"{video_id}.{ext}")
         
         # Check file size
@@ -181,9 +254,37 @@ async def download_audio_segment(youtube_url: str, video_id: str, start_time: in
         raise
 
 
-async def split_audio_with_ffmpeg(audio_path: str, video_id: str, duration: float) -> list[str]:
+async def transcode_audio(audio_path: str, video_id: str) -> str:
+    """
+    Re-encode audio to 16 kHz mono Opus for a much smaller Whisper upload
+    
+    Args:
+        audio_path: Path to downloaded audio file
+        video_id: Video ID
+        
+    Returns:
+        Path to the transcoded .ogg file
+    """
+    import subprocess
+    
+    output_path = str(Path("downloads") / f"{video_id}.whisper.ogg")
+    cmd = ['ffmpeg', '-y', '-i', audio_path, '-vn', *whisper_encoder_args(), output_path]
+    
+    try:
+        await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"FFmpeg transcoding failed: {e.stderr}")
+        raise
+    
+    original_mb = os.path.getsize(audio_path) / (1024 * 1024)
+    transcoded_mb = os.path.getsize(output_path) / (1024 * 1024)
+    logger.info(f"Transcoded audio for Whisper: {original_mb:.1f}MB -> {transcoded_mb:.1f}MB")
+    return output_path
+
+
+async def split_audio_with_ffmpeg(audio_path: str, video_id: str, duration: float) -> list[tuple[str, PlannedSegment]]:
     """
-    Split audio file into smaller segments using FFmpeg
+    Split audio file into silence-aligned, size-targeted segments using FFmpeg
     
     Args:
         audio_path: Path to audio file
@@ -191,49 +292,51 @@ async def split_audio_with_ffmpeg(audio_path: str, video_id: str, duration: floa
         duration: Total duration in seconds
         
     Returns:
-        List of paths to audio segments
+        List of (segment path, planned segment)
     """
     import subprocess
     
-    chunk_duration_minutes = 5  # 5-minute chunks to ensure under 25MB
-    chunk_duration_seconds = chunk_duration_minutes * 60
-    num_chunks = int(duration / chunk_duration_seconds) + (1 if duration % chunk_duration_seconds > 0 else 0)
+    with tracer.span("silencedetect"):
+        silences, detected_duration = await asyncio.to_thread(detect_silences, audio_path)
+    duration = detected_duration or duration
+    plan = plan_segments(duration, os.path.getsize(audio_path), silences)
     
-    logger.info(f"Splitting {duration/60:.1f} minute file into {num_chunks} segments of {chunk_duration_minutes} minutes each")
+    logger.info(f"Splitting {duration/60:.1f} minute file into {len(plan)} segments "
+                f"({len(silences)} silences detected)")
     
-    segment_paths = []
+    segments = []
     output_dir = Path("downloads")
+    extension = Path(audio_path).suffix or ".m4a"
     
-    for i in range(num_chunks):
-        start_time = i * chunk_duration_seconds
-        segment_duration = min(chunk_duration_seconds, duration - start_time)
-        
-        segment_path = str(output_dir / f"{video_id}_seg{i}.m4a")
+    for planned in plan:
+        segment_path = str(output_dir / f"{video_id}_seg{planned.index}{extension}")
         
         # Use FFmpeg to extract segment (audio-only, no re-encoding)
         cmd = [
             'ffmpeg', '-y',
+            '-ss', f"{planned.start:.3f}",
             '-i', audio_path,
-            '-ss', str(start_time),
-            '-t', str(segment_duration),
+            '-t', f"{planned.duration:.3f}",
             '-vn',  # No video
             '-acodec', 'copy',  # Copy audio codec (no re-encoding, fast)
             segment_path
         ]
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True, text=True)
-            segment_paths.append(segment_path)
+            await asyncio.to_thread(subprocess.run, cmd, check=True, capture_output=True, text=True)
+            segments.append((segment_path, planned))
             segment_size_mb = os.path.getsize(segment_path) / (1024 * 1024)
-            logger.info(f"Created segment {i+1}/{num_chunks}: {segment_size_mb:.1f}MB")
+            logger.info(f"Created segment {planned.index+1}/{len(plan)}: "
+                        f"{planned.start:.1f}-{planned.end:.1f}s, {segment_size_mb:.1f}MB")
         except subprocess.CalledProcessError as e:
-            logger.error(f"FFmpeg failed for segment {i}: {e.stderr}")
+            logger.error(f"FFmpeg failed for segment {planned.index}: {e.stderr}")
             raise
     
-    return segment_paths
+    return segments
 
 
-async def transcribe_with_chunking(youtube_url: str, video_id: str, duration: float, audio_path: str = None) -> list[dict]:
+async def transcribe_with_chunking(youtube_url: str, video_id: str, duration: float,
+                                   audio_path: str = None) -> tuple[list[dict], bool]:
     """
     Transcribe video by splitting audio file into segments
     
@@ -244,55 +347,118 @@ async def transcribe_with_chunking(youtube_url: str, video_id: str, duration: fl
         audio_path: Optional already-downloaded audio file
         
     Returns:
-        List of segments with text, start, end
+        (segments, complete) where segments have text, start, end and complete
+        is False if any audio segment failed to transcribe (and was skipped)
     """
     if audio_path:
-        file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+        file_size = os.path.getsize(audio_path)
+        file_size_mb = file_size / (1024 * 1024)
         
-        # If file is under 25MB, transcribe directly
-        if file_size_mb <= 25:
-            return await whisper_service.transcribe_audio(audio_path)
+        # If file is under the target size, transcribe directly
+        if file_size <= target_segment_bytes():
+            with tracer.span("transcribe_segment", segment=0):
+                return await whisper_service.transcribe_audio(audio_path), True
         
         # File too large - split using FFmpeg
-        logger.info(f"File size ({file_size_mb:.1f}MB) exceeds 25MB. Splitting with FFmpeg...")
+        logger.info(f"File size ({file_size_mb:.1f}MB) exceeds the segment target. Splitting with FFmpeg...")
         
-        segment_paths = await split_audio_with_ffmpeg(audio_path, video_id, duration)
+        with tracer.span("split"):
+            segment_files = await split_audio_with_ffmpeg(audio_path, video_id, duration)
         os.remove(audio_path)  # Remove large file
         
-        all_segments = []
-        chunk_duration_seconds = 5 * 60  # 5 minutes per chunk
+        parts = []
+        failed = 0
         
-        for i, segment_path in enumerate(segment_paths):
+        for segment_path, planned in segment_files:
             segment_size_mb = os.path.getsize(segment_path) / (1024 * 1024)
-            logger.info(f"Transcribing segment {i+1}/{len(segment_paths)} ({segment_size_mb:.1f}MB)...")
+            logger.info(f"Transcribing segment {planned.index+1}/{len(segment_files)} ({segment_size_mb:.1f}MB)...")
             
             try:
-                chunk_segments = await whisper_service.transcribe_audio(segment_path)
+                with tracer.span("transcribe_segment", segment=planned.index):
+                    chunk_segments = await whisper_service.transcribe_audio(segment_path)
                 
                 # Adjust timestamps by adding offset
-                offset_seconds = i * chunk_duration_seconds
                 for segment in chunk_segments:
-                    segment['start'] += offset_seconds
-                    segment['end'] += offset_seconds
-                    all_segments.append(segment)
+                    segment['start'] += planned.start
+                    segment['end'] += planned.start
+                parts.append((planned, chunk_segments))
                 
                 # Clean up segment file
                 os.remove(segment_path)
                 
             except Exception as e:
-                logger.error(f"Failed to transcribe segment {i+1}: {e}")
+                logger.error(f"Failed to transcribe segment {planned.index+1}: {e}")
                 os.remove(segment_path)
+                failed += 1
                 continue
         
-        logger.info(f"Completed transcription: {len(all_segments)} total segments from {len(segment_paths)} chunks")
-        return all_segments
+        # Segments overlap at each cut; keep one copy of the words heard twice
+        all_segments = stitch_transcripts(parts)
+        logger.info(f"Completed transcription: {len(all_segments)} total segments from {len(segment_files)} chunks")
+        return all_segments, failed == 0
     
     # Should not reach here
     raise ValueError("No audio path provided for chunking")
 
 
-async def update_progress(video_id: str, step: str, percent: float):
-    """Update ingestion progress"""
+async def transcribe_streaming(youtube_url: str, video_id: str,
+                               duration: float) -> tuple[list[dict], str, float, bool]:
+    """
+    Transcribe audio segments as they are cut from the download stream
+    
+    Each segment is sent to Whisper as soon as ffmpeg closes it and deleted
+    afterwards, so the full audio file never touches the disk.
+    
+    Returns:
+        (segments, video_title, duration_seconds, complete) where complete is
+        False if any audio segment failed to transcribe (and was skipped)
+    """
+    all_segments = []
+    failed = 0
+    async with AudioSegmentStream(youtube_url, video_id) as stream:
+        title = stream.title
+        duration = stream.duration or duration
+        total = max(int(duration // stream.segment_seconds) + 1, 1) if duration else None
+        
+        async for audio_segment in stream:
+            segment_size_mb = os.path.getsize(audio_segment.path) / (1024 * 1024)
+            logger.info(f"Transcribing streamed segment {audio_segment.index + 1}"
+                        f"{f'/{total}' if total else ''} ({segment_size_mb:.1f}MB)...")
+            try:
+                with tracer.span("transcribe_segment", segment=audio_segment.index):
+                    chunk_segments = await whisper_service.transcribe_audio(str(audio_segment.path))
+                
+                # Segment timestamps restart at zero; shift them to the source position
+                for segment in chunk_segments:
+                    segment['start'] += audio_segment.start
+                    segment['end'] += audio_segment.start
+                    all_segments.append(segment)
+            except Exception as e:
+                logger.error(f"Failed to transcribe segment {audio_segment.index + 1}: {e}")
+                failed += 1
+            finally:
+                stream.release(audio_segment)
+            
+            if total:
+                done = min(audio_segment.index + 1, total)
+                await update_progress(video_id, f"Transcribing ({done}/{total})", 20 + 40 * done / total)
+    
+    logger.info(f"Completed streamed transcription: {len(all_segments)} total segments")
+    return all_segments, title, duration, failed == 0
+
+
+async def update_progress(video_id: str, step: str, percent: float, force: bool = False):
+    """
+    Publish ingestion progress to live subscribers
+    
+    The SQLite copy (read by /videos and after restarts) is coalesced to
+    one write per progress_write_interval per video; ``force`` writes
+    through, which the final step of a job uses.
+    """
+    progress_bus.publish(video_id, step=step, percent=percent)
+    if not progress_bus.should_persist(video_id, force):
+        return
+    
     conn = await db.get_connection()
     try:
         await conn.execute(
@@ -305,23 +471,128 @@ async def update_progress(video_id: str, step: str, percent: float):
         await conn.close()
 
 
-async def process_video_ingestion(video_id: str, youtube_url: str):
-    """Background task to process video ingestion"""
+async def clear_derived_data(video_id: str):
+    """Remove transcripts, chunks, vectors and suggestions so a video can be re-ingested"""
+    for generation in index_manager.live_generations():
+        await vector_store.delete_video_chunks(video_id, generation.collection_name)
+    conn = await db.get_connection()
     try:
-        # Update status to processing
-        conn = await db.get_connection()
-        try:
+        for table in ("transcripts", "chunks", "question_suggestions", "video_summaries"):
+            await conn.execute(f"DELETE FROM {table} WHERE video_id = ?", (video_id,))
+        await conn.execute(
+            """UPDATE videos SET status = ?, progress_step = NULL, progress_percent = 0,
+               error_message = NULL, updated_at = CURRENT_TIMESTAMP WHERE video_id = ?""",
+            (IngestionStatus.PENDING.value, video_id)
+        )
+        await conn.commit()
+    finally:
+        await conn.close()
+    transcript_store.invalidate(video_id, delete=True)
+    progress_bus.publish(video_id, status=IngestionStatus.PENDING.value, step=None, percent=0.0)
+
+
+async def save_transcript_segments(video_id: str, segments: list[dict]):
+    """Persist transcript segments for a video"""
+    conn = await db.get_connection()
+    try:
+        for idx, segment in enumerate(segments):
             await conn.execute(
-                "UPDATE videos SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE video_id = ?",
-                (IngestionStatus.PROCESSING.value, video_id)
+                """INSERT INTO transcripts (video_id, segment_index, text, start_time, end_time)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (video_id, idx, segment["text"], segment["start"], segment["end"])
             )
-            await conn.commit()
-        finally:
-            await conn.close()
-        
-        await update_progress(video_id, "Fetching metadata", 5)
-        
-        # Get metadata first
+        await conn.commit()
+    finally:
+        await conn.close()
+
+
+async def save_chunks(video_id: str, chunks: list[dict], chunk_ids: list[str], generation_id: int = None):
+    """Persist chunk metadata alongside their ChromaDB ids"""
+    if generation_id is None:
+        generation_id = index_manager.active.generation_id
+    conn = await db.get_connection()
+    try:
+        for chunk, chunk_id in zip(chunks, chunk_ids):
+            await conn.execute(
+                """INSERT INTO chunks (chunk_id, video_id, text, start_time, end_time, chunk_index, generation_id)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (chunk_id, video_id, chunk["text"] if settings.chunk_text_in_sqlite else "",
+                 chunk["start_time"], chunk["end_time"], chunk["chunk_index"], generation_id)
+            )
+        await conn.commit()
+    finally:
+        await conn.close()
+
+
+async def save_ingestion_stages(video_id: str, trace: Trace):
+    """Record the duration of every pipeline stage of an ingestion trace"""
+    conn = await db.get_connection()
+    try:
+        stage_names = {trace.root.span_id: None}
+        stage_names.update({span.span_id: span.name for span in trace.spans})
+        for span in trace.spans:
+            await conn.execute(
+                """INSERT INTO ingestion_stages
+                   (video_id, trace_id, stage, parent_stage, duration_ms, started_at, attributes, error)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                (video_id, trace.trace_id, span.name, stage_names.get(span.parent_id),
+                 span.duration_ms, span.start_unix_ns / 1e9,
+                 json.dumps(span.attributes) if span.attributes else None, span.error)
+            )
+        await conn.commit()
+    finally:
+        await conn.close()
+
+
+async def process_video_ingestion(video_id: str, youtube_url: str):
+    """Background task to process video ingestion"""
+    with tracer.start_trace("ingest", video_id=video_id) as trace:
+        await run_ingestion_pipeline(video_id, youtube_url)
+    
+    try:
+        await save_ingestion_stages(video_id, trace)
+    except Exception as e:
+        logger.warning(f"Failed to record ingestion stages for {video_id}: {e}")
+
+
+async def index_segments(video_id: str, segments: list[dict], generation: IndexGeneration,
+                         report_progress: bool = True) -> list[dict]:
+    """Chunk, embed and store a transcript in one index generation, returning the chunks"""
+    if report_progress:
+        await update_progress(video_id, "Creating chunks", 70)
+    
+    # Step 3: Chunk transcript
+    logger.info(f"Chunking transcript for {video_id} (index generation {generation.generation_id})")
+    with tracer.span("chunk", generation=generation.generation_id):
+        chunks = ChunkingService(generation.chunk_size, generation.chunk_overlap).chunk_transcript(segments)
+    
+    if report_progress:
+        await update_progress(video_id, "Generating embeddings", 80)
+    
+    # Step 4: Generate embeddings
+    logger.info(f"Generating embeddings for {video_id}")
+    texts = [chunk["text"] for chunk in chunks]
+    with tracer.span("embed", chunks=len(chunks), generation=generation.generation_id):
+        embeddings = embedding_service.generate_embeddings(texts, generation.embedding_model)
+    
+    if report_progress:
+        await update_progress(video_id, "Indexing", 90)
+    
+    # Step 5: Store in ChromaDB
+    logger.info(f"Storing in ChromaDB for {video_id}")
+    with tracer.span("index", generation=generation.generation_id):
+        chunk_ids = await vector_store.add_chunks(video_id, chunks, embeddings, generation.collection_name)
+    
+    # Step 6: Store chunk metadata in database
+    with tracer.span("save_chunks", generation=generation.generation_id):
+        await save_chunks(video_id, chunks, chunk_ids, generation.generation_id)
+    chunks_indexed.inc(len(chunk_ids))
+    return chunks
+
+
+async def fetch_metadata(video_id: str) -> dict:
+    """Fetch video metadata and store it on the video row"""
+    with tracer.span("metadata"):
         metadata = await youtube_metadata_service.get_metadata(video_id)
         
         # Update database with metadata
@@ -336,106 +607,169 @@ async def process_video_ingestion(video_id: str, youtube_url: str):
             await conn.commit()
         finally:
             await conn.close()
-        
-        await update_progress(video_id, "Getting transcript", 15)
-        
-        # Step 1: Try to get YouTube transcript (fast, no download)
-        logger.info(f"Attempting to get YouTube transcript for {video_id}")
+    return metadata
+
+
+async def transcribe_audio_fallback(youtube_url: str, video_id: str,
+                                    metadata_task: asyncio.Task) -> tuple[list[dict], str, float]:
+    """
+    Transcribe a video without captions with Whisper
+    
+    Starts while the metadata fetch may still be running: the audio paths
+    resolve title and duration themselves, and only the cached-transcript
+    path waits for the metadata. Transcripts with skipped (failed) segments
+    are used but not cached, so a later ingest retries the missing audio.
+    
+    Returns:
+        (segments, video_title, duration_seconds)
+    """
+    segments = fetch_cache.get(video_id, "whisper", whisper_service.cache_variant)
+    if segments is not None:
+        logger.info(f"Using cached Whisper transcript for {video_id}")
+        metadata = await metadata_task
+        return segments, metadata['title'], metadata['duration']
+    
+    title, duration = 'Unknown', 0.0
+    if metadata_task.done() and not metadata_task.cancelled() and metadata_task.exception() is None:
+        title, duration = metadata_task.result()['title'], metadata_task.result()['duration']
+    
+    segments, complete = None, False
+    if settings.audio_streaming and AudioSegmentStream.available():
+        await update_progress(video_id, "Transcribing", 20)
+        logger.info(f"Streaming audio for {video_id} into Whisper")
         try:
-            segments, title, duration = await get_youtube_transcript(video_id)
-            logger.info(f"Successfully retrieved YouTube transcript for {video_id}")
-        except Exception as transcript_error:
-            # Fallback: Download audio and transcribe with Whisper
-            logger.warning(f"Transcript unavailable, falling back to audio download: {transcript_error}")
-            await update_progress(video_id, "Downloading audio", 20)
-            logger.info(f"Downloading audio for {video_id}")
+            with tracer.span("transcribe", streaming=True):
+                segments, title, duration, complete = await transcribe_streaming(youtube_url, video_id, duration)
+        except Exception as e:
+            logger.warning(f"Streaming transcription failed, downloading the full file instead: {e}")
+            segments = None
+    
+    if segments is None:
+        await update_progress(video_id, "Downloading audio", 20)
+        logger.info(f"Downloading audio for {video_id}")
+        with tracer.span("download"):
             audio_path, title, duration = await download_audio(youtube_url, video_id)
-            
-            await update_progress(video_id, "Transcribing", 40)
-            logger.info(f"Transcribing audio for {video_id} (duration: {duration/60:.1f} minutes)")
-            segments = await transcribe_with_chunking(youtube_url, video_id, duration, audio_path)
-            
-            # Clean up audio file
-            if os.path.exists(audio_path):
+        
+        if settings.audio_transcode and AudioSegmentStream.available():
+            try:
+                with tracer.span("transcode"):
+                    transcoded_path = await transcode_audio(audio_path, video_id)
                 os.remove(audio_path)
+                audio_path = transcoded_path
+            except Exception as e:
+                logger.warning(f"Transcoding failed, uploading the original audio: {e}")
         
-        await update_progress(video_id, "Saving transcript", 60)
+        await update_progress(video_id, "Transcribing", 40)
+        logger.info(f"Transcribing audio for {video_id} (duration: {duration/60:.1f} minutes)")
+        with tracer.span("transcribe"):
+            segments, complete = await transcribe_with_chunking(youtube_url, video_id, duration, audio_path)
         
-        # Step 2: Save segments to database
+        # Clean up audio file
+        if os.path.exists(audio_path):
+            os.remove(audio_path)
+    
+    if segments and complete:
+        fetch_cache.put(video_id, "whisper", segments, whisper_service.cache_variant)
+    elif segments:
+        logger.warning(f"Not caching partial Whisper transcript for {video_id}")
+    return segments, title, duration
+
+
+async def audio_language(video_id: str) -> str | None:
+    """Spoken language of a video transcribed from audio, as reported by yt-dlp"""
+    try:
+        info = await youtube_metadata_service.get_info(video_id)
+    except Exception as e:
+        logger.warning(f"Language unknown for {video_id}: {e}")
+        return None
+    return info.get('language')
+
+
+async def run_ingestion_pipeline(video_id: str, youtube_url: str):
+    """Run every ingestion step for a video, marking it failed on error"""
+    try:
+        # Update status to processing
         conn = await db.get_connection()
         try:
-            for idx, segment in enumerate(segments):
-                await conn.execute(
-                    """INSERT INTO transcripts (video_id, segment_index, text, start_time, end_time)
-                       VALUES (?, ?, ?, ?, ?)""",
-                    (video_id, idx, segment["text"], segment["start"], segment["end"])
-                )
+            await conn.execute(
+                "UPDATE videos SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE video_id = ?",
+                (IngestionStatus.PROCESSING.value, video_id)
+            )
             await conn.commit()
         finally:
             await conn.close()
+        progress_bus.publish(video_id, status=IngestionStatus.PROCESSING.value)
         
-        await update_progress(video_id, "Creating chunks", 70)
-        
-        # Step 3: Chunk transcript
-        logger.info(f"Chunking transcript for {video_id}")
-        chunks = chunking_service.chunk_transcript(segments)
-        
-        await update_progress(video_id, "Generating embeddings", 80)
+        await update_progress(video_id, "Fetching metadata", 5)
         
-        # Step 4: Generate embeddings
-        logger.info(f"Generating embeddings for {video_id}")
-        texts = [chunk["text"] for chunk in chunks]
-        embeddings = embedding_service.generate_embeddings(texts)
+        # Metadata and the transcript lookup are independent network calls; run them together
+        metadata_task = asyncio.create_task(fetch_metadata(video_id))
+        try:
+            # Step 1: Try to get YouTube transcript (fast, no download)
+            logger.info(f"Attempting to get YouTube transcript for {video_id}")
+            try:
+                with tracer.span("transcript"):
+                    segments, title, duration, language = await get_youtube_transcript(video_id)
+                logger.info(f"Successfully retrieved YouTube transcript for {video_id}")
+            except Exception as transcript_error:
+                # Fallback: Download audio and transcribe with Whisper, without waiting for metadata
+                logger.warning(f"Transcript unavailable, falling back to audio download: {transcript_error}")
+                segments, title, duration = await transcribe_audio_fallback(youtube_url, video_id, metadata_task)
+                language = await audio_language(video_id)
+            
+            metadata = await metadata_task
+            if title == 'Unknown':
+                title = metadata['title']
+        finally:
+            if not metadata_task.done():
+                metadata_task.cancel()
+                try:
+                    await metadata_task
+                except (asyncio.CancelledError, Exception):
+                    pass
         
-        await update_progress(video_id, "Indexing", 90)
+        await update_progress(video_id, "Saving transcript", 60)
         
-        # Step 5: Store in ChromaDB
-        logger.info(f"Storing in ChromaDB for {video_id}")
-        chunk_ids = await vector_store.add_chunks(video_id, chunks, embeddings)
+        # Step 2: Save segments to database
+        with tracer.span("save_transcript", segments=len(segments)):
+            await save_transcript_segments(video_id, segments)
+            transcript_store.write(video_id, segments)
+        segments_stored.inc(len(segments))
         
-        # Step 6: Store chunk metadata in database
+        # Non-base languages are embedded by the multilingual model in their own partition
+        partition = partition_for_language(language)
         conn = await db.get_connection()
         try:
-            for chunk, chunk_id in zip(chunks, chunk_ids):
-                await conn.execute(
-                    """INSERT INTO chunks (chunk_id, video_id, text, start_time, end_time, chunk_index)
-                       VALUES (?, ?, ?, ?, ?, ?)""",
-                    (chunk_id, video_id, chunk["text"], chunk["start_time"],
-                     chunk["end_time"], chunk["chunk_index"])
-                )
+            await conn.execute(
+                "UPDATE videos SET language = ?, index_partition = ? WHERE video_id = ?",
+                (language, partition, video_id)
+            )
             await conn.commit()
         finally:
             await conn.close()
+        await index_manager.ensure_partition(partition)
+        
+        # Steps 3-6 run for the partition's active index generation and for any generation
+        # being built in the background, so the new one is complete when flipped
+        active_generation, chunks = None, []
+        for generation in index_manager.write_targets(partition):
+            generation_chunks = await index_segments(
+                video_id, segments, generation, report_progress=generation.status == "active"
+            )
+            if generation.status == "active":
+                active_generation, chunks = generation, generation_chunks
         
-        await update_progress(video_id, "Completed", 100)
+        # Step 6b: Section and video summaries for coarse-to-fine retrieval of long videos
+        if active_generation is not None and summary_service.wants_summaries(len(chunks)):
+            await update_progress(video_id, "Summarizing", 95)
+            logger.info(f"Summarizing {len(chunks)} chunks of {video_id}")
+            try:
+                with tracer.span("summaries", chunks=len(chunks)):
+                    await summary_service.build(video_id, title, chunks, active_generation.embedding_model)
+            except Exception as e:
+                logger.warning(f"Failed to summarize {video_id}: {e}")
         
-        # Step 7: Generate suggested questions
-        logger.info(f"Generating suggested questions for {video_id}")
-        try:
-            # Get first few transcript segments for context
-            full_transcript = " ".join([seg["text"] for seg in segments[:50]])  # First 50 segments
-            questions = question_generator_service.generate_questions(
-                transcript=full_transcript,
-                video_title=title,
-                num_questions=5
-            )
-            
-            # Store questions in database
-            if questions:
-                conn = await db.get_connection()
-                try:
-                    for question in questions:
-                        await conn.execute(
-                            """INSERT INTO question_suggestions (video_id, question)
-                               VALUES (?, ?)""",
-                            (video_id, question)
-                        )
-                    await conn.commit()
-                finally:
-                    await conn.close()
-                logger.info(f"Stored {len(questions)} suggested questions for {video_id}")
-        except Exception as e:
-            logger.warning(f"Failed to generate questions for {video_id}: {e}")
+        await update_progress(video_id, "Completed", 100, force=True)
         
         # Step 8: Update status to completed
         conn = await db.get_connection()
@@ -448,12 +782,18 @@ async def process_video_ingestion(video_id: str, youtube_url: str):
         finally:
             await conn.close()
         
+        progress_bus.publish(video_id, status=IngestionStatus.COMPLETED.value)
+        videos_ingested.labels(status="completed").inc()
         logger.info(f"Ingestion completed for {video_id}")
         
+        # Step 9: Suggested questions run in the background, after other ingestions
+        suggestion_service.enqueue(video_id)
+        
     except Exception as e:
         logger.error(f"Ingestion failed for {video_id}: {e}")
+        videos_ingested.labels(status="failed").inc()
         
-        await update_progress(video_id, "Failed", 0)
+        await update_progress(video_id, "Failed", 0, force=True)
         
         # Update status to failed
         conn = await db.get_connection()
@@ -466,6 +806,7 @@ async def process_video_ingestion(video_id: str, youtube_url: str):
             await conn.commit()
         finally:
             await conn.close()
+        progress_bus.publish(video_id, status=IngestionStatus.FAILED.value, error=str(e))
 
 
 @router.post("/ingest", response_model=IngestResponse)
@@ -494,6 +835,19 @@ async def ingest_video(request: IngestRequest, background_tasks: BackgroundTasks
         finally:
             await conn.close()
         
+        if existing and request.force and existing[1] in (
+            IngestionStatus.COMPLETED.value, IngestionStatus.FAILED.value
+        ):
+            # Re-ingest from scratch; fetches are served from the local cache
+            await clear_derived_data(video_id)
+            background_tasks.add_task(process_video_ingestion, video_id, request.youtube_url)
+            return IngestResponse(
+                video_id=video_id,
+                youtube_url=request.youtube_url,
+                status=IngestionStatus.PENDING,
+                message="Video re-ingestion started using cached fetches"
+            )
+        
         if existing:
             return IngestResponse(
                 video_id=video_id,
@@ -513,6 +867,7 @@ async def ingest_video(request: IngestRequest, background_tasks: BackgroundTasks
             await conn.commit()
         finally:
             await conn.close()
+        progress_bus.publish(video_id, status=IngestionStatus.PENDING.value, step=None, percent=0.0)
         
         # Launch background processing
         background_tasks.add_task(process_video_ingestion, video_id, request.youtube_url)
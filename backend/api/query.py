@@ -1,12 +1,30 @@
 """
 Query endpoint for searching video content
 """
-from fastapi import APIRouter, HTTPException
-from backend.app.models import QueryRequest, QueryResponse, Timestamp, VideoInfo, VideoListResponse, QuestionSuggestion
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse
+from backend.app.models import (
+    QueryRequest, QueryResponse, Timestamp, VideoInfo, VideoListResponse, QuestionSuggestion, IngestionStage,
+    IngestionStatus, DeleteVideosResponse
+)
+from backend.app.config import settings
 from backend.database.db import db
 from backend.services.embedding_service import embedding_service
 from backend.services.vector_store import vector_store
+from backend.services.index_generations import index_manager, IndexGeneration
+from backend.services.transcript_store import transcript_store
+from backend.services.maintenance import maintenance_service
+from backend.services.context_expansion import context_expansion_service
+from backend.services.mmr import mmr_select
+from backend.services.summaries import summary_service
+from backend.api.admin import require_admin
 from backend.services.llm_service import llm_service
+from backend.services.tracing import tracer
+from datetime import datetime
+from typing import Optional
+import base64
+import hashlib
+import json
 import re
 import logging
 
@@ -54,15 +72,203 @@ def format_timestamp(seconds: float) -> str:
     return f"{minutes:02d}:{secs:02d}"
 
 
+async def retrieve_chunks(
+    video_id: str,
+    query_embedding: list[float],
+    generation: IndexGeneration,
+    top_k: int,
+    expand_neighbors: bool = False,
+    use_mmr: bool = False,
+    where: Optional[dict] = None
+) -> list[dict]:
+    """
+    Vector search over a video's chunks, formatted as LLM context
+
+    Returns:
+        [{"text", "start_time", "end_time"}, ...] (empty when nothing matched)
+    """
+    with tracer.span("vector_search", top_k=top_k, mmr=use_mmr):
+        results = await vector_store.query_similar(
+            query_embedding=query_embedding,
+            video_id=video_id,
+            top_k=max(settings.mmr_fetch_k, top_k) if use_mmr else top_k,
+            collection_name=generation.collection_name,
+            include_embeddings=use_mmr,
+            where=where
+        )
+    
+    if use_mmr and results['ids'][0]:
+        # Keep a diverse top_k of the candidates instead of near-duplicates from one region
+        with tracer.span("mmr", candidates=len(results['ids'][0])):
+            selected = mmr_select(
+                query_embedding,
+                results['embeddings'][0],
+                [metadata["start_time"] for metadata in results['metadatas'][0]],
+                top_k
+            )
+        results = {
+            key: [[values[0][i] for i in selected]]
+            for key, values in results.items()
+            if key in ("ids", "documents", "metadatas", "distances") and values is not None
+        }
+    
+    if not results['ids'][0]:
+        return []
+    
+    # Format chunks for LLM, straight from the retrieval result when it carries the text
+    chunk_ids = results['ids'][0]
+    documents = (results.get('documents') or [[None] * len(chunk_ids)])[0]
+    metadatas = results['metadatas'][0]
+    if expand_neighbors:
+        # Fewer hits, each widened with adjacent chunks from one SQLite range query
+        with tracer.span("neighbor_expansion", hits=len(chunk_ids)):
+            return await context_expansion_service.expand(video_id, generation, [
+                {
+                    "chunk_id": chunk_id,
+                    "chunk_index": metadata["chunk_index"],
+                    "text": document,
+                    "start_time": metadata["start_time"],
+                    "end_time": metadata["end_time"]
+                }
+                for chunk_id, document, metadata in zip(chunk_ids, documents, metadatas)
+            ])
+    
+    # Only hits backed by a chunk row of this generation count: while a reindex (in this or
+    # another process) swaps the video's chunks, old and new vectors briefly coexist
+    with tracer.span("chunk_lookup"):
+        conn = await db.get_connection()
+        try:
+            placeholders = ','.join('?' * len(chunk_ids))
+            cursor = await conn.execute(
+                f"""SELECT chunk_id, text, start_time, end_time FROM chunks
+                    WHERE chunk_id IN ({placeholders}) AND generation_id = ?""",
+                [*chunk_ids, generation.generation_id]
+            )
+            rows = {row[0]: row for row in await cursor.fetchall()}
+        finally:
+            await conn.close()
+    
+    # Keep the retrieval order; prefer the vector document, chunk rows may hold no text
+    return [
+        {
+            "text": document or rows[chunk_id][1] or "",
+            "start_time": rows[chunk_id][2],
+            "end_time": rows[chunk_id][3]
+        }
+        for chunk_id, document in zip(chunk_ids, documents)
+        if chunk_id in rows
+    ]
+
+
+async def answer_question(
+    video_id: str,
+    question: str,
+    youtube_url: str,
+    generation: IndexGeneration,
+    retrieval_mode: Optional[str] = None,
+    use_mmr: Optional[bool] = None
+) -> QueryResponse:
+    """
+    Retrieval and LLM answer for one question (the /query pipeline after the video lookup)
+
+    Also run ahead of time for suggested questions, see services/suggestions.py.
+    """
+    retrieval_mode = retrieval_mode or settings.retrieval_mode
+    use_mmr = settings.mmr_enabled if use_mmr is None else use_mmr
+    
+    # Generate query embedding
+    with tracer.span("embed_query"):
+        query_embedding = embedding_service.embed_query(question, generation.embedding_model)
+    
+    # Search ChromaDB
+    plan = None
+    if retrieval_mode == "hierarchical":
+        # Coarse step: rank the section summaries (None for videos without summaries)
+        with tracer.span("summary_search"):
+            plan = await summary_service.plan(video_id, query_embedding, generation.embedding_model)
+    
+    if plan is not None and plan.broad:
+        # Broad question: answered from a handful of summaries instead of raw chunks
+        context_chunks = plan.summaries
+    elif plan is not None:
+        # Fine step: chunks starting inside the chosen sections only
+        spans = [
+            {"$and": [{"start_time": {"$gte": s["start_time"]}}, {"start_time": {"$lt": s["end_time"]}}]}
+            for s in plan.sections
+        ]
+        context_chunks = plan.summaries + await retrieve_chunks(
+            video_id, query_embedding, generation, settings.summary_chunk_top_k,
+            expand_neighbors=False, use_mmr=use_mmr,
+            where=spans[0] if len(spans) == 1 else {"$or": spans}
+        )
+    else:
+        context_chunks = await retrieve_chunks(
+            video_id, query_embedding, generation,
+            settings.neighbor_top_k if retrieval_mode == "neighbors" else settings.top_k_results,
+            expand_neighbors=retrieval_mode == "neighbors", use_mmr=use_mmr
+        )
+    
+    if not context_chunks:
+        return QueryResponse(
+            answer="No relevant content found in the video for your question.",
+            timestamps=[],
+            video_id=video_id,
+            sources_used=0
+        )
+    
+    # Generate answer with LLM
+    with tracer.span("llm"):
+        answer = await llm_service.generate_answer(question, context_chunks)
+    
+    # Extract timestamps from answer
+    timestamp_strings = extract_timestamps_from_answer(answer)
+    
+    # Resolve each timestamp to its transcript segment by binary search
+    transcript = await transcript_store.load(video_id) if timestamp_strings else None
+    timestamps = []
+    for ts_str in timestamp_strings:
+        # Parse MM:SS / HH:MM:SS to seconds
+        seconds = 0
+        for part in ts_str.split(':'):
+            seconds = seconds * 60 + int(part)
+        
+        context_text = ""
+        if transcript is not None and len(transcript):
+            context_text = transcript.text_window(transcript.segment_at(seconds), 100) + "..."
+        elif context_chunks:
+            # No stored transcript; fall back to the retrieved chunks
+            matching_chunk = next(
+                (c for c in context_chunks if c["start_time"] <= seconds <= c["end_time"]),
+                context_chunks[0]
+            )
+            context_text = matching_chunk["text"][:100] + "..."
+        
+        timestamps.append(Timestamp(
+            time=ts_str,
+            seconds=seconds,
+            url=f"{youtube_url}&t={seconds}",
+            text=context_text
+        ))
+    
+    return QueryResponse(
+        answer=answer,
+        timestamps=timestamps,
+        video_id=video_id,
+        sources_used=len(context_chunks)
+    )
+
+
 @router.post("/query", response_model=QueryResponse)
 async def query_video(request: QueryRequest):
     """
     Query a video with a natural language question
     
     Process:
-    1. Verify video exists and is completed
+    1. Verify video exists and is completed (and look up a precomputed
+       answer when the question is one of the video's suggestions)
     2. Generate query embedding
-    3. Search ChromaDB for relevant chunks
+    3. Search ChromaDB for relevant chunks (with RETRIEVAL_MODE=hierarchical,
+       section summaries are ranked first)
     4. Generate answer with LLM
     5. Extract and format timestamps
     """
@@ -70,16 +276,21 @@ async def query_video(request: QueryRequest):
         video_id = request.video_id
         question = request.question
         
-        # Check video exists and is completed
-        conn = await db.get_connection()
-        try:
-            cursor = await conn.execute(
-                "SELECT video_id, status, youtube_url FROM videos WHERE video_id = ?",
-                (video_id,)
-            )
-            video = await cursor.fetchone()
-        finally:
-            await conn.close()
+        # Check video exists and is completed; the join finds a precomputed suggestion answer
+        with tracer.span("video_lookup"):
+            conn = await db.get_connection()
+            try:
+                cursor = await conn.execute(
+                    """SELECT v.video_id, v.status, v.youtube_url, v.index_partition,
+                              q.answer, q.timestamps, q.sources_used, q.answer_generation_id
+                       FROM videos v LEFT JOIN question_suggestions q
+                         ON q.video_id = v.video_id AND q.question = ? AND q.answer IS NOT NULL
+                       WHERE v.video_id = ?""",
+                    (question.strip(), video_id)
+                )
+                video = await cursor.fetchone()
+            finally:
+                await conn.close()
         
         if not video:
             raise HTTPException(status_code=404, detail=f"Video {video_id} not found")
@@ -92,85 +303,27 @@ async def query_video(request: QueryRequest):
         
         youtube_url = video[2]
         
-        # Generate query embedding
-        logger.info(f"Processing query for video {video_id}: {question}")
-        query_embedding = embedding_service.generate_embedding(question)
+        # Pin one index generation (of the video's partition) so a concurrent flip cannot
+        # pair a query vector from one embedding model with a collection built by another
+        generation = index_manager.active_for(video[3]) or index_manager.active
         
-        # Search ChromaDB
-        results = await vector_store.query_similar(
-            query_embedding=query_embedding,
-            video_id=video_id
-        )
-        
-        if not results['ids'][0]:
+        # Suggested question answered in the background against the active generation
+        # with the default retrieval settings
+        if (
+            video[4] is not None and video[7] == generation.generation_id and settings.suggestion_answers
+            and request.retrieval_mode is None and request.mmr is None
+        ):
+            logger.info(f"Serving precomputed answer for video {video_id}: {question}")
             return QueryResponse(
-                answer="No relevant content found in the video for your question.",
-                timestamps=[],
+                answer=video[4],
+                timestamps=[Timestamp(**ts) for ts in json.loads(video[5] or "[]")],
                 video_id=video_id,
-                sources_used=0
+                sources_used=video[6] or 0
             )
         
-        # Get chunk metadata from database
-        chunk_ids = results['ids'][0]
-        conn = await db.get_connection()
-        try:
-            placeholders = ','.join('?' * len(chunk_ids))
-            cursor = await conn.execute(
-                f"SELECT chunk_id, text, start_time, end_time FROM chunks WHERE chunk_id IN ({placeholders})",
-                chunk_ids
-            )
-            chunks = await cursor.fetchall()
-        finally:
-            await conn.close()
-        
-        # Format chunks for LLM
-        context_chunks = [
-            {
-                "text": chunk[1],
-                "start_time": chunk[2],
-                "end_time": chunk[3]
-            }
-            for chunk in chunks
-        ]
-        
-        # Generate answer with LLM
-        answer = await llm_service.generate_answer(question, context_chunks)
-        
-        # Extract timestamps from answer
-        timestamp_strings = extract_timestamps_from_answer(answer)
-        
-        # Create timestamp objects with URLs
-        timestamps = []
-        for ts_str in timestamp_strings:
-            # Parse MM:SS to seconds
-            parts = ts_str.split(':')
-            seconds = int(parts[0]) * 60 + int(parts[1])
-            
-            # Find matching chunk for context
-            matching_chunk = None
-            for chunk in context_chunks:
-                if chunk["start_time"] <= seconds <= chunk["end_time"]:
-                    matching_chunk = chunk
-                    break
-            
-            # Default to first chunk if no exact match
-            if not matching_chunk and context_chunks:
-                matching_chunk = context_chunks[0]
-            
-            context_text = matching_chunk["text"][:100] + "..." if matching_chunk else ""
-            
-            timestamps.append(Timestamp(
-                time=ts_str,
-                seconds=seconds,
-                url=f"{youtube_url}&t={seconds}",
-                text=context_text
-            ))
-        
-        return QueryResponse(
-            answer=answer,
-            timestamps=timestamps,
-            video_id=video_id,
-            sources_used=len(context_chunks)
+        logger.info(f"Processing query for video {video_id}: {question}")
+        return await answer_question(
+            video_id, question, youtube_url, generation, request.retrieval_mode, request.mmr
         )
         
     except HTTPException:
@@ -188,7 +341,7 @@ async def get_video(video_id: str):
         cursor = await conn.execute(
             """SELECT video_id, youtube_url, title, duration, thumbnail_url, 
                channel_name, upload_date, view_count, status, progress_step, 
-               progress_percent, created_at 
+               progress_percent, created_at, language 
                FROM videos WHERE video_id = ?""",
             (video_id,)
         )
@@ -211,49 +364,239 @@ async def get_video(video_id: str):
         status=video[8],
         progress_step=video[9],
         progress_percent=video[10],
-        created_at=video[11]
+        created_at=video[11],
+        language=video[12]
     )
 
 
+VIDEO_FIELDS = {
+    "video_id": "video_id",
+    "youtube_url": "youtube_url",
+    "title": "title",
+    "duration": "duration",
+    "thumbnail_url": "thumbnail_url",
+    "channel_name": "channel_name",
+    "upload_date": "upload_date",
+    "view_count": "view_count",
+    "status": "status",
+    "progress_step": "progress_step",
+    "progress_percent": "progress_percent",
+    "created_at": "created_at",
+    "language": "language",
+}
+
+
+def encode_cursor(created_at: str, video_id: str) -> str:
+    """Opaque keyset cursor for the (created_at, video_id) position of a row"""
+    raw = json.dumps([created_at, video_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    """Inverse of encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, video_id = json.loads(base64.urlsafe_b64decode(padded))
+        return str(created_at), str(video_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def video_filters(
+    status: Optional[IngestionStatus] = None,
+    channel: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    title_prefix: Optional[str] = None
+) -> tuple[list[str], list]:
+    """SQL conditions and parameters for the /videos filters"""
+    conditions = []
+    params: list = []
+    if status:
+        conditions.append("status = ?")
+        params.append(status.value)
+    if channel:
+        conditions.append("channel_name = ?")
+        params.append(channel)
+    if created_after:
+        conditions.append("created_at >= ?")
+        params.append(created_after.strftime("%Y-%m-%d %H:%M:%S"))
+    if created_before:
+        conditions.append("created_at < ?")
+        params.append(created_before.strftime("%Y-%m-%d %H:%M:%S"))
+    if title_prefix:
+        conditions.append("title >= ? AND title < ?")
+        params.extend([title_prefix, title_prefix + "\U0010ffff"])
+    return conditions, params
+
+
+async def count_videos(conn, status: Optional[IngestionStatus], channel: Optional[str],
+                       conditions: list[str], params: list) -> int:
+    """Videos matching the /videos filters, from the trigger-maintained counters when they suffice"""
+    if not conditions:
+        cursor = await conn.execute("SELECT COALESCE(SUM(video_count), 0) FROM video_status_stats")
+    elif conditions == ["status = ?"]:
+        cursor = await conn.execute("SELECT video_count FROM video_status_stats WHERE status = ?", (status.value,))
+    elif conditions == ["channel_name = ?"]:
+        cursor = await conn.execute("SELECT video_count FROM channel_stats WHERE channel_name = ?", (channel,))
+    else:
+        cursor = await conn.execute(f"SELECT COUNT(*) FROM videos WHERE {' AND '.join(conditions)}", params)
+    row = await cursor.fetchone()
+    return row[0] if row else 0
+
+
 @router.get("/videos", response_model=VideoListResponse)
-async def list_videos():
-    """List all ingested videos"""
+async def list_videos(
+    request: Request,
+    limit: int = Query(50, ge=1, le=500, description="Page size"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    status: Optional[IngestionStatus] = None,
+    channel: Optional[str] = Query(None, description="Exact channel name"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    title_prefix: Optional[str] = None,
+    fields: Optional[str] = Query(None, description="Comma separated subset of video fields")
+):
+    """
+    List ingested videos, newest first
+    
+    Uses keyset pagination on (created_at, video_id) so every page is an
+    index range scan. ``total`` counts every video matching the filters (from
+    the summary tables when only status or channel is filtered). Responses
+    carry an ETag derived from a counter that
+    triggers bump on every change to the videos table; polls sending a
+    matching If-None-Match get 304 without touching the videos table.
+    """
+    if fields:
+        selected = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in selected if f not in VIDEO_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    else:
+        selected = list(VIDEO_FIELDS)
+    
+    # The cursor needs created_at and video_id even when they are not returned
+    columns = list(dict.fromkeys(selected + ["created_at", "video_id"]))
+    
+    filter_conditions, filter_params = video_filters(status, channel, created_after, created_before, title_prefix)
+    conditions, params = list(filter_conditions), list(filter_params)
+    if cursor:
+        conditions.append("(created_at, video_id) < (?, ?)")
+        params.extend(decode_cursor(cursor))
+    
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
     conn = await db.get_connection()
     try:
-        cursor = await conn.execute(
-            """SELECT video_id, youtube_url, title, duration, thumbnail_url,
-               channel_name, upload_date, view_count, status, progress_step,
-               progress_percent, created_at 
-               FROM videos ORDER BY created_at DESC"""
+        cursor_row = await conn.execute(
+            "SELECT value FROM library_counters WHERE name = 'videos_version'"
         )
-        videos = await cursor.fetchall()
+        version = await cursor_row.fetchone()
+        etag = 'W/"' + hashlib.sha1(
+            f"{version[0] if version else 0}:{request.url.query}".encode("utf-8")
+        ).hexdigest() + '"'
+        cache_headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=cache_headers)
+        
+        cursor_row = await conn.execute(
+            f"""SELECT {', '.join(VIDEO_FIELDS[c] for c in columns)}
+                FROM videos {where}
+                ORDER BY created_at DESC, video_id DESC
+                LIMIT ?""",
+            (*params, limit + 1)
+        )
+        rows = await cursor_row.fetchall()
+        total = await count_videos(conn, status, channel, filter_conditions, filter_params)
     finally:
         await conn.close()
     
-    video_list = [
-        VideoInfo(
-            video_id=v[0],
-            youtube_url=v[1],
-            title=v[2] or "Unknown",
-            duration=v[3] or 0.0,
-            thumbnail_url=v[4],
-            channel_name=v[5],
-            upload_date=v[6],
-            view_count=v[7],
-            status=v[8],
-            progress_step=v[9],
-            progress_percent=v[10],
-            created_at=v[11]
-        )
-        for v in videos
-    ]
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_cursor = None
+    if has_more and rows:
+        last = dict(zip(columns, rows[-1]))
+        next_cursor = encode_cursor(last["created_at"], last["video_id"])
+    
+    if fields:
+        videos = [
+            {name: value for name, value in zip(columns, row) if name in selected}
+            for row in rows
+        ]
+    else:
+        videos = [
+            VideoInfo(
+                video_id=v[0],
+                youtube_url=v[1],
+                title=v[2] or "Unknown",
+                duration=v[3] or 0.0,
+                thumbnail_url=v[4],
+                channel_name=v[5],
+                upload_date=v[6],
+                view_count=v[7],
+                status=v[8],
+                progress_step=v[9],
+                progress_percent=v[10],
+                created_at=v[11],
+                language=v[12]
+            ).model_dump(mode="json")
+            for v in rows
+        ]
     
-    return VideoListResponse(
-        videos=video_list,
-        total=len(video_list)
+    return JSONResponse(
+        content={"videos": videos, "total": total, "next_cursor": next_cursor},
+        headers=cache_headers
     )
 
 
+@router.delete("/videos/{video_id}", response_model=DeleteVideosResponse, dependencies=[Depends(require_admin)])
+async def delete_video(video_id: str):
+    """
+    Delete a video with its transcript, chunks, vectors and cached fetches
+    
+    Requires the admin token like bulk deletion. Returns 409 while the
+    video is being ingested.
+    """
+    if await maintenance_service.is_busy(video_id):
+        raise HTTPException(status_code=409, detail="Video is being ingested")
+    
+    result = await maintenance_service.delete_videos([video_id])
+    if not result["deleted"]:
+        raise HTTPException(status_code=404, detail="Video not found")
+    return DeleteVideosResponse(**result)
+
+
+@router.delete("/videos", response_model=DeleteVideosResponse, dependencies=[Depends(require_admin)])
+async def delete_videos(
+    status: Optional[IngestionStatus] = None,
+    channel: Optional[str] = Query(None, description="Exact channel name"),
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    title_prefix: Optional[str] = None
+):
+    """
+    Delete every video matching the /videos filters
+    
+    At least one filter is required. Videos still being ingested are
+    skipped and listed in ``skipped``.
+    """
+    conditions, params = video_filters(status, channel, created_after, created_before, title_prefix)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="At least one filter is required")
+    
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            f"SELECT video_id FROM videos WHERE {' AND '.join(conditions)}", params
+        )
+        video_ids = [row[0] for row in await cursor.fetchall()]
+    finally:
+        await conn.close()
+    
+    return DeleteVideosResponse(**await maintenance_service.delete_videos(video_ids))
+
+
 @router.get("/videos/{video_id}/suggestions", response_model=list[QuestionSuggestion])
 async def get_video_suggestions(video_id: str):
     """Get suggested questions for a video"""
@@ -290,3 +633,42 @@ async def get_video_suggestions(video_id: str):
         )
         for s in suggestions
     ]
+
+
+@router.get("/videos/{video_id}/stages", response_model=list[IngestionStage])
+async def get_video_stages(video_id: str):
+    """Get per-stage timings of the most recent ingestion run for a video"""
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            "SELECT video_id FROM videos WHERE video_id = ?",
+            (video_id,)
+        )
+        if not await cursor.fetchone():
+            raise HTTPException(status_code=404, detail="Video not found")
+        
+        cursor = await conn.execute(
+            """SELECT stage, parent_stage, duration_ms, started_at, attributes, error
+               FROM ingestion_stages
+               WHERE video_id = ? AND trace_id = (
+                   SELECT trace_id FROM ingestion_stages WHERE video_id = ?
+                   ORDER BY id DESC LIMIT 1
+               )
+               ORDER BY started_at ASC""",
+            (video_id, video_id)
+        )
+        stages = await cursor.fetchall()
+    finally:
+        await conn.close()
+    
+    return [
+        IngestionStage(
+            stage=s[0],
+            parent_stage=s[1],
+            duration_ms=s[2],
+            started_at=s[3],
+            attributes=json.loads(s[4]) if s[4] else {},
+            error=s[5]
+        )
+        for s in stages
+    ]
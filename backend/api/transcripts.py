@@ -0,0 +1,216 @@
+"""
+Transcript and chunk read endpoints with streamed SRT/VTT/JSONL export
+
+Exports are generated row by row (transcripts from the memory-mapped
+column store, chunks from a SQLite cursor) and flushed in small batches,
+so multi-hour transcripts are never held in memory.
+"""
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from backend.app.models import TranscriptSegment, TranscriptResponse, VideoSummary
+from backend.database.db import db
+from backend.services.index_generations import index_manager
+from backend.services.summaries import summary_service
+from backend.services.transcript_store import transcript_store
+from backend.services.vector_store import vector_store
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+# Starlette appends the charset to text/* types itself
+EXPORT_FORMATS = {
+    "jsonl": ("application/x-ndjson; charset=utf-8", "jsonl"),
+    "srt": ("application/x-subrip; charset=utf-8", "srt"),
+    "vtt": ("text/vtt", "vtt"),
+}
+FLUSH_BYTES = 64 * 1024
+CURSOR_BATCH_SIZE = 500
+
+
+def _cue_time(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+def _format_row(row: Dict, number: int, fmt: str) -> str:
+    """One exported record; ``number`` is the 1-based cue number"""
+    if fmt == "jsonl":
+        return json.dumps(row, ensure_ascii=False) + "\n"
+    text = row["text"].strip()
+    if fmt == "srt":
+        return f"{number}\n{_cue_time(row['start'], ',')} --> {_cue_time(row['end'], ',')}\n{text}\n\n"
+    # A literal "-->" inside a WebVTT cue payload would end the cue
+    text = text.replace("-->", "->")
+    return f"{_cue_time(row['start'], '.')} --> {_cue_time(row['end'], '.')}\n{text}\n\n"
+
+
+def _stream_rows(rows: Iterable[Dict], fmt: str) -> Iterator[str]:
+    """Format rows and flush them in batches of about FLUSH_BYTES"""
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+    buffer, size = [], 0
+    for number, row in enumerate(rows, start=1):
+        line = _format_row(row, number, fmt)
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+async def _stream_rows_async(rows: AsyncIterator[Dict], fmt: str) -> AsyncIterator[str]:
+    """Async counterpart of _stream_rows for database cursors"""
+    if fmt == "vtt":
+        yield "WEBVTT\n\n"
+    buffer, size, number = [], 0, 0
+    async for row in rows:
+        number += 1
+        line = _format_row(row, number, fmt)
+        buffer.append(line)
+        size += len(line)
+        if size >= FLUSH_BYTES:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def _export_response(body, video_id: str, suffix: str, fmt: str) -> StreamingResponse:
+    media_type, extension = EXPORT_FORMATS[fmt]
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{video_id}{suffix}.{extension}"'}
+    )
+
+
+def _validate_range(start: Optional[float], end: Optional[float]):
+    if start is not None and end is not None and end < start:
+        raise HTTPException(status_code=400, detail="end must not be before start")
+
+
+@router.get("/videos/{video_id}/transcript", response_model=TranscriptResponse)
+async def get_video_transcript(
+    video_id: str,
+    start: Optional[float] = Query(None, ge=0, description="Range start in seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Range end in seconds"),
+    format: str = Query("json", pattern="^(json|jsonl|srt|vtt)$", description="json, jsonl, srt or vtt")
+):
+    """
+    Get transcript segments overlapping [start, end)
+
+    Served from the memory-mapped column store; SQLite is only read the
+    first time for videos ingested before the store existed. Every format
+    except ``json`` is streamed as a download.
+    """
+    _validate_range(start, end)
+
+    transcript = await transcript_store.load(video_id)
+    if transcript is None:
+        raise HTTPException(status_code=404, detail="Transcript not found")
+
+    if format != "json":
+        # Sync generator: Starlette reads the memory map in its threadpool
+        return _export_response(
+            _stream_rows(transcript.iter_range(start, end), format), video_id, "", format
+        )
+
+    return TranscriptResponse(
+        video_id=video_id,
+        start=start,
+        end=end,
+        total_segments=len(transcript),
+        segments=[TranscriptSegment(**segment) for segment in transcript.iter_range(start, end)]
+    )
+
+
+@router.get("/videos/{video_id}/summaries", response_model=List[VideoSummary])
+async def get_video_summaries(video_id: str):
+    """
+    Get the video summary and section summaries (empty for short videos)
+    """
+    return [
+        VideoSummary(**{key: summary[key] for key in VideoSummary.model_fields})
+        for summary in await summary_service.load(video_id)
+    ]
+
+
+@router.get("/videos/{video_id}/chunks")
+async def get_video_chunks(
+    video_id: str,
+    start: Optional[float] = Query(None, ge=0, description="Range start in seconds"),
+    end: Optional[float] = Query(None, ge=0, description="Range end in seconds"),
+    format: str = Query("jsonl", pattern="^(jsonl|srt|vtt)$", description="jsonl, srt or vtt"),
+    generation_id: Optional[int] = Query(None, description="Index generation (defaults to the active one of the video's partition)")
+):
+    """
+    Stream the indexed chunks of a video overlapping [start, end)
+
+    Rows come from a server-side SQLite cursor in batches; WAL mode keeps
+    the long read from blocking ingestion writes.
+    """
+    _validate_range(start, end)
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute("SELECT index_partition FROM videos WHERE video_id = ?", (video_id,))
+        video = await cursor.fetchone()
+    finally:
+        await conn.close()
+    if not video:
+        raise HTTPException(status_code=404, detail="Video not found")
+    
+    active = index_manager.active_for(video[0]) or index_manager.active
+    generation = await index_manager.get_generation(generation_id or active.generation_id)
+    if generation is None:
+        raise HTTPException(status_code=404, detail="Index generation not found")
+    generation_id = generation.generation_id
+
+    conditions = ["video_id = ?", "generation_id = ?"]
+    params: list = [video_id, generation_id]
+    if start is not None:
+        conditions.append("end_time > ?")
+        params.append(start)
+    if end is not None:
+        conditions.append("start_time < ?")
+        params.append(end)
+
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            f"""SELECT chunk_id, chunk_index, text, start_time, end_time FROM chunks
+                WHERE {' AND '.join(conditions)} ORDER BY chunk_index""",
+            params
+        )
+    except BaseException:
+        await conn.close()
+        raise
+
+    async def rows() -> AsyncIterator[Dict]:
+        try:
+            while True:
+                batch = await cursor.fetchmany(CURSOR_BATCH_SIZE)
+                if not batch:
+                    break
+                # Chunks written with CHUNK_PAYLOAD_STORE=vector keep their text in ChromaDB only
+                missing = [row[0] for row in batch if not row[2]]
+                documents = await vector_store.get_documents(missing, generation.collection_name)
+                for row in batch:
+                    yield {
+                        "chunk_id": row[0],
+                        "index": row[1],
+                        "text": row[2] or documents.get(row[0], ""),
+                        "start": row[3],
+                        "end": row[4],
+                    }
+        finally:
+            await conn.close()
+
+    return _export_response(_stream_rows_async(rows(), format), video_id, "-chunks", format)
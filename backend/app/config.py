@@ -9,29 +9,123 @@ class Settings(BaseSettings):
     
     # API Keys
     openai_api_key: str | None = None
-    groq_api_key: str
+    groq_api_key: str | None = None
     
     # LLM Configuration
-    llm_provider: Literal["groq", "openai"] = "groq"
+    llm_provider: Literal["groq", "openai", "mock"] = "groq"
     llm_model: str = "llama-3.1-70b-versatile"
+    question_model: str = "llama-3.3-70b-versatile"
+    
+    # Mock Provider Configuration (llm_provider="mock", no network)
+    mock_latency_ms: float = 300.0
+    mock_latency_jitter_ms: float = 50.0
+    mock_latency_distribution: Literal["fixed", "uniform", "normal", "lognormal"] = "lognormal"
+    mock_tokens_per_second: float = 250.0
+    mock_transcript_seconds: float = 600.0  # Audio length reported by mock Whisper
+    mock_segment_seconds: float = 5.0
+    mock_seed: int = 0
     
     # Whisper Configuration
     whisper_model: Literal["tiny", "base", "small", "medium", "large"] = "base"
     use_whisper_api: bool = False
     
+    # Whisper fallback audio: stream yt-dlp into ffmpeg segments instead of downloading first
+    audio_streaming: bool = True  # Also requires ffmpeg on PATH
+    audio_segment_seconds: int = 0  # 0 sizes segments to audio_target_segment_mb from the bitrate
+    audio_max_pending_segments: int = 3  # Finished segments on disk before the download pauses
+    
+    # Whisper segment planning (ffmpeg silencedetect, cuts near silences, overlap at each cut)
+    audio_target_segment_mb: float = 20.0  # Capped below the 25 MB Whisper API limit
+    audio_segment_overlap_seconds: float = 1.5
+    silence_noise_db: float = -35.0
+    silence_min_seconds: float = 0.4
+    
+    # Re-encode Whisper uploads to 16 kHz mono Opus (requires ffmpeg)
+    audio_transcode: bool = True
+    audio_transcode_bitrate_kbps: int = 24
+    
     # Embedding Model
     embedding_model: str = "all-MiniLM-L6-v2"
     
+    # Transcript languages and the multilingual index partition
+    transcript_languages: str = "en,en-US,en-GB"  # Preferred caption languages, in order
+    default_partition_languages: str = "en"  # Base languages embedded with embedding_model
+    # Videos in other languages are embedded with this model in their own index partition
+    # (empty: every video uses the default partition)
+    multilingual_embedding_model: str = "paraphrase-multilingual-MiniLM-L12-v2"
+    
     # Database Paths
     chroma_path: str = "./chroma_data"
     sqlite_db_path: str = "./data/videos.db"
     
+    # Fetch Cache (yt-dlp info, transcripts, Whisper output)
+    cache_dir: str = "./cache"
+    cache_max_mb: int = 2048
+    transcript_miss_cache_seconds: int = 86400  # How long "no captions" results are trusted
+    
+    # Columnar transcript store (memory-mapped segment times and text)
+    transcript_store_path: str = "./data/transcripts"
+    
     # Chunking Configuration
     chunk_size: int = 300
     chunk_overlap: int = 50
     
+    # Where chunk text is stored: "vector" (ChromaDB documents), "sqlite" (chunks.text) or "both".
+    # Applies to chunks written from now on; run a reindex to convert existing ones.
+    chunk_payload_store: Literal["vector", "sqlite", "both"] = "both"
+    
+    # Index Generations
+    index_gc_grace_seconds: float = 300.0  # Keep retired generations this long for in-flight queries
+    index_state_poll_seconds: float = 2.0  # Checks for generation changes made by other processes (0 disables)
+    
+    # Background Maintenance (incremental VACUUM, PRAGMA optimize, vector compaction)
+    maintenance_interval_seconds: float = 6 * 3600.0  # 0 disables the background loop
+    maintenance_vacuum_pages: int = 5000  # Free pages returned to the OS per pass
+    
     # Retrieval Configuration
     top_k_results: int = 20
+    # "neighbors": retrieve neighbor_top_k chunks, widen each with adjacent chunks and merge them into spans.
+    # "hierarchical": rank section summaries first, then search chunks inside the best sections
+    retrieval_mode: Literal["chunks", "neighbors", "hierarchical"] = "chunks"
+    neighbor_top_k: int = 6
+    neighbor_max_chunks: int = 2  # Adjacent chunks considered on each side of a hit
+    neighbor_window_seconds: float = 60.0  # Only neighbors within this distance of the hit are added
+    # MMR: fetch mmr_fetch_k candidates and keep a diverse subset (relevance vs. similarity and time)
+    mmr_enabled: bool = False
+    mmr_fetch_k: int = 40
+    mmr_lambda: float = 0.6  # 1.0 is plain similarity ranking
+    mmr_temporal_weight: float = 0.3  # Share of redundancy from start_time proximity
+    mmr_temporal_scale_seconds: float = 90.0
+    
+    # Hierarchical summaries (built at ingestion for long videos)
+    summary_model: str = "llama-3.3-70b-versatile"
+    summary_min_chunks: int = 12  # Videos with fewer chunks get no summaries (0 disables)
+    summary_section_chunks: int = 8  # Consecutive chunks per section summary
+    summary_concurrency: int = 4  # Section summaries requested in parallel
+    summary_top_sections: int = 3  # Sections searched for a specific question
+    summary_chunk_top_k: int = 8  # Chunks retrieved inside those sections
+    summary_broad_sections: int = 4  # Section summaries added to the video summary for broad questions
+    
+    # Suggested questions (background map-reduce over the whole video, see services/suggestions.py)
+    question_count: int = 5
+    question_clusters: int = 8  # k-means clusters over chunk embeddings, one excerpt each
+    question_cluster_seed: int = 0  # k-means initialisation seed (same chunks -> same excerpts)
+    question_candidates_per_cluster: int = 3
+    question_concurrency: int = 4  # Excerpts sent to the LLM in parallel
+    question_dedupe_similarity: float = 0.85  # Candidates at least this similar to a kept one are dropped
+    question_max_defer_seconds: float = 300.0  # Longest wait for running ingestions before starting anyway
+    query_embedding_cache_size: int = 1024  # Question embeddings kept in memory (suggestions are pre-warmed)
+    suggestion_answers: bool = True  # Precompute /query answers for suggested questions
+    
+    # Progress Events
+    progress_write_interval: float = 2.0  # Min seconds between SQLite progress writes per video
+    progress_heartbeat_seconds: float = 15.0  # SSE/WebSocket keep-alive interval
+    
+    # Tracing Configuration
+    trace_export_path: str | None = None  # OTLP/JSON lines file for an OpenTelemetry collector
+    
+    # Admin endpoints (disabled unless set; send it in the X-Admin-Token header)
+    admin_token: str | None = None
     
     # Server Configuration
     host: str = "0.0.0.0"
@@ -49,6 +143,22 @@ class Settings(BaseSettings):
         db_path.parent.mkdir(parents=True, exist_ok=True)
         return db_path.parent
     
+    @property
+    def preferred_transcript_languages(self) -> list[str]:
+        return [code.strip() for code in self.transcript_languages.split(",") if code.strip()]
+    
+    @property
+    def default_partition_language_codes(self) -> set[str]:
+        return {code.strip().lower() for code in self.default_partition_languages.split(",") if code.strip()}
+    
+    @property
+    def chunk_text_in_vector_store(self) -> bool:
+        return self.chunk_payload_store in ("vector", "both")
+    
+    @property
+    def chunk_text_in_sqlite(self) -> bool:
+        return self.chunk_payload_store in ("sqlite", "both")
+    
     def get_chroma_dir(self) -> Path:
         """Ensure ChromaDB directory exists"""
         chroma_dir = Path(self.chroma_path)
@@ -2,11 +2,18 @@
 FastAPI main application
 """
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
-from backend.api import ingest, query
+from backend.api import ingest, query, transcripts, analytics, events, admin
 from backend.database.db import init_db
 from backend.app.models import HealthResponse
 from backend.services.vector_store import vector_store
+from backend.services.reindex import reindex_service
+from backend.services.index_generations import index_manager
+from backend.services.maintenance import maintenance_service
+from backend.services.suggestions import suggestion_service
+from backend.services.tracing import TracingMiddleware
+from backend.services.metrics import metrics, MetricsMiddleware, vector_collection_size, queue_depth
 from backend.database.db import db
 import logging
 
@@ -32,18 +39,41 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["Server-Timing"],
 )
 
+# Per-request stage timings (Server-Timing header, optional OTLP file export)
+app.add_middleware(TracingMiddleware)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize services on startup"""
     logger.info("Starting up Video Content Search API...")
     await init_db()
+    await index_manager.load()
+    # Re-answer suggestions whose chunks a reindex in another process replaced
+    index_manager.on_refresh(suggestion_service.backfill)
+    index_manager.start()
+    await index_manager.collect_garbage()
+    await reindex_service.mark_interrupted()
+    maintenance_service.start()
+    suggestion_service.start()
+    await suggestion_service.backfill()
     logger.info("Database initialized")
     logger.info("Services ready")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Release long-lived resources on shutdown"""
+    await maintenance_service.stop()
+    await index_manager.stop()
+    await suggestion_service.stop()
+    await db.close()
+
+
 @app.get("/", tags=["Root"])
 async def root():
     """Root endpoint"""
@@ -52,8 +82,12 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "health": "/health",
+            "metrics": "/metrics",
             "ingest": "/ingest",
-            "query": "/query"
+            "query": "/query",
+            "progress_events": "/videos/{video_id}/events",
+            "progress_socket": "/ws/progress",
+            "analytics": "/analytics"
         }
     }
 
@@ -73,9 +107,36 @@ async def health_check():
     )
 
 
+@app.get("/metrics", response_class=PlainTextResponse, tags=["Health"])
+async def get_metrics():
+    """Prometheus text exposition of latency histograms, counters and gauges"""
+    try:
+        vector_collection_size.set(vector_store.collection.count())
+    except Exception as e:
+        logger.warning(f"Failed to read ChromaDB collection size: {e}")
+    
+    conn = await db.get_connection()
+    try:
+        cursor = await conn.execute(
+            "SELECT status, COUNT(*) FROM videos WHERE status IN ('pending', 'processing') GROUP BY status"
+        )
+        counts = {row[0]: row[1] for row in await cursor.fetchall()}
+    finally:
+        await conn.close()
+    
+    for state in ("pending", "processing"):
+        queue_depth.labels(queue="ingestion", state=state).set(counts.get(state, 0))
+    
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 # Include routers
 app.include_router(ingest.router, tags=["Ingestion"])
 app.include_router(query.router, tags=["Query"])
+app.include_router(transcripts.router, tags=["Transcripts"])
+app.include_router(analytics.router, tags=["Analytics"])
+app.include_router(events.router, tags=["Progress"])
+app.include_router(admin.router, tags=["Admin"])
 
 
 if __name__ == "__main__":
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, HttpUrl
-from typing import List, Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 from enum import Enum
 
@@ -16,6 +16,7 @@ class IngestionStatus(str, Enum):
 class IngestRequest(BaseModel):
     """Request to ingest a YouTube video"""
     youtube_url: str = Field(..., description="YouTube video URL")
+    force: bool = Field(False, description="Re-ingest an already ingested video from cached fetches")
     
     class Config:
         json_schema_extra = {
@@ -56,6 +57,10 @@ class QueryRequest(BaseModel):
     """Request to query a video"""
     video_id: str = Field(..., description="Video ID to query")
     question: str = Field(..., min_length=3, description="Natural language question")
+    retrieval_mode: Optional[Literal["chunks", "neighbors", "hierarchical"]] = Field(
+        None, description="Override settings.retrieval_mode for this query"
+    )
+    mmr: Optional[bool] = Field(None, description="Override settings.mmr_enabled for this query")
     
     class Config:
         json_schema_extra = {
@@ -113,6 +118,7 @@ class VideoInfo(BaseModel):
     status: IngestionStatus
     progress_step: Optional[str] = None
     progress_percent: Optional[float] = None
+    language: Optional[str] = Field(None, description="Transcript language code")
     created_at: datetime
     
     class Config:
@@ -120,9 +126,10 @@ class VideoInfo(BaseModel):
 
 
 class VideoListResponse(BaseModel):
-    """List of ingested videos"""
+    """Page of ingested videos"""
     videos: List[VideoInfo]
-    total: int
+    total: int = Field(..., description="Number of videos matching the filters (across all pages)")
+    next_cursor: Optional[str] = Field(None, description="Pass as ?cursor= to fetch the next page")
 
 
 class QuestionSuggestion(BaseModel):
@@ -136,6 +143,127 @@ class VideoWithSuggestions(VideoInfo):
     suggestions: List[QuestionSuggestion] = Field(default_factory=list)
 
 
+class IngestionStage(BaseModel):
+    """Duration of one ingestion pipeline stage"""
+    stage: str
+    parent_stage: Optional[str] = None
+    duration_ms: float
+    started_at: float = Field(..., description="Unix timestamp in seconds")
+    attributes: dict = Field(default_factory=dict)
+    error: Optional[str] = None
+
+
+class DeleteVideosResponse(BaseModel):
+    """Outcome of a single or bulk video deletion"""
+    deleted: List[str]
+    skipped: List[str] = Field(default_factory=list, description="Videos still being ingested")
+
+
+class TranscriptSegment(BaseModel):
+    """One timed transcript segment"""
+    index: int
+    text: str
+    start: float
+    end: float
+
+
+class TranscriptResponse(BaseModel):
+    """Transcript segments overlapping a time range"""
+    video_id: str
+    start: Optional[float] = None
+    end: Optional[float] = None
+    total_segments: int
+    segments: List[TranscriptSegment]
+
+
+class VideoSummary(BaseModel):
+    """Section or whole-video summary of the hierarchical index"""
+    level: str  # section or video
+    section_index: int
+    text: str
+    start_time: float
+    end_time: float
+
+
+# Analytics Models
+class ChannelStats(BaseModel):
+    """Per-channel library statistics"""
+    channel_name: str
+    video_count: int
+    completed_count: int
+    total_duration: float
+
+
+class StageTiming(BaseModel):
+    """Aggregate timing of one ingestion stage"""
+    stage: str
+    run_count: int
+    average_ms: float
+    max_ms: float
+
+
+class DailyIngestions(BaseModel):
+    """Videos added on one day"""
+    date: str
+    count: int
+
+
+class AnalyticsResponse(BaseModel):
+    """Library-wide statistics computed from incrementally maintained summaries"""
+    total_videos: int
+    status_counts: dict[str, int] = Field(default_factory=dict)
+    success_rate: float = Field(..., description="Completed videos as a percentage of all videos")
+    total_duration: float = Field(..., description="Seconds of content across all videos")
+    completed_duration: float = Field(..., description="Seconds of searchable content")
+    average_duration: float
+    total_chunks: int
+    total_segments: int
+    top_channels: List[ChannelStats] = Field(default_factory=list)
+    stage_timings: List[StageTiming] = Field(default_factory=list)
+    daily_ingestions: List[DailyIngestions] = Field(default_factory=list)
+
+
+# Reindex Models
+class ReindexRequest(BaseModel):
+    """Request to re-chunk and re-embed videos from stored transcripts"""
+    video_ids: Optional[List[str]] = Field(None, description="Videos to reindex (default: all completed)")
+    chunk_size: Optional[int] = Field(None, ge=10, description="Override settings.chunk_size")
+    chunk_overlap: Optional[int] = Field(None, ge=0, description="Override settings.chunk_overlap")
+    embedding_model: Optional[str] = Field(None, description="Override the partition's embedding model")
+    partition: Literal["default", "multilingual"] = Field("default", description="Index partition to rebuild")
+    batch_size: int = Field(256, ge=1, le=4096, description="Chunks per embedding call")
+    concurrency: int = Field(2, ge=1, le=16, description="Parallel embed/swap workers")
+
+
+class ReindexJob(BaseModel):
+    """State of a reindex job"""
+    job_id: str
+    status: str
+    params: dict
+    total_videos: int
+    done_videos: int
+    failed_videos: int
+    pending_videos: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class IndexGenerationInfo(BaseModel):
+    """A vector index generation and the parameters that built it"""
+    generation_id: int
+    collection_name: str
+    embedding_model: str
+    embedding_dim: Optional[int] = None
+    chunk_size: int
+    chunk_overlap: int
+    status: str = Field(..., description="building, active, retired or collected")
+    created_at: Optional[datetime] = None
+    activated_at: Optional[datetime] = None
+    retired_at: Optional[datetime] = None
+    index_partition: str = Field("default", description="default or multilingual")
+
+
 # Error Models
 class ErrorResponse(BaseModel):
     """Error response"""
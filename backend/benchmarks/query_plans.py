@@ -0,0 +1,158 @@
+"""
+EXPLAIN QUERY PLAN checks for the hot SQLite queries
+
+Every index in schema.sql exists for one of the queries below. This
+initializes a throwaway database, asks SQLite how it would run each query
+and fails if the expected index is not used or a temporary B-tree is
+needed for ORDER BY.
+
+Usage:
+    python -m backend.benchmarks.query_plans
+"""
+from typing import List, Tuple
+import asyncio
+import sys
+import tempfile
+import os
+
+# (description, sql, params, expected index, covering required)
+HOT_QUERIES: List[Tuple[str, str, tuple, str, bool]] = [
+    (
+        "column store build / reindex read of one video's transcript",
+        """SELECT text, start_time, end_time FROM transcripts
+           WHERE video_id = ? ORDER BY segment_index""",
+        ("v",), "idx_transcripts_video_segment", True,
+    ),
+    (
+        "reindex read of a page of transcripts",
+        """SELECT video_id, text, start_time, end_time FROM transcripts
+           WHERE video_id IN (?, ?) ORDER BY video_id, segment_index""",
+        ("a", "b"), "idx_transcripts_video_segment", True,
+    ),
+    (
+        "ON DELETE CASCADE child lookup",
+        "SELECT chunk_id FROM chunks WHERE video_id = ? ORDER BY chunk_index",
+        ("v",), "idx_chunks_video_index", False,
+    ),
+    (
+        "GET /videos/{id}/chunks export",
+        """SELECT chunk_id, chunk_index, text, start_time, end_time FROM chunks
+           WHERE video_id = ? AND generation_id = ? ORDER BY chunk_index""",
+        ("v", 1), "idx_chunks_generation_video_index", False,
+    ),
+    (
+        "reindex swap of one video's chunks",
+        "SELECT chunk_id FROM chunks WHERE generation_id = ? AND video_id = ?",
+        (1, "v"), "idx_chunks_generation_video_index", False,
+    ),
+    (
+        "active chunk count on generation flip",
+        "SELECT COUNT(*) FROM chunks WHERE generation_id = ?",
+        (1,), "idx_chunks_generation_video_index", True,
+    ),
+    (
+        "query neighbor expansion",
+        """SELECT chunk_id, chunk_index, text, start_time, end_time FROM chunks
+           WHERE generation_id = ? AND video_id = ? AND chunk_index IN (?, ?, ?)
+           ORDER BY chunk_index""",
+        (1, "v", 3, 4, 5), "idx_chunks_generation_video_index", False,
+    ),
+    (
+        "hierarchical retrieval summaries of one video",
+        """SELECT id, level, section_index, text, start_time, end_time, embedding_model, embedding
+           FROM video_summaries WHERE video_id = ? ORDER BY level, section_index""",
+        ("v",), "idx_video_summaries_video", False,
+    ),
+    (
+        "query context by chunk id",
+        """SELECT chunk_id, text, start_time, end_time FROM chunks
+           WHERE chunk_id IN (?, ?) AND generation_id = ?""",
+        ("a", "b", 1), "sqlite_autoindex_chunks_1", False,
+    ),
+    (
+        "GET /videos/{id}/suggestions",
+        """SELECT id, video_id, question, created_at FROM question_suggestions
+           WHERE video_id = ? ORDER BY id ASC""",
+        ("v",), "idx_suggestions_video_id", False,
+    ),
+    (
+        "POST /query video lookup with precomputed suggestion answer",
+        """SELECT v.video_id, v.status, v.youtube_url, v.index_partition,
+                  q.answer, q.timestamps, q.sources_used, q.answer_generation_id
+           FROM videos v LEFT JOIN question_suggestions q
+             ON q.video_id = v.video_id AND q.question = ? AND q.answer IS NOT NULL
+           WHERE v.video_id = ?""",
+        ("q", "v"), "idx_suggestions_video_id", False,
+    ),
+    (
+        "suggestion answers chunk version check",
+        "SELECT MAX(id) FROM chunks WHERE video_id = ? AND generation_id = ?",
+        ("v", 1), "idx_chunks_generation_video_index", True,
+    ),
+    (
+        "GET /videos keyset page",
+        """SELECT video_id, title FROM videos WHERE (created_at, video_id) < (?, ?)
+           ORDER BY created_at DESC, video_id DESC LIMIT 51""",
+        ("2030-01-01", "z"), "idx_videos_created_id", False,
+    ),
+    (
+        "GET /videos?status= keyset page",
+        """SELECT video_id, title FROM videos WHERE status = ?
+           ORDER BY created_at DESC, video_id DESC LIMIT 51""",
+        ("completed",), "idx_videos_status_created", False,
+    ),
+    (
+        "analytics daily ingestions",
+        """SELECT date(created_at) AS day, COUNT(*) FROM videos
+           WHERE created_at >= datetime('now', ?) GROUP BY day ORDER BY day ASC""",
+        ("-30 days",), "idx_videos_created_id", True,
+    ),
+]
+
+
+async def check_plans() -> List[str]:
+    """Run every check; returns failure messages (empty when all pass)"""
+    from backend.database.db import Database
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        database = Database(os.path.join(directory, "plans.db"))
+        await database.initialize()
+        conn = await database.get_connection()
+        try:
+            for description, sql, params, index, covering in HOT_QUERIES:
+                cursor = await conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)
+                plan = [row[3] for row in await cursor.fetchall()]
+                used = [line for line in plan if f"INDEX {index}" in line]
+                problems = []
+                if not used:
+                    problems.append(f"does not use {index}")
+                elif covering and not any("COVERING INDEX" in line for line in used):
+                    problems.append(f"does not use {index} as a covering index")
+                # GROUP BY date(...) needs a B-tree by nature; ORDER BY must not
+                if any("TEMP B-TREE FOR ORDER BY" in line for line in plan):
+                    problems.append("sorts with a temporary B-tree")
+
+                status = "FAIL" if problems else "ok"
+                print(f"[{status:>4}] {description}")
+                for line in plan:
+                    print(f"         {line}")
+                if problems:
+                    failures.append(f"{description}: {', '.join(problems)}")
+        finally:
+            await conn.close()
+    return failures
+
+
+def main():
+    failures = asyncio.run(check_plans())
+    if failures:
+        print("\nQuery plan regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print(f"\nAll {len(HOT_QUERIES)} hot queries use their indexes")
+
+
+if __name__ == "__main__":
+    main()
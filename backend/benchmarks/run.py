@@ -0,0 +1,315 @@
+"""
+Benchmark harness for the ingestion and query hot paths
+
+Runs against synthetic transcripts with the mock LLM/Whisper provider and
+local YouTube stand-ins, so nothing leaves the machine. Each corpus size runs
+in its own subprocess with a fresh SQLite database and ChromaDB directory,
+which keeps the peak RSS figures independent.
+
+Usage:
+    python -m backend.benchmarks.run --sizes 100,1000,10000
+    python -m backend.benchmarks.run --sizes 100 --compare backend/benchmarks/baselines/<commit>.json
+"""
+from pathlib import Path
+from typing import Dict, List
+from datetime import datetime, timezone
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BASELINE_DIR = Path(__file__).parent / "baselines"
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+def summarize(samples: List[float], wall_seconds: float = None) -> Dict:
+    """Latency percentiles (ms) and throughput (ops/s) for a list of durations in seconds"""
+    ordered = sorted(samples)
+    elapsed = wall_seconds if wall_seconds is not None else sum(samples)
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 3),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+        "mean_ms": round(sum(samples) / len(samples) * 1000, 3) if samples else 0.0,
+        "throughput_per_s": round(len(samples) / elapsed, 3) if elapsed > 0 else 0.0,
+    }
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 1)
+
+
+def current_commit() -> str:
+    """Short hash of HEAD, or 'unknown' outside a git checkout"""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_size(args) -> Dict:
+    """Benchmark one corpus size (runs inside the worker subprocess)"""
+    import httpx
+    from backend.benchmarks.synthetic import (
+        synthetic_video_id, synthetic_transcript, synthetic_question, install_youtube_stand_ins
+    )
+    from backend.app.main import app
+    from backend.api.ingest import save_transcript_segments, save_chunks
+    from backend.database.db import db, init_db
+    from backend.services.chunking import chunking_service
+    from backend.services.embedding_service import embedding_service
+    from backend.services.vector_store import vector_store
+
+    install_youtube_stand_ins(args.segments_per_video)
+    await init_db()
+    rng = random.Random(args.seed)
+
+    samples: Dict[str, List[float]] = {
+        "sqlite_save_transcript": [],
+        "chunk_transcript": [],
+        "generate_embeddings": [],
+        "vector_add_chunks": [],
+        "sqlite_save_chunks": [],
+    }
+
+    # Build the corpus through the same calls process_video_ingestion makes
+    corpus_start = time.perf_counter()
+    for index in range(args.size):
+        video_id = synthetic_video_id(index)
+        segments = synthetic_transcript(index, args.segments_per_video)
+
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                """INSERT INTO videos (video_id, youtube_url, title, duration, channel_name, status)
+                   VALUES (?, ?, ?, ?, ?, 'completed')""",
+                (video_id, f"https://www.youtube.com/watch?v={video_id}",
+                 f"Synthetic video {video_id}", segments[-1]["end"], f"Channel {index % 50}")
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+        started = time.perf_counter()
+        await save_transcript_segments(video_id, segments)
+        samples["sqlite_save_transcript"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        chunks = chunking_service.chunk_transcript(segments)
+        samples["chunk_transcript"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        embeddings = embedding_service.generate_embeddings([chunk["text"] for chunk in chunks])
+        samples["generate_embeddings"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        chunk_ids = await vector_store.add_chunks(video_id, chunks, embeddings)
+        samples["vector_add_chunks"].append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await save_chunks(video_id, chunks, chunk_ids)
+        samples["sqlite_save_chunks"].append(time.perf_counter() - started)
+    corpus_seconds = time.perf_counter() - corpus_start
+
+    results = {name: summarize(values) for name, values in samples.items()}
+
+    # Vector search over the populated collection
+    query_samples = []
+    for _ in range(args.queries):
+        video_id = synthetic_video_id(rng.randrange(args.size))
+        query_embedding = embedding_service.generate_embedding(synthetic_question(rng))
+        started = time.perf_counter()
+        await vector_store.query_similar(query_embedding=query_embedding, video_id=video_id)
+        query_samples.append(time.perf_counter() - started)
+    results["vector_query_similar"] = summarize(query_samples)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        # Full /query round trips with bounded concurrency
+        semaphore = asyncio.Semaphore(args.concurrency)
+        http_samples = []
+
+        async def one_query():
+            payload = {
+                "video_id": synthetic_video_id(rng.randrange(args.size)),
+                "question": synthetic_question(rng)
+            }
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.post("/query", json=payload)
+                http_samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one_query() for _ in range(args.queries)))
+        results["http_query"] = summarize(http_samples, time.perf_counter() - wall_start)
+
+        # Full /ingest round trips; the ASGI transport waits for the background
+        # pipeline, so these measure end-to-end ingestion of one video
+        ingest_samples = []
+        for offset in range(args.ingests):
+            video_id = synthetic_video_id(args.size + offset)
+            started = time.perf_counter()
+            response = await client.post(
+                "/ingest", json={"youtube_url": f"https://www.youtube.com/watch?v={video_id}"}
+            )
+            ingest_samples.append(time.perf_counter() - started)
+            response.raise_for_status()
+        results["http_ingest"] = summarize(ingest_samples)
+
+    return {
+        "videos": args.size,
+        "corpus_build_seconds": round(corpus_seconds, 3),
+        "peak_rss_mb": peak_rss_mb(),
+        "benchmarks": results,
+    }
+
+
+def run_worker(args):
+    """Entry point of the per-size subprocess"""
+    result = asyncio.run(run_size(args))
+    Path(args.result_file).write_text(json.dumps(result))
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """
+    Compare two result files
+
+    Returns:
+        Human readable regression lines (empty when nothing regressed)
+    """
+    regressions = []
+    for size, result in current["sizes"].items():
+        base_result = baseline.get("sizes", {}).get(size)
+        if not base_result:
+            continue
+        for name, stats in result["benchmarks"].items():
+            base_stats = base_result["benchmarks"].get(name)
+            if not base_stats:
+                continue
+            if base_stats["p95_ms"] > 0 and stats["p95_ms"] > base_stats["p95_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"[{size} videos] {name}: p95 {base_stats['p95_ms']}ms -> {stats['p95_ms']}ms"
+                )
+            if stats["throughput_per_s"] < base_stats["throughput_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"[{size} videos] {name}: throughput {base_stats['throughput_per_s']}/s -> {stats['throughput_per_s']}/s"
+                )
+        if result["peak_rss_mb"] > base_result["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(
+                f"[{size} videos] peak RSS {base_result['peak_rss_mb']}MB -> {result['peak_rss_mb']}MB"
+            )
+    return regressions
+
+
+def print_report(report: Dict):
+    """Print a compact table of the results"""
+    header = f"{'benchmark':<24}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'p99 ms':>12}{'ops/s':>12}"
+    for size, result in report["sizes"].items():
+        print(f"\n=== {size} videos (peak RSS {result['peak_rss_mb']} MB, corpus built in {result['corpus_build_seconds']}s) ===")
+        print(header)
+        for name, stats in result["benchmarks"].items():
+            print(f"{name:<24}{stats['count']:>8}{stats['p50_ms']:>12}{stats['p95_ms']:>12}"
+                  f"{stats['p99_ms']:>12}{stats['throughput_per_s']:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ingestion and query hot paths")
+    parser.add_argument("--sizes", default="100,1000,10000", help="Comma separated corpus sizes (videos)")
+    parser.add_argument("--segments-per-video", type=int, default=60)
+    parser.add_argument("--queries", type=int, default=200, help="Query samples per size")
+    parser.add_argument("--ingests", type=int, default=20, help="/ingest samples per size")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent /query requests")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Mock provider latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Where to write the result JSON (default: baselines/<commit>.json)")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed relative regression")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args)
+        return
+
+    commit = current_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "segments_per_video": args.segments_per_video,
+            "queries": args.queries,
+            "ingests": args.ingests,
+            "concurrency": args.concurrency,
+            "llm_latency_ms": args.llm_latency_ms,
+            "seed": args.seed,
+        },
+        "sizes": {},
+    }
+
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        with tempfile.TemporaryDirectory(prefix="yt-bench-") as workdir:
+            env = dict(os.environ)
+            env.update({
+                "LLM_PROVIDER": "mock",
+                "MOCK_LATENCY_MS": str(args.llm_latency_ms),
+                "MOCK_LATENCY_JITTER_MS": "0",
+                "SQLITE_DB_PATH": str(Path(workdir) / "videos.db"),
+                "CHROMA_PATH": str(Path(workdir) / "chroma"),
+            })
+            result_file = Path(workdir) / "result.json"
+            print(f"Running benchmarks for {size} videos...", flush=True)
+            subprocess.run(
+                [sys.executable, "-m", "backend.benchmarks.run", "--worker",
+                 "--size", str(size), "--result-file", str(result_file),
+                 "--segments-per-video", str(args.segments_per_video),
+                 "--queries", str(args.queries), "--ingests", str(args.ingests),
+                 "--concurrency", str(args.concurrency), "--seed", str(args.seed)],
+                env=env, check=True
+            )
+            report["sizes"][str(size)] = json.loads(result_file.read_text())
+
+    print_report(report)
+
+    output = Path(args.output) if args.output else BASELINE_DIR / f"{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text())
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print(f"\nRegressions against {baseline.get('commit', args.compare)}:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print(f"\nNo regressions against {baseline.get('commit', args.compare)}")
+
+
+if __name__ == "__main__":
+    main()
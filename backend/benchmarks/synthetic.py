@@ -0,0 +1,80 @@
+"""
+Synthetic corpus and local YouTube stand-ins for benchmarks
+"""
+from typing import Dict, List
+import random
+
+_WORDS = (
+    "api cache chunk cluster compile container database deploy docker embedding endpoint "
+    "error function gradient index kernel latency layer library memory model network "
+    "optimizer pipeline process query request response schema server session shard "
+    "storage stream thread token transcript vector video worker"
+).split()
+
+_TEMPLATES = [
+    "so the next thing we need to look at is the {0} and how it talks to the {1}",
+    "if the {0} is slow you will usually see it in the {1} first",
+    "here I am going to add a {0} in front of the {1} to keep things fast",
+    "notice that the {0} only changes when the {1} is rebuilt",
+    "a common mistake is to configure the {0} before the {1} is ready",
+    "let's measure the {0} again now that the {1} is warmed up",
+]
+
+
+def synthetic_video_id(index: int) -> str:
+    """Deterministic 11 character id accepted by extract_video_id"""
+    return f"bench{index:06d}"
+
+
+def synthetic_transcript(video_index: int, num_segments: int, segment_seconds: float = 4.0) -> List[Dict]:
+    """
+    Generate a deterministic transcript in the same shape as the YouTube/Whisper paths
+
+    Returns:
+        [{"text": str, "start": float, "end": float}, ...]
+    """
+    rng = random.Random(video_index)
+    segments = []
+    for i in range(num_segments):
+        template = rng.choice(_TEMPLATES)
+        text = template.format(rng.choice(_WORDS), rng.choice(_WORDS))
+        start = i * segment_seconds
+        segments.append({"text": text, "start": start, "end": start + segment_seconds})
+    return segments
+
+
+def synthetic_question(rng: random.Random) -> str:
+    """A question phrased like a real user question over the synthetic corpus"""
+    return f"How does the {rng.choice(_WORDS)} affect the {rng.choice(_WORDS)}?"
+
+
+def install_youtube_stand_ins(num_segments: int, segment_seconds: float = 4.0):
+    """
+    Replace the network-bound YouTube calls used by the ingestion pipeline
+
+    The metadata service and the transcript fetcher are swapped for local
+    functions that return synthetic data, so /ingest exercises only our code.
+    """
+    from backend.api import ingest
+    from backend.services.youtube_metadata import youtube_metadata_service
+
+    def _index(video_id: str) -> int:
+        digits = "".join(ch for ch in video_id if ch.isdigit())
+        return int(digits) if digits else 0
+
+    async def get_metadata(video_id: str) -> Dict:
+        return {
+            'title': f"Synthetic video {video_id}",
+            'thumbnail_url': None,
+            'channel_name': f"Channel {_index(video_id) % 50}",
+            'upload_date': "2024-01-01",
+            'view_count': _index(video_id),
+            'duration': num_segments * segment_seconds,
+        }
+
+    async def get_youtube_transcript(video_id: str):
+        segments = synthetic_transcript(_index(video_id), num_segments, segment_seconds)
+        return segments, f"Synthetic video {video_id}", num_segments * segment_seconds, "en"
+
+    youtube_metadata_service.get_metadata = get_metadata
+    ingest.get_youtube_transcript = get_youtube_transcript
@@ -2,6 +2,8 @@ import aiosqlite
 from pathlib import Path
 from typing import Optional
 from backend.app.config import settings
+from backend.database.migrations import run_migrations
+from backend.services.metrics import db_connections_open, db_connections_opened
 
 
 class Database:
@@ -9,6 +11,8 @@ class Database:
     
     def __init__(self, db_path: Optional[str] = None):
         self.db_path = db_path or settings.sqlite_db_path
+        self.open_connections = 0
+        self._health_conn: Optional[aiosqlite.Connection] = None
         self._ensure_db_directory()
     
     def _ensure_db_directory(self):
@@ -24,28 +28,108 @@ class Database:
             # Enable foreign key constraints
             await db.execute("PRAGMA foreign_keys = ON")
             
+            # Only takes effect on new files; maintenance converts older ones with a VACUUM
+            await db.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            
+            # WAL lets streamed exports read while ingestion writes (persists in the file)
+            await db.execute("PRAGMA journal_mode = WAL")
+            
+            # Bring databases from older releases up to schema.sql (no-op when fresh)
+            await run_migrations(db)
+            
             # Read and execute schema
             with open(schema_path, 'r') as f:
                 schema_sql = f.read()
             
             await db.executescript(schema_sql)
+            
+            # The original video_chunks collection becomes generation 1
+            await db.execute(
+                """INSERT OR IGNORE INTO index_generations
+                   (generation_id, collection_name, embedding_model, chunk_size, chunk_overlap, status, activated_at)
+                   VALUES (1, 'video_chunks', ?, ?, ?, 'active', CURRENT_TIMESTAMP)""",
+                (settings.embedding_model, settings.chunk_size, settings.chunk_overlap)
+            )
             await db.commit()
+            
+            # Summary tables are trigger-maintained; seed them once from existing rows
+            cursor = await db.execute(
+                "SELECT 1 FROM library_counters WHERE name = 'analytics_backfilled'"
+            )
+            if not await cursor.fetchone():
+                await self.rebuild_analytics(db)
+    
+    async def rebuild_analytics(self, db: aiosqlite.Connection):
+        """Recompute the analytics summary tables from the base tables"""
+        await db.execute("DELETE FROM video_status_stats")
+        await db.execute(
+            """INSERT INTO video_status_stats (status, video_count, total_duration)
+               SELECT status, COUNT(*), COALESCE(SUM(duration), 0) FROM videos GROUP BY status"""
+        )
+        await db.execute("DELETE FROM channel_stats")
+        await db.execute(
+            """INSERT INTO channel_stats (channel_name, video_count, completed_count, total_duration)
+               SELECT channel_name, COUNT(*), SUM(status = 'completed'), COALESCE(SUM(duration), 0)
+               FROM videos WHERE channel_name IS NOT NULL GROUP BY channel_name"""
+        )
+        await db.execute("DELETE FROM stage_stats")
+        await db.execute(
+            """INSERT INTO stage_stats (stage, run_count, total_ms, max_ms)
+               SELECT stage, COUNT(*), SUM(duration_ms), MAX(duration_ms)
+               FROM ingestion_stages GROUP BY stage"""
+        )
+        await db.execute(
+            """INSERT OR REPLACE INTO library_counters (name, value) VALUES
+               ('total_chunks', (SELECT COUNT(*) FROM chunks WHERE generation_id IN
+                   (SELECT generation_id FROM index_generations WHERE status = 'active'))),
+               ('total_segments', (SELECT COUNT(*) FROM transcripts)),
+               ('analytics_backfilled', 1)"""
+        )
+        await db.commit()
     
     async def get_connection(self) -> aiosqlite.Connection:
         """Get a database connection"""
         conn = await aiosqlite.connect(self.db_path)
         conn.row_factory = aiosqlite.Row  # Enable column access by name
         await conn.execute("PRAGMA foreign_keys = ON")
+        self._track(conn)
         return conn
     
+    def _track(self, conn: aiosqlite.Connection):
+        """Count the connection as open until its close() is awaited"""
+        self.open_connections += 1
+        db_connections_opened.inc()
+        db_connections_open.set(self.open_connections)
+        close = conn.close
+        
+        async def tracked_close():
+            self.open_connections -= 1
+            db_connections_open.set(self.open_connections)
+            await close()
+        
+        conn.close = tracked_close
+    
     async def check_health(self) -> bool:
-        """Check if database is accessible"""
+        """Check if database is accessible (reuses one long-lived probe connection)"""
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute("SELECT 1")
+            if self._health_conn is None:
+                self._health_conn = await aiosqlite.connect(self.db_path)
+            await self._health_conn.execute("SELECT 1")
             return True
         except Exception:
+            if self._health_conn is not None:
+                try:
+                    await self._health_conn.close()
+                except Exception:
+                    pass
+                self._health_conn = None
             return False
+    
+    async def close(self):
+        """Close the long-lived health probe connection (call on shutdown)"""
+        if self._health_conn is not None:
+            await self._health_conn.close()
+            self._health_conn = None
 
 
 # Singleton instance
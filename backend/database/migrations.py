@@ -0,0 +1,175 @@
+"""
+Versioned schema migrations
+
+``schema.sql`` describes the current schema and creates it on a fresh
+database. The steps below bring databases created by older releases up to
+that shape; they run from ``Database.initialize`` before ``schema.sql``
+and each applied version is recorded in ``schema_version``.
+
+Every step is idempotent (it checks tables and columns first), so a
+database that already matches, or has no tables yet, just records the
+version. Add new steps at the end with the next version number and keep
+``schema.sql`` in sync.
+"""
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List
+import aiosqlite
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Migration:
+    """One schema change applied in its own transaction"""
+    version: int
+    name: str
+    apply: Callable[[aiosqlite.Connection], Awaitable[None]]
+
+
+async def _table_exists(conn: aiosqlite.Connection, table: str) -> bool:
+    cursor = await conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (table,))
+    return await cursor.fetchone() is not None
+
+
+async def _columns(conn: aiosqlite.Connection, table: str) -> List[str]:
+    cursor = await conn.execute(f"PRAGMA table_info({table})")
+    return [row[1] for row in await cursor.fetchall()]
+
+
+async def _add_columns(conn: aiosqlite.Connection, table: str, columns: List[tuple]):
+    """ALTER TABLE ADD COLUMN for each (name, definition) the table lacks"""
+    if not await _table_exists(conn, table):
+        return
+    existing = await _columns(conn, table)
+    for name, definition in columns:
+        if name not in existing:
+            await conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {definition}")
+
+
+async def _video_metadata_columns(conn: aiosqlite.Connection):
+    """Metadata and progress columns (previously backend/migrate_db.py)"""
+    await _add_columns(conn, "videos", [
+        ("thumbnail_url", "TEXT"),
+        ("channel_name", "TEXT"),
+        ("upload_date", "TEXT"),
+        ("view_count", "INTEGER"),
+        ("progress_step", "TEXT"),
+        ("progress_percent", "REAL DEFAULT 0"),
+    ])
+
+
+async def _chunk_generations(conn: aiosqlite.Connection):
+    """Index generation of every chunk row (existing rows belong to generation 1)"""
+    await _add_columns(conn, "chunks", [("generation_id", "INTEGER NOT NULL DEFAULT 1")])
+
+
+# (index, table, columns) created by the hot-path step; schema.sql declares the same
+_HOT_PATH_INDEXES = [
+    # Transcript reads by video in segment order are answered from the index alone
+    ("idx_transcripts_video_segment", "transcripts", "video_id, segment_index, start_time, end_time, text"),
+    # Per-video chunk reads in order, and the ON DELETE CASCADE lookup
+    ("idx_chunks_video_index", "chunks", "video_id, chunk_index"),
+    # Generation-scoped reads (exports, reindex swaps, counts, garbage collection)
+    ("idx_chunks_generation_video_index", "chunks", "generation_id, video_id, chunk_index"),
+    # Suggestions by video in insertion order
+    ("idx_suggestions_video_id", "question_suggestions", "video_id, id"),
+]
+
+# Superseded by a wider index with the same leading columns (or by a UNIQUE constraint)
+_REDUNDANT_INDEXES = [
+    "idx_transcripts_video",
+    "idx_chunks_video",
+    "idx_chunks_generation_video",
+    "idx_chunks_chunk_id",
+    "idx_suggestions_video",
+    "idx_video_status",
+]
+
+
+async def _hot_path_indexes(conn: aiosqlite.Connection):
+    """Indexes matching the hot queries, replacing narrower ones they make redundant"""
+    for index, table, columns in _HOT_PATH_INDEXES:
+        if await _table_exists(conn, table):
+            await conn.execute(f"CREATE INDEX IF NOT EXISTS {index} ON {table}({columns})")
+    for index in _REDUNDANT_INDEXES:
+        await conn.execute(f"DROP INDEX IF EXISTS {index}")
+
+
+async def _languages_and_partitions(conn: aiosqlite.Connection):
+    """Transcript language per video and index partitions (one active generation each)"""
+    await _add_columns(conn, "videos", [
+        ("language", "TEXT"),
+        ("index_partition", "TEXT NOT NULL DEFAULT 'default'"),
+    ])
+    await _add_columns(conn, "index_generations", [("index_partition", "TEXT NOT NULL DEFAULT 'default'")])
+    # These assumed a single active generation; schema.sql recreates them per partition
+    await conn.execute("DROP TRIGGER IF EXISTS trg_chunks_active_insert")
+    await conn.execute("DROP TRIGGER IF EXISTS trg_chunks_active_delete")
+
+
+async def _suggestion_answers(conn: aiosqlite.Connection):
+    """Precomputed answers for suggested questions"""
+    await _add_columns(conn, "question_suggestions", [
+        ("answer", "TEXT"),
+        ("timestamps", "TEXT"),
+        ("sources_used", "INTEGER"),
+        ("answer_generation_id", "INTEGER"),
+        ("answered_at", "TIMESTAMP"),
+    ])
+
+
+async def _active_chunk_counters(conn: aiosqlite.Connection):
+    """Chunk totals count the active generations only (trg_chunks_active_* in schema.sql)"""
+    # These counted every chunk row, so rows of building generations were counted too
+    await conn.execute("DROP TRIGGER IF EXISTS trg_chunks_count_insert")
+    await conn.execute("DROP TRIGGER IF EXISTS trg_chunks_count_delete")
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "video metadata and progress columns", _video_metadata_columns),
+    Migration(2, "chunk index generations", _chunk_generations),
+    Migration(3, "hot path indexes", _hot_path_indexes),
+    Migration(4, "transcript languages and index partitions", _languages_and_partitions),
+    Migration(5, "suggested question answers", _suggestion_answers),
+    Migration(6, "active generation chunk counters", _active_chunk_counters),
+]
+
+
+async def run_migrations(conn: aiosqlite.Connection) -> int:
+    """
+    Apply every migration newer than the recorded schema version
+
+    Returns:
+        The schema version after migrating
+    """
+    await conn.execute(
+        """CREATE TABLE IF NOT EXISTS schema_version (
+               version INTEGER PRIMARY KEY,
+               name TEXT NOT NULL,
+               applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+    await conn.commit()
+    cursor = await conn.execute("SELECT version FROM schema_version")
+    applied = {row[0] for row in await cursor.fetchall()}
+
+    for migration in MIGRATIONS:
+        if migration.version in applied:
+            continue
+        # DDL does not open a transaction implicitly; make each step atomic
+        await conn.execute("BEGIN")
+        try:
+            await migration.apply(conn)
+            await conn.execute(
+                "INSERT INTO schema_version (version, name) VALUES (?, ?)",
+                (migration.version, migration.name)
+            )
+            await conn.commit()
+        except Exception:
+            await conn.rollback()
+            logger.error(f"Schema migration {migration.version} ({migration.name}) failed")
+            raise
+        logger.info(f"Applied schema migration {migration.version}: {migration.name}")
+
+    return max([m.version for m in MIGRATIONS], default=0)
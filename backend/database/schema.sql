@@ -12,6 +12,8 @@ CREATE TABLE IF NOT EXISTS videos (
     progress_step TEXT,  -- Current step: downloading, splitting, transcribing, embedding
     progress_percent REAL DEFAULT 0,  -- Progress percentage 0-100
     error_message TEXT,  -- Error details if status is 'failed'
+    language TEXT,  -- Transcript language code (e.g. en, de, pt-BR)
+    index_partition TEXT NOT NULL DEFAULT 'default',  -- default or multilingual (see index_generations)
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
@@ -36,12 +38,279 @@ CREATE TABLE IF NOT EXISTS chunks (
     start_time REAL NOT NULL,
     end_time REAL NOT NULL,
     chunk_index INTEGER NOT NULL,  -- Order within video
+    generation_id INTEGER NOT NULL DEFAULT 1,  -- Index generation that produced the chunk
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (video_id) REFERENCES videos(video_id) ON DELETE CASCADE
 );
 
--- Indexes for performance
-CREATE INDEX IF NOT EXISTS idx_video_status ON videos(status);
-CREATE INDEX IF NOT EXISTS idx_transcripts_video ON transcripts(video_id);
-CREATE INDEX IF NOT EXISTS idx_chunks_video ON chunks(video_id);
-CREATE INDEX IF NOT EXISTS idx_chunks_chunk_id ON chunks(chunk_id);
+-- Index generations: each ChromaDB collection records the embedding model and
+-- chunking parameters that built it. Exactly one generation per index partition
+-- is active (queried); building generations receive writes until they are flipped active
+CREATE TABLE IF NOT EXISTS index_generations (
+    generation_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection_name TEXT NOT NULL UNIQUE,
+    embedding_model TEXT NOT NULL,
+    embedding_dim INTEGER,
+    chunk_size INTEGER NOT NULL,
+    chunk_overlap INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'building',  -- building, active, retired, collected
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    activated_at TIMESTAMP,
+    retired_at TIMESTAMP,
+    index_partition TEXT NOT NULL DEFAULT 'default'  -- default or multilingual
+);
+
+-- Question suggestions table: LLM generated starter questions per video
+CREATE TABLE IF NOT EXISTS question_suggestions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    question TEXT NOT NULL,
+    display_order INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- Precomputed /query response, served while answer_generation_id is the active generation
+    answer TEXT,
+    timestamps TEXT,  -- JSON list of resolved timestamps
+    sources_used INTEGER,
+    answer_generation_id INTEGER,
+    answered_at TIMESTAMP,
+    FOREIGN KEY (video_id) REFERENCES videos(video_id) ON DELETE CASCADE
+);
+
+-- Video summaries: hierarchical index of long videos, one summary per section
+-- (window of consecutive chunks) and one for the whole video, embedded for
+-- coarse-to-fine retrieval (see backend/services/summaries.py)
+CREATE TABLE IF NOT EXISTS video_summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    level TEXT NOT NULL,  -- section or video
+    section_index INTEGER NOT NULL,  -- Order within video (0 for the video summary)
+    text TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL NOT NULL,
+    embedding_model TEXT NOT NULL,
+    embedding BLOB NOT NULL,  -- float32 vector
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (video_id) REFERENCES videos(video_id) ON DELETE CASCADE
+);
+
+-- Ingestion stages table: per-stage timings recorded by the ingestion tracer
+CREATE TABLE IF NOT EXISTS ingestion_stages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    video_id TEXT NOT NULL,
+    trace_id TEXT NOT NULL,  -- Groups the stages of one ingestion run
+    stage TEXT NOT NULL,  -- metadata, transcript, download, split, transcribe_segment, embed, ...
+    parent_stage TEXT,  -- Enclosing stage (e.g. transcribe for transcribe_segment)
+    duration_ms REAL NOT NULL,
+    started_at REAL NOT NULL,  -- Unix timestamp in seconds
+    attributes TEXT,  -- JSON encoded span attributes (segment index, counts)
+    error TEXT,  -- Error message if the stage raised
+    FOREIGN KEY (video_id) REFERENCES videos(video_id) ON DELETE CASCADE
+);
+
+-- Reindex jobs: re-chunk / re-embed runs over stored transcripts
+CREATE TABLE IF NOT EXISTS reindex_jobs (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, running, completed, failed, interrupted
+    params TEXT NOT NULL,  -- JSON encoded chunk_size, chunk_overlap, batch_size, concurrency
+    total_videos INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Reindex items: one row per video per job, marked done in the same
+-- transaction that swaps the video's chunks, so jobs resume where they stopped
+CREATE TABLE IF NOT EXISTS reindex_items (
+    job_id TEXT NOT NULL,
+    video_id TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',  -- pending, done, failed
+    chunk_count INTEGER,
+    error TEXT,
+    PRIMARY KEY (job_id, video_id),
+    FOREIGN KEY (job_id) REFERENCES reindex_jobs(job_id) ON DELETE CASCADE
+);
+
+-- Indexes for performance (each backs a query checked by backend/benchmarks/query_plans.py;
+-- chunk_id lookups use the UNIQUE constraint's index)
+CREATE INDEX IF NOT EXISTS idx_transcripts_video_segment ON transcripts(video_id, segment_index, start_time, end_time, text);
+CREATE INDEX IF NOT EXISTS idx_chunks_video_index ON chunks(video_id, chunk_index);
+CREATE INDEX IF NOT EXISTS idx_chunks_generation_video_index ON chunks(generation_id, video_id, chunk_index);
+CREATE INDEX IF NOT EXISTS idx_suggestions_video_id ON question_suggestions(video_id, id);
+CREATE INDEX IF NOT EXISTS idx_ingestion_stages_video ON ingestion_stages(video_id, trace_id);
+CREATE INDEX IF NOT EXISTS idx_video_summaries_video ON video_summaries(video_id, level, section_index);
+
+-- Library summary tables: maintained incrementally by the triggers below so
+-- GET /analytics reads a handful of rows regardless of library size
+CREATE TABLE IF NOT EXISTS video_status_stats (
+    status TEXT PRIMARY KEY,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    total_duration REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS channel_stats (
+    channel_name TEXT PRIMARY KEY,
+    video_count INTEGER NOT NULL DEFAULT 0,
+    completed_count INTEGER NOT NULL DEFAULT 0,
+    total_duration REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS stage_stats (
+    stage TEXT PRIMARY KEY,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    total_ms REAL NOT NULL DEFAULT 0,
+    max_ms REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS library_counters (
+    name TEXT PRIMARY KEY,  -- total_chunks, total_segments, analytics_backfilled
+    value REAL NOT NULL DEFAULT 0
+);
+
+-- Keyset pagination of GET /videos on (created_at, video_id), optionally filtered
+CREATE INDEX IF NOT EXISTS idx_videos_created_id ON videos(created_at, video_id);
+CREATE INDEX IF NOT EXISTS idx_videos_status_created ON videos(status, created_at, video_id);
+CREATE INDEX IF NOT EXISTS idx_videos_channel_created ON videos(channel_name, created_at, video_id);
+CREATE INDEX IF NOT EXISTS idx_channel_stats_count ON channel_stats(video_count);
+
+-- Status/duration summary
+CREATE TRIGGER IF NOT EXISTS trg_videos_status_insert AFTER INSERT ON videos
+BEGIN
+    INSERT INTO video_status_stats (status, video_count, total_duration)
+    VALUES (NEW.status, 1, COALESCE(NEW.duration, 0))
+    ON CONFLICT(status) DO UPDATE SET
+        video_count = video_count + 1,
+        total_duration = total_duration + excluded.total_duration;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_status_update AFTER UPDATE OF status, duration ON videos
+BEGIN
+    UPDATE video_status_stats
+    SET video_count = video_count - 1, total_duration = total_duration - COALESCE(OLD.duration, 0)
+    WHERE status = OLD.status;
+    INSERT INTO video_status_stats (status, video_count, total_duration)
+    VALUES (NEW.status, 1, COALESCE(NEW.duration, 0))
+    ON CONFLICT(status) DO UPDATE SET
+        video_count = video_count + 1,
+        total_duration = total_duration + excluded.total_duration;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_status_delete AFTER DELETE ON videos
+BEGIN
+    UPDATE video_status_stats
+    SET video_count = video_count - 1, total_duration = total_duration - COALESCE(OLD.duration, 0)
+    WHERE status = OLD.status;
+END;
+
+-- Per-channel summary
+CREATE TRIGGER IF NOT EXISTS trg_videos_channel_insert AFTER INSERT ON videos
+WHEN NEW.channel_name IS NOT NULL
+BEGIN
+    INSERT INTO channel_stats (channel_name, video_count, completed_count, total_duration)
+    VALUES (NEW.channel_name, 1, NEW.status = 'completed', COALESCE(NEW.duration, 0))
+    ON CONFLICT(channel_name) DO UPDATE SET
+        video_count = video_count + 1,
+        completed_count = completed_count + excluded.completed_count,
+        total_duration = total_duration + excluded.total_duration;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_channel_update AFTER UPDATE OF channel_name, status, duration ON videos
+BEGIN
+    UPDATE channel_stats
+    SET video_count = video_count - 1,
+        completed_count = completed_count - (OLD.status = 'completed'),
+        total_duration = total_duration - COALESCE(OLD.duration, 0)
+    WHERE channel_name = OLD.channel_name;
+    INSERT INTO channel_stats (channel_name, video_count, completed_count, total_duration)
+    SELECT NEW.channel_name, 1, NEW.status = 'completed', COALESCE(NEW.duration, 0)
+    WHERE NEW.channel_name IS NOT NULL
+    ON CONFLICT(channel_name) DO UPDATE SET
+        video_count = video_count + 1,
+        completed_count = completed_count + excluded.completed_count,
+        total_duration = total_duration + excluded.total_duration;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_channel_delete AFTER DELETE ON videos
+WHEN OLD.channel_name IS NOT NULL
+BEGIN
+    UPDATE channel_stats
+    SET video_count = video_count - 1,
+        completed_count = completed_count - (OLD.status = 'completed'),
+        total_duration = total_duration - COALESCE(OLD.duration, 0)
+    WHERE channel_name = OLD.channel_name;
+END;
+
+-- Chunk / segment totals (chunks of the active index generations only; the
+-- counter is recomputed when a generation is activated)
+
+CREATE TRIGGER IF NOT EXISTS trg_chunks_active_insert AFTER INSERT ON chunks
+WHEN NEW.generation_id IN (SELECT generation_id FROM index_generations WHERE status = 'active')
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'total_chunks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_chunks_active_delete AFTER DELETE ON chunks
+WHEN OLD.generation_id IN (SELECT generation_id FROM index_generations WHERE status = 'active')
+BEGIN
+    UPDATE library_counters SET value = value - 1 WHERE name = 'total_chunks';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transcripts_count_insert AFTER INSERT ON transcripts
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'total_segments';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transcripts_count_delete AFTER DELETE ON transcripts
+BEGIN
+    UPDATE library_counters SET value = value - 1 WHERE name = 'total_segments';
+END;
+
+-- Ingestion stage timings
+CREATE TRIGGER IF NOT EXISTS trg_ingestion_stages_insert AFTER INSERT ON ingestion_stages
+BEGIN
+    INSERT INTO stage_stats (stage, run_count, total_ms, max_ms)
+    VALUES (NEW.stage, 1, NEW.duration_ms, NEW.duration_ms)
+    ON CONFLICT(stage) DO UPDATE SET
+        run_count = run_count + 1,
+        total_ms = total_ms + excluded.total_ms,
+        max_ms = MAX(max_ms, excluded.max_ms);
+END;
+
+-- Library version: bumped on every change to videos, used as the GET /videos ETag
+INSERT OR IGNORE INTO library_counters (name, value) VALUES ('videos_version', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_version_insert AFTER INSERT ON videos
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'videos_version';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_version_update AFTER UPDATE ON videos
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'videos_version';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_videos_version_delete AFTER DELETE ON videos
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'videos_version';
+END;
+
+-- Index generation state version: bumped on every generation insert or status change, so
+-- processes other than the writer (API server vs. reindex CLI) notice and reload it
+INSERT OR IGNORE INTO library_counters (name, value) VALUES ('generations_version', 0);
+
+CREATE TRIGGER IF NOT EXISTS trg_generations_version_insert AFTER INSERT ON index_generations
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'generations_version';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_generations_version_update AFTER UPDATE OF status ON index_generations
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'generations_version';
+END;
+
+-- A finished reindex job has replaced chunk rows (and cleared their precomputed answers)
+-- even when no generation changed
+CREATE TRIGGER IF NOT EXISTS trg_generations_version_reindex AFTER UPDATE OF status ON reindex_jobs
+WHEN NEW.status IN ('completed', 'failed', 'interrupted') AND OLD.status != NEW.status
+BEGIN
+    UPDATE library_counters SET value = value + 1 WHERE name = 'generations_version';
+END;
@@ -1,70 +1,31 @@
 """
 Run database migrations
+
+Creates the database at settings.sqlite_db_path if needed and applies any
+pending versioned migrations (the API server does the same on startup).
+
+Usage:
+    python -m backend.migrate_db
 """
-import sqlite3
-import sys
-from pathlib import Path
+import asyncio
+from backend.database.db import db
+
 
-def run_migration():
-    """Apply database migration for new fields"""
-    db_path = Path("data/videos.db")
-    
-    if not db_path.exists():
-        print("Database not found. Run the app first to create it.")
-        return
-    
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+async def run_migration():
+    """Apply pending migrations and print the resulting schema version"""
+    await db.initialize()
+
+    conn = await db.get_connection()
     try:
-        # Check if columns already exist
-        cursor.execute("PRAGMA table_info(videos)")
-        columns = [col[1] for col in cursor.fetchall()]
-        
-        migrations = []
-        
-        if 'thumbnail_url' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN thumbnail_url TEXT")
-        if 'channel_name' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN channel_name TEXT")
-        if 'upload_date' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN upload_date TEXT")
-        if 'view_count' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN view_count INTEGER")
-        if 'progress_step' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN progress_step TEXT")
-        if 'progress_percent' not in columns:
-            migrations.append("ALTER TABLE videos ADD COLUMN progress_percent REAL DEFAULT 0")
-        
-        for migration in migrations:
-            print(f"Executing: {migration}")
-            cursor.execute(migration)
-        
-        # Create question_suggestions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS question_suggestions (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                video_id TEXT NOT NULL,
-                question TEXT NOT NULL,
-                display_order INTEGER DEFAULT 0,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (video_id) REFERENCES videos(video_id) ON DELETE CASCADE
-            )
-        """)
-        
-        cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_suggestions_video 
-            ON question_suggestions(video_id)
-        """)
-        
-        conn.commit()
-        print("✅ Migration completed successfully!")
-        
-    except Exception as e:
-        print(f"❌ Migration failed: {e}")
-        conn.rollback()
+        cursor = await conn.execute("SELECT version, name, applied_at FROM schema_version ORDER BY version")
+        rows = await cursor.fetchall()
     finally:
-        conn.close()
+        await conn.close()
+
+    for version, name, applied_at in rows:
+        print(f"  {version:>3}  {name}  ({applied_at})")
+    print(f"✅ {db.db_path} is at schema version {rows[-1][0] if rows else 0}")
+
 
 if __name__ == "__main__":
-    run_migration()
+    asyncio.run(run_migration())
@@ -0,0 +1,75 @@
+"""
+Re-chunk / re-embed videos from stored transcripts
+
+Usage:
+    python -m backend.reindex                       # every completed video
+    python -m backend.reindex --video VIDEO_ID ...  # selected videos
+    python -m backend.reindex --chunk-size 400 --chunk-overlap 80 --concurrency 4
+    python -m backend.reindex --embedding-model all-mpnet-base-v2  # build + activate a new generation
+    python -m backend.reindex --resume JOB_ID       # continue an interrupted job
+    python -m backend.reindex --partition multilingual  # videos embedded with the multilingual model
+    python -m backend.reindex --list
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+
+async def main(args) -> int:
+    from backend.database.db import db, init_db
+    from backend.services.reindex import reindex_service
+    from backend.services.index_generations import index_manager
+    
+    await init_db()
+    await index_manager.load()
+    try:
+        if args.list:
+            for job in await reindex_service.list_jobs(args.limit):
+                print(json.dumps(job, default=str))
+            return 0
+        
+        if args.resume:
+            job_id = args.resume
+            if await reindex_service.get_job(job_id) is None:
+                print(f"Reindex job {job_id} not found", file=sys.stderr)
+                return 1
+        else:
+            job_id = await reindex_service.create_job(
+                video_ids=args.video or None,
+                chunk_size=args.chunk_size,
+                chunk_overlap=args.chunk_overlap,
+                batch_size=args.batch_size,
+                concurrency=args.concurrency,
+                embedding_model=args.embedding_model,
+                partition=args.partition
+            )
+        
+        print(f"Running reindex job {job_id}")
+        try:
+            await reindex_service.run(job_id)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print(f"Interrupted; resume with: python -m backend.reindex --resume {job_id}", file=sys.stderr)
+            return 130
+        
+        job = await reindex_service.get_job(job_id)
+        print(json.dumps(job, default=str, indent=2))
+        return 0 if job["status"] == "completed" else 1
+    finally:
+        await db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild chunks and embeddings from stored transcripts")
+    parser.add_argument("--video", action="append", help="Video id to reindex (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=None)
+    parser.add_argument("--chunk-overlap", type=int, default=None)
+    parser.add_argument("--embedding-model", default=None, help="Defaults to the partition's configured model")
+    parser.add_argument("--partition", choices=["default", "multilingual"],
+                        default="default", help="Index partition to rebuild")
+    parser.add_argument("--batch-size", type=int, default=256, help="Chunks per embedding call")
+    parser.add_argument("--concurrency", type=int, default=2, help="Parallel embed/swap workers")
+    parser.add_argument("--resume", metavar="JOB_ID", help="Resume an existing job")
+    parser.add_argument("--list", action="store_true", help="List recent jobs")
+    parser.add_argument("--limit", type=int, default=20)
+    sys.exit(asyncio.run(main(parser.parse_args())))
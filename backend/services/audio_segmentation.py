@@ -0,0 +1,197 @@
+"""
+Silence-aware audio segmentation for Whisper
+
+Long audio is split into as few Whisper requests as possible: each
+segment is sized to approach ``settings.audio_target_segment_mb`` (kept
+below the 25 MB API limit), and its cut is moved to the nearest silence
+found by one ffmpeg ``silencedetect`` pass so words are not chopped.
+With ``settings.audio_transcode`` the audio is first re-encoded with
+``whisper_encoder_args`` and sizes are planned from the smaller file.
+Segments overlap by ``settings.audio_segment_overlap_seconds`` at every
+cut; ``stitch_transcripts`` keeps each side's segments up to the cut and
+drops words repeated across it.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from backend.app.config import settings
+import re
+import subprocess
+import logging
+
+logger = logging.getLogger(__name__)
+
+WHISPER_MAX_BYTES = 25 * 1024 * 1024
+
+# Longest run of words compared when removing repeats across a cut
+MAX_OVERLAP_WORDS = 30
+
+_SILENCE_START = re.compile(r"silence_start:\s*(-?[\d.]+)")
+_SILENCE_END = re.compile(r"silence_end:\s*(-?[\d.]+)")
+_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):([\d.]+)")
+
+
+@dataclass
+class PlannedSegment:
+    """
+    One ffmpeg cut: audio from ``start`` to ``end`` is transcribed, and the
+    stitched transcript keeps what falls between ``cut_start`` and ``cut_end``
+    """
+    index: int
+    start: float
+    end: float
+    cut_start: float
+    cut_end: float
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+def whisper_encoder_args() -> List[str]:
+    """ffmpeg output options for 16 kHz mono Opus, the sample rate Whisper resamples to anyway"""
+    return [
+        '-ac', '1', '-ar', '16000',
+        '-c:a', 'libopus', '-b:a', f"{settings.audio_transcode_bitrate_kbps}k",
+        '-application', 'voip',
+    ]
+
+
+def transcoded_bytes_per_second() -> float:
+    return settings.audio_transcode_bitrate_kbps * 1000 / 8
+
+
+def target_segment_bytes() -> int:
+    return int(min(settings.audio_target_segment_mb * 1024 * 1024, WHISPER_MAX_BYTES * 0.95))
+
+
+def target_segment_seconds(bytes_per_second: float) -> Optional[float]:
+    """Segment length that reaches the target size at the given bitrate (None if unknown)"""
+    if bytes_per_second <= 0:
+        return None
+    return target_segment_bytes() / bytes_per_second
+
+
+def detect_silences(audio_path: str) -> Tuple[List[Tuple[float, float]], Optional[float]]:
+    """
+    Run ffmpeg silencedetect over the whole file
+
+    Returns:
+        ([(silence_start, silence_end), ...], duration_seconds or None)
+    """
+    cmd = [
+        'ffmpeg', '-hide_banner', '-nostats',
+        '-i', audio_path,
+        '-vn',
+        '-af', f"silencedetect=noise={settings.silence_noise_db}dB:d={settings.silence_min_seconds}",
+        '-f', 'null', '-',
+    ]
+    result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+
+    silences, start = [], None
+    for line in result.stderr.splitlines():
+        match = _SILENCE_START.search(line)
+        if match:
+            start = max(float(match.group(1)), 0.0)
+            continue
+        match = _SILENCE_END.search(line)
+        if match and start is not None:
+            silences.append((start, float(match.group(1))))
+            start = None
+
+    duration = None
+    match = _DURATION.search(result.stderr)
+    if match:
+        hours, minutes, seconds = match.groups()
+        duration = int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    if start is not None and duration:
+        # Trailing silence runs to the end of the file
+        silences.append((start, duration))
+    return silences, duration
+
+
+def plan_segments(duration: float, file_size: int, silences: List[Tuple[float, float]]) -> List[PlannedSegment]:
+    """
+    Choose cut points so segments approach the target size and fall in silences
+
+    Each cut is the midpoint of the silence closest to the target length
+    within its last quarter; without one the segment is cut at the
+    target length. Overlap is added on both sides of every cut.
+    """
+    overlap = max(settings.audio_segment_overlap_seconds, 0.0)
+    bytes_per_second = file_size / duration if duration > 0 else 0
+    target = target_segment_seconds(bytes_per_second) or duration
+    # The overlap counts against the size limit too
+    target = max(target - 2 * overlap, 1.0)
+
+    midpoints = [(start + end) / 2 for start, end in silences]
+    cuts = []
+    position = 0.0
+    while duration - position > target:
+        ideal = position + target
+        window = [m for m in midpoints if ideal - target / 4 <= m <= ideal]
+        cut = max(window) if window else ideal
+        cuts.append(cut)
+        position = cut
+
+    boundaries = [0.0] + cuts + [duration]
+    plan = []
+    for i in range(len(boundaries) - 1):
+        cut_start, cut_end = boundaries[i], boundaries[i + 1]
+        plan.append(PlannedSegment(
+            index=i,
+            start=max(cut_start - overlap, 0.0) if i > 0 else 0.0,
+            end=min(cut_end + overlap, duration) if i < len(boundaries) - 2 else duration,
+            cut_start=cut_start,
+            cut_end=cut_end,
+        ))
+    return plan
+
+
+def _words(text: str) -> List[str]:
+    return text.split()
+
+
+def _normalize(word: str) -> str:
+    return re.sub(r"[^\w']", "", word.lower())
+
+
+def _repeated_prefix(previous: str, following: str) -> int:
+    """Number of leading words of ``following`` that repeat the end of ``previous``"""
+    tail = [_normalize(w) for w in _words(previous)[-MAX_OVERLAP_WORDS:]]
+    head = [_normalize(w) for w in _words(following)[:MAX_OVERLAP_WORDS]]
+    for size in range(min(len(tail), len(head)), 0, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    return 0
+
+
+def stitch_transcripts(parts: List[Tuple[PlannedSegment, List[Dict]]]) -> List[Dict]:
+    """
+    Merge per-segment transcripts (timestamps already absolute) into one
+
+    From each part only segments whose midpoint lies between its cuts are
+    kept, so each stretch of audio is represented once; words at the start
+    of a part that repeat the end of the previous part are then removed.
+    """
+    stitched: List[Dict] = []
+    for position, (planned, segments) in enumerate(parts):
+        # The first and last parts have no neighbour to defer to
+        lower = planned.cut_start if position > 0 else float("-inf")
+        upper = planned.cut_end if position < len(parts) - 1 else float("inf")
+        kept = [
+            segment for segment in segments
+            if lower <= (segment["start"] + segment["end"]) / 2 < upper
+        ]
+        # Only compare text that was actually heard twice, inside the overlap
+        overlap = planned.cut_start - planned.start
+        if stitched and kept and overlap > 0 and kept[0]["start"] < planned.cut_start + overlap \
+                and stitched[-1]["end"] > planned.start:
+            repeated = _repeated_prefix(stitched[-1]["text"], kept[0]["text"])
+            if repeated:
+                remaining = " ".join(_words(kept[0]["text"])[repeated:])
+                if remaining:
+                    kept[0] = {**kept[0], "text": remaining}
+                else:
+                    kept = kept[1:]
+        stitched.extend(kept)
+    return stitched
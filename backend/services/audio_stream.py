@@ -0,0 +1,305 @@
+"""
+Streaming audio segmentation for Whisper transcription
+
+Instead of downloading the whole audio file and then cutting it, the
+audio stream is piped from yt-dlp into a single ffmpeg process using the
+segment muxer:
+
+    yt-dlp -o - | (relay) | ffmpeg -f segment ... seg00000.m4a, seg00001.m4a, ...
+
+ffmpeg reports each segment on stdout (``-segment_list pipe:1``) once the
+file is closed, so it can be transcribed while the rest is still
+downloading. The relay stops feeding ffmpeg while ``max_pending``
+finished segments have not been released, which in turn stalls yt-dlp on
+a full pipe, so at most ``max_pending`` + 1 segments are ever on disk.
+
+Usage:
+    async with AudioSegmentStream(url, video_id) as stream:
+        async for segment in stream:
+            ...
+            stream.release(segment)
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+from backend.app.config import settings
+from backend.services.audio_segmentation import (
+    target_segment_seconds, transcoded_bytes_per_second, whisper_encoder_args
+)
+import yt_dlp
+import asyncio
+import json
+import shutil
+import sys
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Source extension -> (segment muxer format, segment file extension) when copying the codec;
+# other sources are transcoded to mp3 (and every source to Opus with settings.audio_transcode)
+SEGMENT_CONTAINERS = {
+    "m4a": ("mp4", "m4a"),
+    "mp4": ("mp4", "m4a"),
+    "webm": ("webm", "webm"),
+    "ogg": ("ogg", "ogg"),
+    "mp3": ("mp3", "mp3"),
+}
+
+RELAY_CHUNK_BYTES = 64 * 1024
+
+# Used when neither the segment length nor the bitrate is known
+DEFAULT_SEGMENT_SECONDS = 300
+
+# Seconds to wait for both processes to exit once ffmpeg has closed its output
+PROCESS_EXIT_TIMEOUT = 30
+
+
+@dataclass
+class AudioSegment:
+    """One finished segment file and its position in the source audio"""
+    index: int
+    path: Path
+    start: float
+    end: float
+
+
+class AudioSegmentStream:
+    """Async iterator over audio segments produced while the download is in progress"""
+
+    def __init__(self, youtube_url: str, video_id: str, segment_seconds: Optional[int] = None,
+                 max_pending: Optional[int] = None, work_root: str = "downloads"):
+        self.youtube_url = youtube_url
+        self.video_id = video_id
+        # 0 sizes segments from the bitrate once the format is known
+        self.segment_seconds = segment_seconds or settings.audio_segment_seconds
+        self.max_pending = max(max_pending or settings.audio_max_pending_segments, 1)
+        self.work_dir = Path(work_root) / f"{video_id}.stream"
+        self.title: str = "Unknown"
+        self.duration: float = 0.0
+        self.format_id: Optional[str] = None
+        self.ext: str = "m4a"
+        self._source: Optional[asyncio.subprocess.Process] = None
+        self._ffmpeg: Optional[asyncio.subprocess.Process] = None
+        self._relay_task: Optional[asyncio.Task] = None
+        self._source_stopped = False
+        self._logs: List = []
+        self._pending = 0
+        self._released = asyncio.Event()
+        self._index = 0
+        self._last_end = 0.0
+
+    @staticmethod
+    def available() -> bool:
+        """Whether ffmpeg is installed"""
+        return shutil.which("ffmpeg") is not None
+
+    def _extract_info(self) -> dict:
+        """Resolve the audio format without downloading (same options as ingest.download_audio)"""
+        ydl_opts = {
+            'format': 'worstaudio[ext=m4a]/worstaudio/worst',
+            'quiet': True,
+            'no_warnings': True,
+            'http_headers': {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+                'Accept-Language': 'en-us,en;q=0.5',
+                'Sec-Fetch-Mode': 'navigate',
+            },
+            'extractor_args': {
+                'youtube': {
+                    'player_client': ['android', 'web'],
+                    'skip': ['dash', 'hls'],
+                }
+            },
+        }
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(self.youtube_url, download=False)
+            return ydl.sanitize_info(info)
+
+    async def _resolve(self):
+        info = await asyncio.to_thread(self._extract_info)
+        self.title = info.get('title', 'Unknown')
+        self.duration = float(info.get('duration') or 0)
+        self.format_id = info.get('format_id')
+        self.ext = info.get('ext', 'm4a')
+        if not self.segment_seconds:
+            self.segment_seconds = self._size_targeted_seconds(info)
+        # The download process reuses the resolved info instead of extracting again
+        with open(self.work_dir / "info.json", "w") as f:
+            json.dump(info, f)
+
+    def _size_targeted_seconds(self, info: dict) -> int:
+        """Segment length that fills a Whisper request at the stream's bitrate"""
+        if settings.audio_transcode:
+            bytes_per_second = transcoded_bytes_per_second()
+        elif self.ext not in SEGMENT_CONTAINERS:
+            bytes_per_second = 64_000 / 8  # Transcoded to 64 kbit/s mp3
+        elif (info.get('filesize') or info.get('filesize_approx')) and self.duration:
+            bytes_per_second = (info.get('filesize') or info.get('filesize_approx')) / self.duration
+        else:
+            bytes_per_second = (info.get('abr') or info.get('tbr') or 0) * 1000 / 8
+        seconds = target_segment_seconds(bytes_per_second) or DEFAULT_SEGMENT_SECONDS
+        # Segments are cut at packet boundaries, so leave some headroom
+        return max(int(seconds * 0.9), 1)
+
+    def _source_command(self) -> List[str]:
+        """Command writing the raw audio stream to stdout"""
+        return [
+            sys.executable, "-m", "yt_dlp",
+            "--load-info-json", str(self.work_dir / "info.json"),
+            "-f", self.format_id or "bestaudio",
+            "--quiet", "--no-warnings", "--no-part",
+            "-o", "-",
+        ]
+
+    def _ffmpeg_command(self) -> List[str]:
+        container = SEGMENT_CONTAINERS.get(self.ext)
+        if settings.audio_transcode:
+            segment_format, extension = "ogg", "ogg"
+            codec = whisper_encoder_args()
+        elif container:
+            segment_format, extension = container
+            codec = ['-c:a', 'copy']
+        else:
+            segment_format, extension = "mp3", "mp3"
+            codec = ['-c:a', 'libmp3lame', '-b:a', '64k']
+        return [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-i', 'pipe:0',
+            '-vn', *codec,
+            '-f', 'segment',
+            '-segment_time', str(self.segment_seconds),
+            '-segment_format', segment_format,
+            '-reset_timestamps', '1',
+            '-segment_list', 'pipe:1',
+            '-segment_list_type', 'csv',
+            str(self.work_dir / f"seg%05d.{extension}"),
+        ]
+
+    async def start(self):
+        """Resolve the format and start the download and segmenting processes"""
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.work_dir.mkdir(parents=True)
+        if self.format_id is None:
+            await self._resolve()
+        self.segment_seconds = self.segment_seconds or DEFAULT_SEGMENT_SECONDS
+
+        self._logs = [open(self.work_dir / "source.log", "wb"), open(self.work_dir / "ffmpeg.log", "wb")]
+        self._source = await asyncio.create_subprocess_exec(
+            *self._source_command(),
+            stdout=asyncio.subprocess.PIPE,
+            stderr=self._logs[0],
+        )
+        self._ffmpeg = await asyncio.create_subprocess_exec(
+            *self._ffmpeg_command(),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=self._logs[1],
+        )
+        self._relay_task = asyncio.create_task(self._relay())
+        logger.info(f"Streaming audio for {self.video_id} (format {self.format_id}, {self.ext}) "
+                    f"in {self.segment_seconds}s segments")
+
+    async def _relay(self):
+        """Copy the download into ffmpeg, pausing while too many segments are unreleased"""
+        try:
+            while True:
+                data = await self._source.stdout.read(RELAY_CHUNK_BYTES)
+                if not data:
+                    break
+                while self._pending >= self.max_pending:
+                    self._released.clear()
+                    await self._released.wait()
+                self._ffmpeg.stdin.write(data)
+                await self._ffmpeg.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            # ffmpeg exited early; its return code is reported by _finish. Nothing
+            # reads the download any more, so stop it before it blocks on a full pipe.
+            self._stop_source()
+        finally:
+            self._ffmpeg.stdin.close()
+
+    def _stop_source(self):
+        if self._source is not None and self._source.returncode is None:
+            self._source_stopped = True
+            self._source.kill()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> AudioSegment:
+        line = await self._ffmpeg.stdout.readline()
+        if not line:
+            await self._finish()
+            raise StopAsyncIteration
+
+        filename, start, end = line.decode().strip().rsplit(",", 2)
+        segment = AudioSegment(self._index, self.work_dir / filename, float(start), float(end))
+        self._index += 1
+        self._pending += 1
+        self._last_end = segment.end
+        return segment
+
+    def release(self, segment: AudioSegment):
+        """Delete a processed segment and let the download continue"""
+        segment.path.unlink(missing_ok=True)
+        self._pending -= 1
+        self._released.set()
+
+    def _log_tail(self, name: str) -> str:
+        try:
+            return (self.work_dir / name).read_text(errors="replace").strip()[-500:]
+        except OSError:
+            return ""
+
+    async def _finish(self):
+        """Wait (bounded) for both processes and raise if either failed"""
+        try:
+            source_code, ffmpeg_code = await asyncio.wait_for(self._wait_processes(), PROCESS_EXIT_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"Audio processes did not exit within {PROCESS_EXIT_TIMEOUT}s "
+                               f"after the last segment: {self._log_tail('ffmpeg.log')}")
+        # A download killed by the relay failed because ffmpeg did
+        if source_code != 0 and not self._source_stopped:
+            raise RuntimeError(f"Audio download exited with {source_code}: {self._log_tail('source.log')}")
+        if ffmpeg_code != 0:
+            raise RuntimeError(f"ffmpeg segmenting exited with {ffmpeg_code}: {self._log_tail('ffmpeg.log')}")
+        # ffmpeg exits cleanly on some unreadable input (e.g. MP4 with the index at the end)
+        if self.duration and self._last_end < self.duration * 0.9:
+            raise RuntimeError(f"Audio stream ended at {self._last_end:.0f}s of {self.duration:.0f}s: "
+                               f"{self._log_tail('ffmpeg.log')}")
+
+    async def _wait_processes(self) -> tuple:
+        await self._relay_task
+        # ffmpeg's output is closed, so a download still writing could only block
+        ffmpeg_code = await self._ffmpeg.wait()
+        if ffmpeg_code != 0:
+            self._stop_source()
+        return await self._source.wait(), ffmpeg_code
+
+    async def close(self):
+        """Stop both processes (if still running) and remove the working directory"""
+        if self._relay_task is not None and not self._relay_task.done():
+            self._relay_task.cancel()
+            try:
+                await self._relay_task
+            except (asyncio.CancelledError, Exception):
+                pass
+        for process in (self._source, self._ffmpeg):
+            if process is not None and process.returncode is None:
+                process.kill()
+                await process.wait()
+        for log in self._logs:
+            log.close()
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    async def __aenter__(self) -> "AudioSegmentStream":
+        try:
+            await self.start()
+        except BaseException:
+            await self.close()
+            raise
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
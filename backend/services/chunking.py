@@ -11,9 +11,9 @@ logger = logging.getLogger(__name__)
 class ChunkingService:
     """Handles intelligent text chunking while preserving timestamps"""
     
-    def __init__(self):
-        self.target_chunk_size = settings.chunk_size  # Target tokens per chunk
-        self.overlap_size = settings.chunk_overlap
+    def __init__(self, chunk_size: int = None, chunk_overlap: int = None):
+        self.target_chunk_size = chunk_size or settings.chunk_size  # Target tokens per chunk
+        self.overlap_size = chunk_overlap if chunk_overlap is not None else settings.chunk_overlap
     
     def chunk_transcript(self, segments: List[Dict]) -> List[Dict]:
         """
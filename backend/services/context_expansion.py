@@ -0,0 +1,151 @@
+"""
+Query-time neighbor expansion over chunk adjacency
+
+With ``settings.retrieval_mode = "neighbors"`` a query retrieves only
+``settings.neighbor_top_k`` chunks and widens each hit with up to
+``settings.neighbor_max_chunks`` adjacent chunks (by ``chunk_index``) on
+either side, keeping neighbors within ``settings.neighbor_window_seconds``
+of the hit. All neighbors come from one query that seeks each chunk_index
+in ``idx_chunks_generation_video_index``; runs of consecutive chunks are then
+merged into a single span, with the text the chunker repeats between
+neighbouring chunks removed, so the LLM sees fewer, longer passages.
+"""
+from typing import Dict, List
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.index_generations import IndexGeneration
+from backend.services.vector_store import vector_store
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Longest run of words compared when removing the overlap between adjacent chunks
+MAX_OVERLAP_WORDS = 200
+
+
+def expansion_indexes(hit_indexes: List[int], max_chunks: int) -> List[int]:
+    """Sorted chunk indexes of the hits and up to ``max_chunks`` neighbors on each side"""
+    return sorted({
+        neighbor
+        for index in hit_indexes
+        for neighbor in range(max(index - max_chunks, 0), index + max_chunks + 1)
+    })
+
+
+def _overlap_words(previous: List[str], following: List[str]) -> int:
+    """Number of leading words of ``following`` that repeat the end of ``previous``"""
+    for size in range(min(len(previous), len(following), MAX_OVERLAP_WORDS), 0, -1):
+        if previous[-size:] == following[:size]:
+            return size
+    return 0
+
+
+def merge_spans(rows: List[Dict]) -> List[Dict]:
+    """
+    Merge chunks with consecutive ``chunk_index`` into spans
+
+    Args:
+        rows: [{"chunk_index", "text", "start_time", "end_time"}, ...] sorted by chunk_index
+
+    Returns:
+        [{"text", "start_time", "end_time", "chunk_count"}, ...]
+    """
+    spans: List[Dict] = []
+    last_index = None
+    for row in rows:
+        words = row["text"].split()
+        if spans and last_index is not None and row["chunk_index"] == last_index + 1:
+            span = spans[-1]
+            repeated = _overlap_words(span["words"], words)
+            span["words"].extend(words[repeated:])
+            span["end_time"] = max(span["end_time"], row["end_time"])
+            span["chunk_count"] += 1
+        else:
+            spans.append({
+                "words": words,
+                "start_time": row["start_time"],
+                "end_time": row["end_time"],
+                "chunk_count": 1,
+            })
+        last_index = row["chunk_index"]
+    return [
+        {
+            "text": " ".join(span.pop("words")),
+            **span,
+        }
+        for span in spans
+    ]
+
+
+class ContextExpansionService:
+    """Expands retrieved chunks with their neighbors from SQLite"""
+
+    async def fetch_chunks(self, video_id: str, generation_id: int, chunk_indexes: List[int]) -> List[Dict]:
+        """Chunk rows of a video by chunk_index, in one query (an index seek per value)"""
+        if not chunk_indexes:
+            return []
+        placeholders = ", ".join("?" * len(chunk_indexes))
+
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                f"""SELECT chunk_id, chunk_index, text, start_time, end_time FROM chunks
+                    WHERE generation_id = ? AND video_id = ? AND chunk_index IN ({placeholders})
+                    ORDER BY chunk_index""",
+                [generation_id, video_id, *chunk_indexes]
+            )
+            rows = await cursor.fetchall()
+        finally:
+            await conn.close()
+        return [
+            {
+                "chunk_id": row[0],
+                "chunk_index": row[1],
+                "text": row[2],
+                "start_time": row[3],
+                "end_time": row[4],
+            }
+            for row in rows
+        ]
+
+    async def expand(self, video_id: str, generation: IndexGeneration, hits: List[Dict]) -> List[Dict]:
+        """
+        Widen retrieved hits with adjacent chunks and merge contiguous spans
+
+        Args:
+            hits: [{"chunk_id", "chunk_index", "text" (may be None), "start_time", "end_time"}, ...]
+
+        Returns:
+            Context spans for the LLM: [{"text", "start_time", "end_time", "chunk_count"}, ...].
+            Hits without a chunk row (e.g. mid-swap during a reindex) are dropped.
+        """
+        window = max(settings.neighbor_window_seconds, 0.0)
+        chunk_indexes = expansion_indexes([hit["chunk_index"] for hit in hits], max(settings.neighbor_max_chunks, 0))
+        rows = await self.fetch_chunks(video_id, generation.generation_id, chunk_indexes)
+
+        hit_indexes = {hit["chunk_index"] for hit in hits}
+        hit_times = [(hit["start_time"], hit["end_time"]) for hit in hits]
+        kept = [
+            row for row in rows
+            if row["chunk_index"] in hit_indexes or any(
+                row["end_time"] >= start - window and row["start_time"] <= end + window
+                for start, end in hit_times
+            )
+        ]
+
+        # Chunks written with CHUNK_PAYLOAD_STORE=vector keep their text in ChromaDB only
+        documents = {hit["chunk_id"]: hit["text"] for hit in hits if hit.get("text")}
+        missing = [row["chunk_id"] for row in kept if not row["text"] and row["chunk_id"] not in documents]
+        documents.update(await vector_store.get_documents(missing, generation.collection_name))
+        for row in kept:
+            row["text"] = row["text"] or documents.get(row["chunk_id"], "")
+
+        spans = merge_spans(kept)
+        logger.info(
+            f"Expanded {len(hits)} hits for video {video_id} to {len(kept)} chunks in {len(spans)} spans"
+        )
+        return spans
+
+
+# Singleton instance
+context_expansion_service = ContextExpansionService()
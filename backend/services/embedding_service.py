@@ -1,9 +1,12 @@
 """
 Embedding generation service using sentence-transformers
 """
+from collections import OrderedDict
 from sentence_transformers import SentenceTransformer
-from typing import List
+from typing import Dict, List, Optional, Tuple
 from backend.app.config import settings
+from backend.services.metrics import embedding_batch_size
+from backend.services.tracing import tracer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,30 +16,53 @@ class EmbeddingService:
     """Generates embeddings for text using local sentence-transformers model"""
     
     def __init__(self):
-        logger.info(f"Loading embedding model: {settings.embedding_model}")
-        self.model = SentenceTransformer(settings.embedding_model)
+        self._models: Dict[str, SentenceTransformer] = {}
+        # Question embeddings by (model, text); suggested questions are pre-warmed here
+        self._query_cache: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self.model = self.get_model(settings.embedding_model)
         self.embedding_dim = self.model.get_sentence_embedding_dimension()
-        logger.info(f"Model loaded. Embedding dimension: {self.embedding_dim}")
     
-    def generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+    def get_model(self, model_name: Optional[str] = None) -> SentenceTransformer:
+        """
+        Load (once) and return a sentence-transformers model
+        
+        Index generations built with other models (see index_generations)
+        load theirs on first use.
+        """
+        model_name = model_name or settings.embedding_model
+        model = self._models.get(model_name)
+        if model is None:
+            logger.info(f"Loading embedding model: {model_name}")
+            model = self._models[model_name] = SentenceTransformer(model_name)
+            logger.info(f"Model loaded. Embedding dimension: {model.get_sentence_embedding_dimension()}")
+        return model
+    
+    def get_dimension(self, model_name: Optional[str] = None) -> int:
+        return self.get_model(model_name).get_sentence_embedding_dimension()
+    
+    def generate_embeddings(self, texts: List[str], model_name: Optional[str] = None) -> List[List[float]]:
         """
         Generate embeddings for a list of texts
         
         Args:
             texts: List of text strings to embed
+            model_name: Embedding model (default: settings.embedding_model)
             
         Returns:
             List of embedding vectors (each is a list of floats)
         """
         try:
             logger.info(f"Generating embeddings for {len(texts)} texts")
+            model = self.get_model(model_name)
             
             # Generate embeddings in batch
-            embeddings = self.model.encode(
-                texts,
-                convert_to_numpy=True,
-                show_progress_bar=False
-            )
+            embedding_batch_size.observe(len(texts))
+            with tracer.span("embedding.encode", batch_size=len(texts)):
+                embeddings = model.encode(
+                    texts,
+                    convert_to_numpy=True,
+                    show_progress_bar=False
+                )
             
             # Convert to list of lists
             embeddings_list = [emb.tolist() for emb in embeddings]
@@ -48,9 +74,30 @@ class EmbeddingService:
             logger.error(f"Embedding generation failed: {e}")
             raise
     
-    def generate_embedding(self, text: str) -> List[float]:
+    def generate_embedding(self, text: str, model_name: Optional[str] = None) -> List[float]:
         """Generate embedding for a single text"""
-        return self.generate_embeddings([text])[0]
+        return self.generate_embeddings([text], model_name)[0]
+    
+    def cache_query_embedding(self, text: str, embedding: List[float], model_name: Optional[str] = None):
+        """Remember a question's embedding (LRU of settings.query_embedding_cache_size entries)"""
+        if settings.query_embedding_cache_size <= 0:
+            return
+        key = (model_name or settings.embedding_model, text)
+        self._query_cache[key] = embedding
+        self._query_cache.move_to_end(key)
+        while len(self._query_cache) > settings.query_embedding_cache_size:
+            self._query_cache.popitem(last=False)
+    
+    def embed_query(self, text: str, model_name: Optional[str] = None) -> List[float]:
+        """Embedding of a user question, served from the query cache when warm"""
+        key = (model_name or settings.embedding_model, text)
+        embedding = self._query_cache.get(key)
+        if embedding is not None:
+            self._query_cache.move_to_end(key)
+            return embedding
+        embedding = self.generate_embedding(text, model_name)
+        self.cache_query_embedding(text, embedding, model_name)
+        return embedding
 
 
 # Singleton instance
@@ -0,0 +1,121 @@
+"""
+Local cache for network fetches made during ingestion
+
+Raw yt-dlp info dicts, YouTube transcripts and Whisper outputs are stored
+as JSON under ``settings.cache_dir/<video_id>/``, keyed by source and a
+variant string (languages, provider/model), so re-ingesting or re-chunking
+a video does no network work. The cache is bounded by
+``settings.cache_max_mb``; least recently used entries are evicted first.
+"""
+from pathlib import Path
+from typing import Any, Optional
+from backend.app.config import settings
+from backend.services.metrics import cache_requests
+import hashlib
+import json
+import os
+import shutil
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class FetchCache:
+    """Size-bounded JSON file cache keyed by (video_id, source, variant)"""
+
+    def __init__(self, root: str, max_bytes: int):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._size: Optional[int] = None  # Computed lazily on first write
+        self._lock = threading.Lock()
+
+    def _path(self, video_id: str, source: str, variant: str) -> Path:
+        digest = hashlib.sha1(f"{source}\0{variant}".encode("utf-8")).hexdigest()[:16]
+        return self.root / video_id / f"{source}-{digest}.json"
+
+    def get(self, video_id: str, source: str, variant: str = "") -> Optional[Any]:
+        """Cached value, or None on a miss"""
+        path = self._path(video_id, source, variant)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            os.utime(path)  # Mark as recently used for eviction
+        except FileNotFoundError:
+            cache_requests.labels(cache=source, result="miss").inc()
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {e}")
+            self._remove(path)
+            cache_requests.labels(cache=source, result="miss").inc()
+            return None
+
+        cache_requests.labels(cache=source, result="hit").inc()
+        return value
+
+    def put(self, video_id: str, source: str, value: Any, variant: str = ""):
+        """Store a JSON-serialisable value, evicting old entries if over budget"""
+        path = self._path(video_id, source, variant)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            previous = path.stat().st_size if path.exists() else 0
+            os.replace(tmp_path, path)
+            added = path.stat().st_size - previous
+        except (OSError, TypeError, ValueError) as e:
+            logger.warning(f"Failed to cache {source} for {video_id}: {e}")
+            return
+
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += added
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def invalidate(self, video_id: str):
+        """Drop every cached fetch for a video"""
+        directory = self.root / video_id
+        if directory.exists():
+            shutil.rmtree(directory, ignore_errors=True)
+            with self._lock:
+                self._size = None
+
+    def _scan_size(self) -> int:
+        return sum(path.stat().st_size for path in self.root.glob("*/*.json"))
+
+    def _evict(self):
+        """Delete least recently used entries until under budget (lock held)"""
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+
+        size = sum(entry[1] for entry in entries)
+        for _, entry_size, path in entries:
+            if size <= self.max_bytes:
+                break
+            self._remove(path)
+            size -= entry_size
+            logger.info(f"Evicted cache entry {path}")
+        self._size = size
+
+    @staticmethod
+    def _remove(path: Path):
+        try:
+            path.unlink()
+            if not any(path.parent.iterdir()):
+                path.parent.rmdir()
+        except OSError:
+            pass
+
+
+# Singleton instance
+fetch_cache = FetchCache(settings.cache_dir, settings.cache_max_mb * 1024 * 1024)
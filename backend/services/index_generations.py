@@ -0,0 +1,448 @@
+"""
+Versioned vector index generations (blue/green)
+
+Every ChromaDB collection is an index generation that records the
+embedding model, vector dimension and chunking parameters that built it,
+and every ``chunks`` row records its generation. Queries embed with the
+active generation's model and search its collection, so changing
+``settings.embedding_model`` can never mix incompatible vectors.
+
+A new generation is built in the background by a reindex job while queries
+keep hitting the active one; ingestion writes to both until the new
+generation is flipped active in a single transaction. Retired generations
+are garbage-collected after ``settings.index_gc_grace_seconds`` so queries
+that started before the flip can finish.
+
+Generations belong to an index partition. Videos whose transcript language
+is in ``settings.default_partition_languages`` go to the ``default``
+partition (``settings.embedding_model``); all others go to the
+``multilingual`` partition, embedded with
+``settings.multilingual_embedding_model`` so they are searchable without
+translation. Each partition has its own active generation, created on
+first use.
+
+Generation state is cached in memory. A trigger bumps the
+``generations_version`` counter on every change, and the API server
+polls it every ``settings.index_state_poll_seconds`` and reloads, so a
+generation built and activated by ``python -m backend.reindex`` is picked
+up without a restart. Finished reindex jobs bump the counter too, and
+``on_refresh`` listeners (the suggestion answer backfill) run after each
+such reload.
+"""
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.embedding_service import embedding_service
+from backend.services.vector_store import vector_store
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+_COLUMNS = """generation_id, collection_name, embedding_model, embedding_dim, chunk_size,
+              chunk_overlap, status, created_at, activated_at, retired_at, index_partition"""
+
+DEFAULT_PARTITION = "default"
+MULTILINGUAL_PARTITION = "multilingual"
+
+
+def partition_for_language(language: Optional[str]) -> str:
+    """Index partition for a transcript language code (unknown languages use the default)"""
+    if not language or not settings.multilingual_embedding_model:
+        return DEFAULT_PARTITION
+    base = language.replace("_", "-").split("-")[0].lower()
+    return DEFAULT_PARTITION if base in settings.default_partition_language_codes else MULTILINGUAL_PARTITION
+
+
+def partition_model(partition: str) -> str:
+    """Embedding model new generations of a partition are built with"""
+    if partition == MULTILINGUAL_PARTITION:
+        return settings.multilingual_embedding_model
+    return settings.embedding_model
+
+
+@dataclass
+class IndexGeneration:
+    """One vector collection and the parameters that produced it"""
+    generation_id: int
+    collection_name: str
+    embedding_model: str
+    embedding_dim: Optional[int]
+    chunk_size: int
+    chunk_overlap: int
+    status: str
+    created_at: Optional[str] = None
+    activated_at: Optional[str] = None
+    retired_at: Optional[str] = None
+    index_partition: str = DEFAULT_PARTITION
+
+    def matches(self, embedding_model: str, chunk_size: int, chunk_overlap: int) -> bool:
+        return (self.embedding_model, self.chunk_size, self.chunk_overlap) == (
+            embedding_model, chunk_size, chunk_overlap
+        )
+
+
+class IndexGenerationManager:
+    """Tracks the active and building generations and flips between them"""
+
+    def __init__(self):
+        # Until load() runs (scripts, benchmarks) the legacy collection is active.
+        # ``active`` is the default partition's; other partitions are in ``partitions``
+        self.active = IndexGeneration(
+            generation_id=1,
+            collection_name="video_chunks",
+            embedding_model=settings.embedding_model,
+            embedding_dim=None,
+            chunk_size=settings.chunk_size,
+            chunk_overlap=settings.chunk_overlap,
+            status="active",
+        )
+        self.building: List[IndexGeneration] = []
+        self.partitions: Dict[str, IndexGeneration] = {}
+        self._partition_lock = asyncio.Lock()
+        self._version: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self._gc_tasks: Set[asyncio.Task] = set()
+        self._refresh_listeners: List[Callable[[], Awaitable[None]]] = []
+
+    async def _state_version(self) -> Optional[float]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute("SELECT value FROM library_counters WHERE name = 'generations_version'")
+            row = await cursor.fetchone()
+        finally:
+            await conn.close()
+        return row[0] if row else None
+
+    async def load(self):
+        """Read generation state from SQLite and point the vector store at the active one"""
+        # Read the version first: a change made while loading triggers another reload
+        first_load = self._version is None
+        self._version = await self._state_version()
+        generations = await self.list_generations()
+        # Rebuilt from scratch: a partition whose generation was retired elsewhere must not linger
+        partitions: Dict[str, IndexGeneration] = {}
+        for generation in generations:
+            if generation.status != "active":
+                continue
+            if generation.index_partition == DEFAULT_PARTITION:
+                self.active = generation
+            else:
+                partitions[generation.index_partition] = generation
+        self.partitions = partitions
+        self.building = [g for g in generations if g.status == "building"]
+        vector_store.set_active_collection(self.active.collection_name)
+
+        if self.active.embedding_dim is None:
+            # Generation 1 predates versioning; record its dimension once
+            self.active.embedding_dim = embedding_service.get_dimension(self.active.embedding_model)
+            conn = await db.get_connection()
+            try:
+                await conn.execute(
+                    "UPDATE index_generations SET embedding_dim = ? WHERE generation_id = ?",
+                    (self.active.embedding_dim, self.active.generation_id)
+                )
+                await conn.commit()
+            finally:
+                await conn.close()
+
+        if first_load and self.active.embedding_model != settings.embedding_model:
+            logger.warning(
+                f"settings.embedding_model is {settings.embedding_model} but the active index was built "
+                f"with {self.active.embedding_model}; queries keep using the index model until a reindex "
+                f"builds and activates a new generation"
+            )
+
+    def on_refresh(self, listener: Callable[[], Awaitable[None]]):
+        """Run a coroutine function after every reload triggered by another process"""
+        self._refresh_listeners.append(listener)
+
+    async def refresh(self) -> bool:
+        """Reload generation state if another process changed it; returns whether it did"""
+        version = await self._state_version()
+        if version == self._version:
+            return False
+        previous = {g.index_partition: g.generation_id for g in self.live_generations() if g.status == "active"}
+        affected = {g.collection_name for g in self.live_generations()}
+        await self.load()
+        # The other process wrote vectors through its own handles; open fresh ones
+        affected.update(g.collection_name for g in self.live_generations())
+        vector_store.forget_collections(sorted(affected))
+        current = {g.index_partition: g.generation_id for g in self.live_generations() if g.status == "active"}
+        if current != previous:
+            logger.info(f"Index generations changed by another process; active generations now {current}")
+            self.schedule_garbage_collection()
+        for listener in self._refresh_listeners:
+            await listener()
+        return True
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(settings.index_state_poll_seconds)
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh index generation state: {e}")
+
+    def schedule_garbage_collection(self):
+        """Collect the generations retired so far once their grace period has passed"""
+        async def collect_later():
+            await asyncio.sleep(settings.index_gc_grace_seconds + 1)
+            try:
+                await self.collect_garbage()
+            except Exception as e:
+                logger.warning(f"Scheduled index garbage collection failed: {e}")
+
+        try:
+            task = asyncio.get_running_loop().create_task(collect_later())
+        except RuntimeError:
+            return
+        self._gc_tasks.add(task)
+        task.add_done_callback(self._gc_tasks.discard)
+
+    def start(self):
+        """Start polling for generation changes made by other processes (no-op when disabled or running)"""
+        if settings.index_state_poll_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for task in list(self._gc_tasks):
+            task.cancel()
+
+    def active_for(self, partition: str = DEFAULT_PARTITION) -> Optional[IndexGeneration]:
+        """Active generation of a partition (None if the partition was never used)"""
+        if partition == DEFAULT_PARTITION:
+            return self.active
+        return self.partitions.get(partition)
+
+    async def ensure_partition(self, partition: str) -> IndexGeneration:
+        """Active generation of a partition, creating the first one on first use"""
+        generation = self.active_for(partition)
+        if generation is not None:
+            return generation
+        async with self._partition_lock:
+            generation = self.active_for(partition)
+            if generation is None:
+                generation = await self.create_generation(
+                    partition_model(partition), settings.chunk_size, settings.chunk_overlap,
+                    partition=partition, status="active"
+                )
+        return generation
+
+    def write_targets(self, partition: str = DEFAULT_PARTITION) -> List[IndexGeneration]:
+        """Generations that newly ingested videos of a partition must be written to"""
+        active = self.active_for(partition)
+        building = [g for g in self.building if g.index_partition == partition]
+        return [active, *building] if active is not None else building
+
+    def live_generations(self) -> List[IndexGeneration]:
+        """Active generations of every partition and all building ones"""
+        return [self.active, *self.partitions.values(), *self.building]
+
+    async def list_generations(self) -> List[IndexGeneration]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(f"SELECT {_COLUMNS} FROM index_generations ORDER BY generation_id")
+            rows = await cursor.fetchall()
+        finally:
+            await conn.close()
+        return [IndexGeneration(*row) for row in rows]
+
+    async def get_generation(self, generation_id: int) -> Optional[IndexGeneration]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                f"SELECT {_COLUMNS} FROM index_generations WHERE generation_id = ?",
+                (generation_id,)
+            )
+            row = await cursor.fetchone()
+        finally:
+            await conn.close()
+        return IndexGeneration(*row) if row else None
+
+    async def resolve_target(
+        self,
+        embedding_model: Optional[str] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        partition: str = DEFAULT_PARTITION
+    ) -> IndexGeneration:
+        """
+        Generation a reindex of a partition with these parameters should write to
+
+        The active generation when nothing changes (in-place rebuild),
+        otherwise a building generation with the same parameters, created
+        if needed.
+        """
+        embedding_model = embedding_model or partition_model(partition)
+        chunk_size = chunk_size or settings.chunk_size
+        chunk_overlap = chunk_overlap if chunk_overlap is not None else settings.chunk_overlap
+
+        active = await self.ensure_partition(partition)
+        if active.matches(embedding_model, chunk_size, chunk_overlap):
+            return active
+        for generation in self.building:
+            if generation.index_partition == partition and generation.matches(embedding_model, chunk_size, chunk_overlap):
+                return generation
+        return await self.create_generation(embedding_model, chunk_size, chunk_overlap, partition)
+
+    async def create_generation(self, embedding_model: str, chunk_size: int, chunk_overlap: int,
+                                partition: str = DEFAULT_PARTITION, status: str = "building") -> IndexGeneration:
+        """
+        Register a building generation; ingestion starts writing to it immediately
+
+        ``status="active"`` is only used for the first generation of a new partition.
+        """
+        embedding_dim = embedding_service.get_dimension(embedding_model)
+        prefix = "video_chunks" if partition == DEFAULT_PARTITION else f"video_chunks_{partition}"
+
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """INSERT INTO index_generations
+                   (collection_name, embedding_model, embedding_dim, chunk_size, chunk_overlap, status,
+                    activated_at, index_partition)
+                   VALUES ('', ?, ?, ?, ?, ?, CASE WHEN ? = 'active' THEN CURRENT_TIMESTAMP END, ?)""",
+                (embedding_model, embedding_dim, chunk_size, chunk_overlap, status, status, partition)
+            )
+            generation_id = cursor.lastrowid
+            await conn.execute(
+                "UPDATE index_generations SET collection_name = ? WHERE generation_id = ?",
+                (f"{prefix}_g{generation_id}", generation_id)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+        generation = await self.get_generation(generation_id)
+        vector_store.get_collection(generation.collection_name)
+        if status == "active":
+            self.partitions[partition] = generation
+        else:
+            self.building.append(generation)
+        logger.info(
+            f"{'Created' if status == 'active' else 'Building'} index generation {generation_id} "
+            f"({partition} partition, {embedding_model}, dim {embedding_dim}, "
+            f"chunk_size {chunk_size}, overlap {chunk_overlap})"
+        )
+        return generation
+
+    async def activate(self, generation_id: int) -> IndexGeneration:
+        """
+        Atomically make a generation the one queries use
+
+        The previous active generation is retired and kept until garbage
+        collection, so activating it again is a fast rollback (videos
+        ingested after it was retired are missing from it until reindexed).
+        """
+        generation = await self.get_generation(generation_id)
+        if generation is None:
+            raise ValueError(f"Index generation {generation_id} not found")
+        if generation.status not in ("building", "retired", "active"):
+            raise ValueError(f"Index generation {generation_id} is {generation.status}")
+        if generation.status == "active":
+            return generation
+
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                """UPDATE index_generations SET status = 'retired', retired_at = CURRENT_TIMESTAMP
+                   WHERE status = 'active' AND index_partition = ?""",
+                (generation.index_partition,)
+            )
+            await conn.execute(
+                """UPDATE index_generations SET status = 'active', activated_at = CURRENT_TIMESTAMP,
+                   retired_at = NULL WHERE generation_id = ?""",
+                (generation_id,)
+            )
+            await conn.execute(
+                """UPDATE library_counters SET value = (SELECT COUNT(*) FROM chunks WHERE generation_id IN
+                       (SELECT generation_id FROM index_generations WHERE status = 'active'))
+                   WHERE name = 'total_chunks'"""
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+        # Swap in-process state right after the commit; no await in between
+        generation = await self.get_generation(generation_id)
+        previous = self.active_for(generation.index_partition)
+        if generation.index_partition == DEFAULT_PARTITION:
+            vector_store.set_active_collection(generation.collection_name)
+            self.active = generation
+        else:
+            self.partitions[generation.index_partition] = generation
+        self.building = [g for g in self.building if g.generation_id != generation_id]
+        logger.info(
+            f"Activated index generation {generation_id} in the {generation.index_partition} partition"
+            f" (retired {previous.generation_id if previous else 'none'})"
+        )
+        self.schedule_garbage_collection()
+        return generation
+
+    async def retire(self, generation_id: int):
+        """Abandon a building generation (its data is collected with the retired ones)"""
+        generation = await self.get_generation(generation_id)
+        if generation is None or generation.status != "building":
+            raise ValueError(f"Index generation {generation_id} is not building")
+
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                """UPDATE index_generations SET status = 'retired', retired_at = CURRENT_TIMESTAMP
+                   WHERE generation_id = ?""",
+                (generation_id,)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+        self.building = [g for g in self.building if g.generation_id != generation_id]
+
+    async def collect_garbage(self, grace_seconds: Optional[float] = None) -> List[int]:
+        """
+        Drop collections and chunk rows of generations retired more than
+        ``grace_seconds`` ago
+
+        Returns:
+            Collected generation ids
+        """
+        grace_seconds = settings.index_gc_grace_seconds if grace_seconds is None else grace_seconds
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """SELECT generation_id, collection_name FROM index_generations
+                   WHERE status = 'retired' AND retired_at <= datetime('now', ?)""",
+                (f"-{int(grace_seconds)} seconds",)
+            )
+            expired = await cursor.fetchall()
+        finally:
+            await conn.close()
+
+        collected = []
+        for generation_id, collection_name in expired:
+            vector_store.drop_collection(collection_name)
+            conn = await db.get_connection()
+            try:
+                await conn.execute("DELETE FROM chunks WHERE generation_id = ?", (generation_id,))
+                await conn.execute(
+                    "UPDATE index_generations SET status = 'collected' WHERE generation_id = ?",
+                    (generation_id,)
+                )
+                await conn.commit()
+            finally:
+                await conn.close()
+            collected.append(generation_id)
+            logger.info(f"Garbage-collected index generation {generation_id}")
+        return collected
+
+
+# Singleton instance
+index_manager = IndexGenerationManager()
@@ -1,8 +1,9 @@
 """
 LLM service for generating answers using Groq
 """
-from groq import Groq
 from backend.app.config import settings
+from backend.services.providers import create_client, record_usage, record_error
+from backend.services.tracing import tracer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,10 +18,9 @@ class LLMService:
     
     @property
     def client(self):
-        """Lazy initialization of Groq client"""
+        """Lazy initialization of the configured provider client (asyncio flavour)"""
         if self._client is None:
-            from groq import Groq
-            self._client = Groq(api_key=settings.groq_api_key)
+            self._client = create_client(async_client=True)
         return self._client
     
     async def generate_answer(self, question: str, context_chunks: list[dict]) -> str:
@@ -81,15 +81,17 @@ Answer comprehensively using information from MULTIPLE contexts above. Include t
             logger.info(f"Generating answer for: {question}")
             
             # Call Groq API
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Low temperature for consistency
-                max_tokens=1500
-            )
+            with tracer.span("llm.generate_answer"):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    temperature=0.3,  # Low temperature for consistency
+                    max_tokens=1500
+                )
+            record_usage("llm", response)
             
             answer = response.choices[0].message.content
             logger.info(f"Generated answer with {len(unique_timestamps)} unique timestamps available")
@@ -97,6 +99,7 @@ Answer comprehensively using information from MULTIPLE contexts above. Include t
             return answer
             
         except Exception as e:
+            record_error("llm", e)
             logger.error(f"LLM generation failed: {e}")
             raise
 
@@ -0,0 +1,235 @@
+"""
+Video deletion and background storage maintenance
+
+Deleting a video removes its SQLite rows in one transaction (chunks,
+transcripts, suggestions and stages cascade from ``videos``), then its
+vectors from every live index generation, its column transcript and its
+fetch cache. Vectors whose deletion failed are picked up by the next
+maintenance pass, which also:
+
+    - garbage-collects index generations retired longer than the grace period
+    - drops vectors and transcript files of videos no longer in SQLite
+    - returns free pages to the OS with incremental VACUUM
+    - refreshes planner statistics with PRAGMA optimize
+    - truncates the WAL
+
+The pass runs every ``settings.maintenance_interval_seconds``.
+"""
+from typing import Dict, List, Optional, Set
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.fetch_cache import fetch_cache
+from backend.services.index_generations import index_manager
+from backend.services.metrics import videos_deleted, maintenance_runs
+from backend.services.progress import progress_bus
+from backend.services.transcript_store import transcript_store
+from backend.services.vector_store import vector_store
+import asyncio
+import shutil
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+# SQLite limits the number of bound parameters per statement
+BATCH_SIZE = 500
+
+# Video statuses of an ingestion job queued or running in any process
+BUSY_STATUSES = ("pending", "processing")
+
+
+class MaintenanceService:
+    """Deletes videos and keeps SQLite and the vector index compact"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self.last_run: Optional[Dict] = None
+
+    async def is_busy(self, video_id: str) -> bool:
+        """Whether an ingestion job for the video is queued or running (in any process)"""
+        if progress_bus.snapshot(video_id) is not None:
+            return True
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute("SELECT status FROM videos WHERE video_id = ?", (video_id,))
+            row = await cursor.fetchone()
+        finally:
+            await conn.close()
+        return row is not None and row[0] in BUSY_STATUSES
+
+    async def _live_collections(self) -> List[str]:
+        generations = await index_manager.list_generations()
+        return [g.collection_name for g in generations if g.status != "collected"]
+
+    async def delete_videos(self, video_ids: List[str]) -> Dict[str, List[str]]:
+        """
+        Delete videos and everything derived from them
+
+        Videos with an ingestion job in flight are skipped so the pipeline
+        never writes rows for a deleted video.
+
+        Returns:
+            {"deleted": [...], "skipped": [...]} (unknown ids are ignored)
+        """
+        # Jobs in this process are known before their status row is written
+        skipped = [video_id for video_id in video_ids if progress_bus.snapshot(video_id) is not None]
+        candidates = [video_id for video_id in dict.fromkeys(video_ids) if video_id not in skipped]
+
+        deleted: List[str] = []
+        for start in range(0, len(candidates), BATCH_SIZE):
+            batch = candidates[start:start + BATCH_SIZE]
+            placeholders = ", ".join("?" * len(batch))
+            conn = await db.get_connection()
+            try:
+                cursor = await conn.execute(
+                    f"SELECT video_id, status FROM videos WHERE video_id IN ({placeholders})", batch
+                )
+                rows = await cursor.fetchall()
+                # Other processes' jobs are only visible through the status column
+                skipped.extend(row[0] for row in rows if row[1] in BUSY_STATUSES)
+                existing = [row[0] for row in rows if row[1] not in BUSY_STATUSES]
+                if not existing:
+                    continue
+                placeholders = ", ".join("?" * len(existing))
+                # Child tables cascade from videos; reindex_items has no foreign key
+                await conn.execute(f"DELETE FROM videos WHERE video_id IN ({placeholders})", existing)
+                await conn.execute(f"DELETE FROM reindex_items WHERE video_id IN ({placeholders})", existing)
+                await conn.commit()
+            finally:
+                await conn.close()
+
+            for collection_name in await self._live_collections():
+                try:
+                    await vector_store.delete_videos(existing, collection_name)
+                except Exception as e:
+                    # Orphaned vectors are removed by the next compaction pass
+                    logger.warning(f"Vector deletion from {collection_name} deferred to maintenance: {e}")
+
+            for video_id in existing:
+                transcript_store.invalidate(video_id, delete=True)
+                fetch_cache.invalidate(video_id)
+                progress_bus.publish(video_id, status="deleted")
+            deleted.extend(existing)
+
+        videos_deleted.inc(len(deleted))
+        if deleted:
+            logger.info(f"Deleted {len(deleted)} videos")
+        return {"deleted": deleted, "skipped": skipped}
+
+    async def _live_video_ids(self) -> Set[str]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute("SELECT video_id FROM videos")
+            return {row[0] for row in await cursor.fetchall()}
+        finally:
+            await conn.close()
+
+    async def compact_vectors(self, live_video_ids: Set[str]) -> int:
+        """Remove vectors of videos that no longer exist; returns the number removed"""
+        removed = 0
+        for collection_name in await self._live_collections():
+            orphans = await asyncio.to_thread(
+                lambda: [
+                    chunk_id for chunk_id, video_id in vector_store.iter_video_ids(collection_name)
+                    if video_id not in live_video_ids
+                ]
+            )
+            for start in range(0, len(orphans), BATCH_SIZE):
+                await vector_store.delete_chunk_ids(orphans[start:start + BATCH_SIZE], collection_name)
+            if orphans:
+                logger.info(f"Removed {len(orphans)} orphaned vectors from {collection_name}")
+            removed += len(orphans)
+        return removed
+
+    def compact_transcripts(self, live_video_ids: Set[str]) -> int:
+        """Remove column transcripts of deleted videos and leftovers of interrupted writes"""
+        removed = 0
+        for video_id in transcript_store.video_ids():
+            if video_id not in live_video_ids:
+                transcript_store.invalidate(video_id, delete=True)
+                removed += 1
+        if transcript_store.root.exists():
+            for path in transcript_store.root.glob(".*"):
+                shutil.rmtree(path, ignore_errors=True)
+        return removed
+
+    async def optimize_database(self) -> Dict:
+        """Incremental VACUUM, PRAGMA optimize and a WAL checkpoint"""
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute("PRAGMA auto_vacuum")
+            auto_vacuum = (await cursor.fetchone())[0]
+            cursor = await conn.execute("PRAGMA freelist_count")
+            free_before = (await cursor.fetchone())[0]
+
+            if auto_vacuum != 2:
+                # Databases created before incremental mode need one full VACUUM to switch
+                logger.info("Converting database to incremental auto_vacuum (one-time full VACUUM)")
+                await conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                await conn.execute("VACUUM")
+            else:
+                # execute() steps a statement only once (one page); executescript runs it to the end
+                await conn.executescript(f"PRAGMA incremental_vacuum({int(settings.maintenance_vacuum_pages)});")
+
+            cursor = await conn.execute("PRAGMA freelist_count")
+            free_after = (await cursor.fetchone())[0]
+
+            await conn.execute("PRAGMA analysis_limit = 400")
+            await conn.execute("PRAGMA optimize")
+            await conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            await conn.commit()
+        finally:
+            await conn.close()
+        return {"pages_freed": max(free_before - free_after, 0), "free_pages": free_after}
+
+    async def run(self) -> Dict:
+        """One maintenance pass; raises RuntimeError if one is already running"""
+        if self._lock.locked():
+            raise RuntimeError("Maintenance is already running")
+        async with self._lock:
+            started = time.monotonic()
+            try:
+                collected = await index_manager.collect_garbage()
+                live_video_ids = await self._live_video_ids()
+                result = {
+                    "generations_collected": collected,
+                    "orphaned_vectors_removed": await self.compact_vectors(live_video_ids),
+                    "orphaned_transcripts_removed": self.compact_transcripts(live_video_ids),
+                    **await self.optimize_database(),
+                }
+            except Exception:
+                maintenance_runs.labels(status="failed").inc()
+                raise
+            result["duration_ms"] = round((time.monotonic() - started) * 1000, 1)
+            result["finished_at"] = time.time()
+            maintenance_runs.labels(status="completed").inc()
+            self.last_run = result
+            logger.info(f"Maintenance pass finished: {result}")
+            return result
+
+    async def _loop(self):
+        while True:
+            await asyncio.sleep(settings.maintenance_interval_seconds)
+            try:
+                await self.run()
+            except Exception as e:
+                logger.error(f"Maintenance pass failed: {e}")
+
+    def start(self):
+        """Start the periodic maintenance loop (no-op when disabled or running)"""
+        if settings.maintenance_interval_seconds > 0 and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+maintenance_service = MaintenanceService()
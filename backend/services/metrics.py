@@ -0,0 +1,306 @@
+"""
+In-process metrics with Prometheus text exposition
+
+A tiny registry of counters, gauges and histograms (no client library
+needed) rendered by ``GET /metrics``. Every tracer span is also observed
+into ``service_call_duration_seconds`` so instrumented stages get latency
+histograms for free.
+"""
+from typing import Dict, List, Tuple
+from backend.services.tracing import tracer, Span
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Shared labelled-series bookkeeping"""
+    type_name = ""
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = tuple(labelnames)
+        self._series: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _new_series(self):
+        raise NotImplementedError
+
+    def labels(self, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = self._new_series()
+        return series
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.type_name}"]
+        with self._lock:
+            items = list(self._series.items())
+        for key, series in items:
+            lines.extend(series.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _CounterSeries:
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, labelnames, key):
+        return [f"{name}{_format_labels(labelnames, key)} {_format_value(self.value)}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+    type_name = "counter"
+
+    def _new_series(self):
+        return _CounterSeries()
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+
+class _GaugeSeries(_CounterSeries):
+    def set(self, value: float):
+        with self._lock:
+            self.value = value
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    type_name = "gauge"
+
+    def _new_series(self):
+        return _GaugeSeries()
+
+    def set(self, value: float):
+        self._default().set(value)
+
+    def inc(self, amount: float = 1.0):
+        self._default().inc(amount)
+
+    def dec(self, amount: float = 1.0):
+        self._default().dec(amount)
+
+
+class _HistogramSeries:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.sum += value
+            self.count += 1
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+
+    def render(self, name, labelnames, key):
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            le = f'le="{_format_value(bound)}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+        inf = 'le="+Inf"'
+        lines.append(f"{name}_bucket{_format_labels(labelnames, key, inf)} {count}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {_format_value(total)}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {count}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    type_name = "histogram"
+
+    def __init__(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_series(self):
+        return _HistogramSeries(self.buckets)
+
+    def observe(self, value: float):
+        self._default().observe(value)
+
+
+class MetricsRegistry:
+    """Holds every metric and renders the exposition text"""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, description, labelnames))
+
+    def histogram(self, name: str, description: str, labelnames: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, description, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Singleton instance
+metrics = MetricsRegistry()
+
+# Latency
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+)
+service_call_duration = metrics.histogram(
+    "service_call_duration_seconds", "Latency of traced service calls and pipeline stages", ("stage",)
+)
+
+# Ingestion volume
+videos_ingested = metrics.counter(
+    "videos_ingested_total", "Videos that finished ingestion", ("status",)
+)
+chunks_indexed = metrics.counter("chunks_indexed_total", "Transcript chunks written to the vector store")
+segments_stored = metrics.counter("transcript_segments_total", "Transcript segments stored")
+videos_reindexed = metrics.counter(
+    "videos_reindexed_total", "Videos re-chunked and re-embedded from stored transcripts", ("status",)
+)
+videos_deleted = metrics.counter("videos_deleted_total", "Videos deleted with their chunks and vectors")
+maintenance_runs = metrics.counter(
+    "maintenance_runs_total", "Background database and vector index maintenance passes", ("status",)
+)
+
+# LLM provider usage
+llm_tokens = metrics.counter(
+    "llm_tokens_total", "Tokens consumed by LLM calls", ("service", "kind")
+)
+llm_rate_limited = metrics.counter(
+    "llm_rate_limited_total", "LLM/Whisper calls rejected with HTTP 429", ("service",)
+)
+whisper_upload_bytes = metrics.counter(
+    "whisper_upload_bytes_total", "Audio bytes uploaded to Whisper", ("format",)
+)
+whisper_audio_seconds = metrics.counter(
+    "whisper_audio_seconds_total", "Seconds of audio uploaded to Whisper", ("format",)
+)
+whisper_upload_mb_per_audio_hour = metrics.histogram(
+    "whisper_upload_mb_per_audio_hour", "Upload size of each Whisper request per hour of audio", ("format",),
+    buckets=(5, 10, 15, 20, 30, 50, 75, 100, 150, 250, 500)
+)
+
+# Embeddings and caches
+embedding_batch_size = metrics.histogram(
+    "embedding_batch_size", "Texts per embedding batch",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+)
+cache_requests = metrics.counter(
+    "cache_requests_total", "Cache lookups by outcome (hit/miss)", ("cache", "result")
+)
+
+# Queues and pools
+queue_depth = metrics.gauge("queue_depth", "Jobs waiting or running", ("queue", "state"))
+db_connections_open = metrics.gauge("db_connections_open", "SQLite connections currently open")
+db_connections_opened = metrics.counter("db_connections_opened_total", "SQLite connections opened")
+progress_subscribers = metrics.gauge(
+    "progress_subscribers", "Open SSE/WebSocket progress subscriptions"
+)
+vector_collection_size = metrics.gauge(
+    "vector_collection_size", "Vectors stored in the active ChromaDB collection"
+)
+
+
+def _observe_span(span: Span):
+    service_call_duration.labels(stage=span.name).observe(span.duration_ms / 1000)
+
+
+tracer.add_listener(_observe_span)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording request latency by route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        state = {"code": 500, "recorded": False}
+
+        def record():
+            if state["recorded"]:
+                return
+            state["recorded"] = True
+            # FastAPI stores the matched route in the scope, which keeps
+            # per-video paths from exploding label cardinality
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            http_request_duration.labels(
+                method=scope["method"], route=route_path, status=state["code"]
+            ).observe(time.perf_counter() - started)
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                state["code"] = message["status"]
+            await send(message)
+            # Stop at the last body message: BackgroundTasks (ingestion, reindex)
+            # run inside the app call after the response has been sent
+            if message["type"] == "http.response.body" and not message.get("more_body", False):
+                record()
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            record()
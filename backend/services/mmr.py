@@ -0,0 +1,77 @@
+"""
+Maximal Marginal Relevance selection over retrieved chunks
+
+The vector search returns ``settings.mmr_fetch_k`` candidates with their
+embeddings; MMR then greedily picks the candidate maximising
+
+    lambda * sim(query, c) - (1 - lambda) * max over picked p of redundancy(c, p)
+
+where redundancy blends embedding similarity with temporal proximity,
+
+    (1 - w) * sim(c, p) + w * exp(-|start(c) - start(p)| / scale)
+
+so overlapping chunks from one region of the video are penalised even
+when their wording differs. Everything is computed with numpy on the
+candidate matrix: one pairwise similarity matrix, then a running maximum
+updated once per pick.
+"""
+from typing import List, Sequence
+from backend.app.config import settings
+import numpy as np
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    query_embedding: Sequence[float],
+    embeddings: Sequence[Sequence[float]],
+    start_times: Sequence[float],
+    k: int,
+    lambda_mult: float = None,
+    temporal_weight: float = None,
+    temporal_scale: float = None
+) -> List[int]:
+    """
+    Indexes of up to ``k`` candidates in MMR order (the first is the most relevant)
+
+    Args:
+        query_embedding: Query vector
+        embeddings: Candidate vectors (one row per candidate)
+        start_times: Candidate start times in seconds
+        k: Number of candidates to keep
+        lambda_mult: Relevance/diversity trade-off, 1.0 is plain similarity ranking
+        temporal_weight: Share of the redundancy term taken by temporal proximity
+        temporal_scale: Seconds over which temporal redundancy decays by 1/e
+    """
+    lambda_mult = settings.mmr_lambda if lambda_mult is None else lambda_mult
+    temporal_weight = settings.mmr_temporal_weight if temporal_weight is None else temporal_weight
+    temporal_scale = settings.mmr_temporal_scale_seconds if temporal_scale is None else temporal_scale
+
+    candidates = _normalize(np.asarray(embeddings, dtype=np.float32))
+    count = len(candidates)
+    if count == 0 or k <= 0:
+        return []
+    query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+    relevance = candidates @ query
+
+    redundancy = candidates @ candidates.T
+    if temporal_weight > 0 and temporal_scale > 0:
+        starts = np.asarray(start_times, dtype=np.float32)
+        proximity = np.exp(-np.abs(starts[:, None] - starts[None, :]) / temporal_scale)
+        redundancy = (1 - temporal_weight) * redundancy + temporal_weight * proximity
+
+    selected = [int(np.argmax(relevance))]
+    available = np.ones(count, dtype=bool)
+    available[selected[0]] = False
+    max_redundancy = redundancy[selected[0]].copy()
+    while len(selected) < min(k, count):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_redundancy
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        selected.append(pick)
+        available[pick] = False
+        np.maximum(max_redundancy, redundancy[pick], out=max_redundancy)
+    return selected
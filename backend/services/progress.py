@@ -0,0 +1,112 @@
+"""
+In-process ingestion progress event bus
+
+The ingestion pipeline publishes every progress step and status change
+here; SSE and WebSocket clients subscribe instead of polling ``/videos``.
+SQLite only needs to hold a recent snapshot (for reloads and restarts), so
+``should_persist`` lets callers coalesce progress writes to at most one per
+``settings.progress_write_interval`` seconds per video.
+"""
+from typing import Dict, Optional, Set
+from backend.app.config import settings
+from backend.services.metrics import progress_subscribers
+import asyncio
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ("completed", "failed", "deleted")
+
+
+class ProgressSubscription:
+    """A bounded queue of events for one SSE/WebSocket client"""
+
+    def __init__(self, video_ids: Optional[Set[str]] = None, maxsize: int = 100):
+        self.video_ids = video_ids
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+    def wants(self, video_id: str) -> bool:
+        return self.video_ids is None or video_id in self.video_ids
+
+    def put(self, event: Dict):
+        # Events are full snapshots, so a slow client only needs the newest ones
+        if self.queue.full():
+            try:
+                self.queue.get_nowait()
+            except asyncio.QueueEmpty:
+                pass
+        self.queue.put_nowait(event)
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[Dict]:
+        """Next event, or None if ``timeout`` seconds pass without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class ProgressBus:
+    """Fans out progress events to subscribers and tracks active jobs"""
+
+    def __init__(self, write_interval: float = 2.0):
+        self.write_interval = write_interval
+        self._active: Dict[str, Dict] = {}
+        self._last_write: Dict[str, float] = {}
+        self._subscribers: Set[ProgressSubscription] = set()
+
+    def publish(self, video_id: str, **changes) -> Dict:
+        """
+        Merge ``changes`` (status, step, percent, error) into the job snapshot
+        and deliver it to every interested subscriber
+
+        Returns:
+            The full snapshot that was published
+        """
+        event = {**self._active.get(video_id, {"video_id": video_id}), **changes, "ts": time.time()}
+        if event.get("status") in TERMINAL_STATUSES:
+            self._active.pop(video_id, None)
+            self._last_write.pop(video_id, None)
+        else:
+            self._active[video_id] = event
+
+        for subscription in list(self._subscribers):
+            if subscription.wants(video_id):
+                subscription.put(event)
+        return event
+
+    def should_persist(self, video_id: str, force: bool = False) -> bool:
+        """
+        Whether a progress update should be written to SQLite now
+
+        The first update of a job, forced updates (final steps) and the first
+        update after ``write_interval`` seconds are persisted; the rest only
+        go to live subscribers.
+        """
+        now = time.monotonic()
+        last = self._last_write.get(video_id)
+        if force or last is None or now - last >= self.write_interval:
+            self._last_write[video_id] = now
+            return True
+        return False
+
+    def snapshot(self, video_id: Optional[str] = None):
+        """Latest event for one active job, or all active jobs"""
+        if video_id is not None:
+            return self._active.get(video_id)
+        return list(self._active.values())
+
+    def subscribe(self, video_ids: Optional[Set[str]] = None) -> ProgressSubscription:
+        subscription = ProgressSubscription(video_ids)
+        self._subscribers.add(subscription)
+        progress_subscribers.inc()
+        return subscription
+
+    def unsubscribe(self, subscription: ProgressSubscription):
+        if subscription in self._subscribers:
+            self._subscribers.discard(subscription)
+            progress_subscribers.dec()
+
+
+# Singleton instance
+progress_bus = ProgressBus(write_interval=settings.progress_write_interval)
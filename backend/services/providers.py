@@ -0,0 +1,299 @@
+"""
+LLM / Whisper provider selection with a deterministic local stand-in
+
+Services never construct an SDK client directly; they ask this module for a
+client that exposes the Groq-compatible surface they already use
+(``client.chat.completions.create`` and ``client.audio.transcriptions.create``).
+Setting ``LLM_PROVIDER=mock`` swaps the network clients for ``MockGroq`` /
+``MockAsyncGroq``, which answer locally with configurable latency and
+tokens/sec so benchmarks measure our own server overhead.
+"""
+from types import SimpleNamespace
+from typing import Iterator, AsyncIterator
+from backend.app.config import settings
+from backend.services.metrics import llm_tokens, llm_rate_limited
+import asyncio
+import random
+import re
+import time
+import zlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+# Canned transcript vocabulary used for mock Whisper segments
+_MOCK_SENTENCES = [
+    "Welcome back to the channel, today we are looking at something new.",
+    "First let's set up the project and install the dependencies.",
+    "This part of the configuration is where most people get stuck.",
+    "Notice how the response time changes once we add the cache.",
+    "Let's take a closer look at the error message on the screen.",
+    "Now we can deploy the service and check the logs.",
+    "The key idea here is to keep the data close to the computation.",
+    "If you remember one thing from this video, remember this step.",
+    "We will come back to this example later in the video.",
+    "That wraps up the main section, let's move on to the questions.",
+]
+
+_CONTEXT_TIMESTAMP_PATTERN = re.compile(r'Context \d+ (\[(?:\d{1,2}:)?\d{1,2}:\d{2}\])')
+_NUM_QUESTIONS_PATTERN = re.compile(r'generate (\d+)\b[^\n]*questions', re.IGNORECASE)
+_SUMMARY_PATTERN = re.compile(r'^Summarize\b', re.IGNORECASE)
+
+
+def _stable_seed(*parts: str) -> int:
+    """Deterministic seed derived from the configured seed and the request content"""
+    return zlib.crc32("\x1f".join(parts).encode("utf-8")) ^ settings.mock_seed
+
+
+def _sample_latency(rng: random.Random) -> float:
+    """Sample a request latency in seconds from the configured distribution"""
+    mean = settings.mock_latency_ms / 1000.0
+    jitter = settings.mock_latency_jitter_ms / 1000.0
+    distribution = settings.mock_latency_distribution
+
+    if distribution == "uniform":
+        latency = rng.uniform(mean - jitter, mean + jitter)
+    elif distribution == "normal":
+        latency = rng.gauss(mean, jitter)
+    elif distribution == "lognormal":
+        # Parameterise so the median equals the configured mean
+        sigma = jitter / mean if mean > 0 else 0.0
+        latency = mean * rng.lognormvariate(0.0, sigma)
+    else:
+        latency = mean
+
+    return max(0.0, latency)
+
+
+def _warn_if_blocking_loop(operation: str):
+    """
+    The synchronous mock sleeps; called from a coroutine it stalls every
+    other request and benchmarks measure queueing instead of the pipeline
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    logger.warning(f"Synchronous mock {operation} called on the event loop; use create_client(async_client=True)")
+
+
+def _tokenize(text: str) -> list[str]:
+    """Split text into whitespace-preserving pseudo tokens"""
+    return re.findall(r'\S+\s*', text)
+
+
+def _mock_completion_text(messages: list[dict], max_tokens: int) -> str:
+    """Build a canned response that looks like the real model output"""
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+    rng = random.Random(_stable_seed(system, user))
+
+    question_request = _NUM_QUESTIONS_PATTERN.search(user)
+    if question_request:
+        count = int(question_request.group(1))
+        topics = rng.sample(_MOCK_SENTENCES, k=min(count, len(_MOCK_SENTENCES)))
+        questions = [f"What does the speaker mean by \"{topic.rstrip('.').lower()}\"?" for topic in topics]
+        return "\n".join(questions)
+
+    if _SUMMARY_PATTERN.match(user):
+        # Extractive stand-in: a few sentences of the text to summarize, in order
+        source = user.split("Transcript:", 1)[-1]
+        sentences = [s.strip() for s in re.split(r'(?<=[.!?])\s+', source) if s.strip()]
+        picked = sorted(rng.sample(range(len(sentences)), k=min(4, len(sentences))))
+        summary = " ".join(sentences[i] for i in picked) or rng.choice(_MOCK_SENTENCES)
+        return "".join(_tokenize(summary)[:max_tokens])
+
+    # Answer citing the timestamps the prompt offered, in chronological order
+    timestamps = list(dict.fromkeys(_CONTEXT_TIMESTAMP_PATTERN.findall(user)))
+    if not timestamps:
+        return "The provided context does not contain enough information to answer this question."
+
+    cited = sorted(rng.sample(timestamps, k=min(3, len(timestamps))), key=lambda ts: [int(p) for p in ts.strip("[]").split(":")])
+    parts = [f"{rng.choice(_MOCK_SENTENCES)} {ts}" for ts in cited]
+    answer = "Based on the video: " + " ".join(parts)
+
+    tokens = _tokenize(answer)
+    return "".join(tokens[:max_tokens])
+
+
+def _completion_response(model: str, content: str, prompt_text: str) -> SimpleNamespace:
+    """Shape a response like the Groq / OpenAI chat completion object"""
+    prompt_tokens = len(prompt_text) // 4
+    completion_tokens = len(_tokenize(content))
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(
+            index=0,
+            message=SimpleNamespace(role="assistant", content=content),
+            finish_reason="stop"
+        )],
+        usage=SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens
+        )
+    )
+
+
+def _stream_chunk(model: str, token: str, finish_reason=None) -> SimpleNamespace:
+    """Shape a streamed delta like the Groq / OpenAI chunk object"""
+    return SimpleNamespace(
+        model=model,
+        choices=[SimpleNamespace(
+            index=0,
+            delta=SimpleNamespace(content=token),
+            finish_reason=finish_reason
+        )]
+    )
+
+
+def _mock_segments(file_name: str) -> list[dict]:
+    """Deterministic timestamped segments for a mock transcription"""
+    rng = random.Random(_stable_seed(file_name))
+    segments = []
+    start = 0.0
+    while start < settings.mock_transcript_seconds:
+        end = min(start + settings.mock_segment_seconds, settings.mock_transcript_seconds)
+        segments.append({
+            "id": len(segments),
+            "text": " " + rng.choice(_MOCK_SENTENCES),
+            "start": start,
+            "end": end
+        })
+        start = end
+    return segments
+
+
+class _MockChatCompletions:
+    """Local stand-in for ``client.chat.completions``"""
+
+    def create(self, model: str, messages: list[dict], temperature: float = 0.0,
+               max_tokens: int = 1024, stream: bool = False, **kwargs):
+        content = _mock_completion_text(messages, max_tokens)
+        prompt_text = "".join(m["content"] for m in messages)
+        rng = random.Random(_stable_seed(prompt_text, "latency"))
+        latency = _sample_latency(rng)
+        tokens = _tokenize(content)
+
+        _warn_if_blocking_loop("chat completion")
+        if stream:
+            return self._stream(model, tokens, latency)
+
+        time.sleep(latency + len(tokens) / settings.mock_tokens_per_second)
+        return _completion_response(model, content, prompt_text)
+
+    def _stream(self, model: str, tokens: list[str], latency: float) -> Iterator[SimpleNamespace]:
+        time.sleep(latency)
+        for token in tokens:
+            time.sleep(1.0 / settings.mock_tokens_per_second)
+            yield _stream_chunk(model, token)
+        yield _stream_chunk(model, "", finish_reason="stop")
+
+
+class _MockAsyncChatCompletions(_MockChatCompletions):
+    """Local stand-in for ``async_client.chat.completions``"""
+
+    async def create(self, model: str, messages: list[dict], temperature: float = 0.0,
+                     max_tokens: int = 1024, stream: bool = False, **kwargs):
+        content = _mock_completion_text(messages, max_tokens)
+        prompt_text = "".join(m["content"] for m in messages)
+        rng = random.Random(_stable_seed(prompt_text, "latency"))
+        latency = _sample_latency(rng)
+        tokens = _tokenize(content)
+
+        if stream:
+            return self._astream(model, tokens, latency)
+
+        await asyncio.sleep(latency + len(tokens) / settings.mock_tokens_per_second)
+        return _completion_response(model, content, prompt_text)
+
+    async def _astream(self, model: str, tokens: list[str], latency: float) -> AsyncIterator[SimpleNamespace]:
+        await asyncio.sleep(latency)
+        for token in tokens:
+            await asyncio.sleep(1.0 / settings.mock_tokens_per_second)
+            yield _stream_chunk(model, token)
+        yield _stream_chunk(model, "", finish_reason="stop")
+
+
+class _MockTranscriptions:
+    """Local stand-in for ``client.audio.transcriptions``"""
+
+    def _build(self, file, model: str) -> dict:
+        file_name = getattr(file, "name", str(file))
+        segments = _mock_segments(str(file_name))
+        return {
+            "task": "transcribe",
+            "language": "english",
+            "duration": settings.mock_transcript_seconds,
+            "text": "".join(s["text"] for s in segments).strip(),
+            "segments": segments
+        }
+
+    def create(self, model: str, file, response_format: str = "json", **kwargs) -> dict:
+        _warn_if_blocking_loop("transcription")
+        response = self._build(file, model)
+        time.sleep(_sample_latency(random.Random(_stable_seed(model, response["text"]))))
+        return response
+
+
+class _MockAsyncTranscriptions(_MockTranscriptions):
+    """Local stand-in for ``async_client.audio.transcriptions``"""
+
+    async def create(self, model: str, file, response_format: str = "json", **kwargs) -> dict:
+        response = self._build(file, model)
+        await asyncio.sleep(_sample_latency(random.Random(_stable_seed(model, response["text"]))))
+        return response
+
+
+class MockGroq:
+    """Synchronous Groq-compatible client that never touches the network"""
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=_MockChatCompletions())
+        self.audio = SimpleNamespace(transcriptions=_MockTranscriptions())
+
+
+class MockAsyncGroq:
+    """Asynchronous Groq-compatible client that never touches the network"""
+
+    def __init__(self, **kwargs):
+        self.chat = SimpleNamespace(completions=_MockAsyncChatCompletions())
+        self.audio = SimpleNamespace(transcriptions=_MockAsyncTranscriptions())
+
+
+def record_usage(service: str, response):
+    """Count prompt/completion tokens reported by a chat completion"""
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return
+    llm_tokens.labels(service=service, kind="prompt").inc(getattr(usage, "prompt_tokens", 0) or 0)
+    llm_tokens.labels(service=service, kind="completion").inc(getattr(usage, "completion_tokens", 0) or 0)
+
+
+def record_error(service: str, error: Exception):
+    """Count provider errors that were rate limits (HTTP 429)"""
+    if getattr(error, "status_code", None) == 429:
+        llm_rate_limited.labels(service=service).inc()
+
+
+def create_client(async_client: bool = False):
+    """
+    Create the chat/audio client for the configured ``llm_provider``
+
+    Args:
+        async_client: Return the asyncio flavour of the client
+
+    Returns:
+        A client exposing ``chat.completions.create`` and ``audio.transcriptions.create``
+    """
+    provider = settings.llm_provider
+
+    if provider == "mock":
+        logger.info("Using local mock LLM/Whisper provider")
+        return MockAsyncGroq() if async_client else MockGroq()
+
+    from groq import Groq, AsyncGroq
+    if not settings.groq_api_key:
+        raise ValueError("GROQ_API_KEY not found in environment variables")
+    return AsyncGroq(api_key=settings.groq_api_key) if async_client else Groq(api_key=settings.groq_api_key)
@@ -1,7 +1,8 @@
 """Service for generating suggested questions from video transcripts using Groq LLM."""
-import os
-from typing import List, Optional
-from groq import Groq
+from typing import List
+from backend.app.config import settings
+from backend.services.providers import create_client, record_usage, record_error
+from backend.services.tracing import tracer
 import logging
 
 logger = logging.getLogger(__name__)
@@ -10,47 +11,27 @@ logger = logging.getLogger(__name__)
 class QuestionGeneratorService:
     """Generates contextually relevant questions from video transcripts."""
 
+    system_prompt = "You are a helpful assistant that generates relevant questions about video content. Output only the questions, one per line."
+
     def __init__(self):
-        """Initialize (lazy-load the Groq client)."""
+        """Initialize (lazy-load the provider client)."""
         self._client = None
-        self.model = "llama-3.3-70b-versatile"
+        self.model = settings.question_model
 
     @property
     def client(self):
-        """Lazy-load the Groq client."""
+        """Lazy-load the configured provider client (asyncio flavour)."""
         if self._client is None:
-            api_key = os.getenv("GROQ_API_KEY")
-            if not api_key:
-                raise ValueError("GROQ_API_KEY not found in environment variables")
-            self._client = Groq(api_key=api_key)
+            self._client = create_client(async_client=True)
         return self._client
 
-    def generate_questions(
-        self, 
-        transcript: str, 
-        video_title: str,
-        num_questions: int = 5
-    ) -> List[str]:
-        """
-        Generate contextually relevant questions from a video transcript.
-        
-        Args:
-            transcript: The full or partial transcript text
-            video_title: Title of the video for context
-            num_questions: Number of questions to generate (default: 5)
-            
-        Returns:
-            List of suggested questions
-        """
-        # Truncate transcript if too long (keep first ~3000 chars for context)
-        truncated_transcript = transcript[:3000] if len(transcript) > 3000 else transcript
-
-        prompt = f"""You are analyzing a video titled "{video_title}".
+    def _build_prompt(self, transcript: str, video_title: str, num_questions: int) -> str:
+        return f"""You are analyzing a video titled "{video_title}".
 
 Based on the following transcript excerpt, generate {num_questions} interesting and diverse questions that viewers might want to ask about this video content.
 
 Transcript:
-{truncated_transcript}
+{transcript}
 
 Generate {num_questions} specific, answerable questions that:
 1. Cover different topics/aspects of the video
@@ -61,38 +42,47 @@ Generate {num_questions} specific, answerable questions that:
 
 Return ONLY the questions, one per line, without numbering or extra formatting."""
 
-        try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful assistant that generates relevant questions about video content. Output only the questions, one per line."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                temperature=0.7,
-                max_tokens=300,
-            )
-
-            content = response.choices[0].message.content.strip()
-            
-            # Parse questions (split by newlines, filter empty)
-            questions = [
-                q.strip().lstrip('0123456789.-) ') 
-                for q in content.split('\n') 
-                if q.strip()
-            ]
-            
-            # Ensure we have the requested number (or close to it)
-            return questions[:num_questions] if questions else []
+    @staticmethod
+    def _parse_questions(content: str, num_questions: int) -> List[str]:
+        # Parse questions (split by newlines, filter empty)
+        questions = [
+            q.strip().lstrip('0123456789.-) ') 
+            for q in content.strip().split('\n') 
+            if q.strip()
+        ]
+        
+        # Ensure we have the requested number (or close to it)
+        return questions[:num_questions] if questions else []
 
+    async def generate_excerpt_questions(
+        self,
+        excerpt: str,
+        video_title: str,
+        num_questions: int = 3
+    ) -> List[str]:
+        """
+        Candidate questions for one transcript excerpt (the map step of
+        the background suggestion job, see backend/services/suggestions.py).
+
+        Errors propagate so the caller can tell a failed excerpt from an empty one.
+        """
+        prompt = self._build_prompt(excerpt[:3000], video_title, num_questions)
+        try:
+            with tracer.span("llm.generate_questions", excerpt_chars=len(excerpt)):
+                response = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": self.system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=200,
+                )
         except Exception as e:
-            logger.error(f"Error generating questions: {str(e)}")
-            return []
+            record_error("questions", e)
+            raise
+        record_usage("questions", response)
+        return self._parse_questions(response.choices[0].message.content, num_questions)
 
 
 # Singleton instance
@@ -0,0 +1,419 @@
+"""
+Re-chunk and re-embed videos from stored transcripts (no network)
+
+A reindex job targets an index generation: the active one when the
+embedding model and chunk parameters are unchanged (in-place rebuild),
+otherwise a new building generation that is activated once every video
+is in it (see index_generations). The job snapshots the videos to process
+into ``reindex_items``; the
+run streams their transcripts out of SQLite a page at a time, re-chunks
+them, embeds chunks from several videos per model call, and swaps each
+video's vectors and ``chunks`` rows in. The swap point is a single SQLite
+transaction (new rows in, old rows out, item marked done): while a video is
+being swapped queries resolve its vector hits through ``chunks``, so they
+see either the old or the new chunk set, and an interrupted job resumes
+with the videos not yet marked done.
+"""
+from typing import Dict, List, Optional
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.chunking import ChunkingService
+from backend.services.index_generations import index_manager, IndexGeneration, DEFAULT_PARTITION
+from backend.services.embedding_service import embedding_service
+from backend.services.vector_store import vector_store
+from backend.services.suggestions import suggestion_service
+from backend.services.tracing import tracer
+from backend.services.metrics import videos_reindexed, chunks_indexed
+import asyncio
+import json
+import uuid
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class ReindexService:
+    """Creates, runs and resumes reindex jobs"""
+
+    def __init__(self, page_size: int = 50):
+        self.page_size = page_size  # Videos whose transcripts are read per query
+        self._running = set()
+
+    async def create_job(
+        self,
+        video_ids: Optional[List[str]] = None,
+        chunk_size: Optional[int] = None,
+        chunk_overlap: Optional[int] = None,
+        batch_size: int = 256,
+        concurrency: int = 2,
+        embedding_model: Optional[str] = None,
+        partition: str = DEFAULT_PARTITION
+    ) -> str:
+        """
+        Record a job over the given (or all completed) videos of an index partition
+
+        Returns:
+            job_id
+        """
+        generation = await index_manager.resolve_target(embedding_model, chunk_size, chunk_overlap, partition)
+        job_id = uuid.uuid4().hex[:12]
+        params = {
+            "generation_id": generation.generation_id,
+            "partition": partition,
+            "embedding_model": generation.embedding_model,
+            "chunk_size": generation.chunk_size,
+            "chunk_overlap": generation.chunk_overlap,
+            "batch_size": batch_size,
+            "concurrency": concurrency,
+        }
+
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                "INSERT INTO reindex_jobs (job_id, params) VALUES (?, ?)",
+                (job_id, json.dumps(params))
+            )
+            query = """INSERT INTO reindex_items (job_id, video_id) SELECT ?, video_id FROM videos
+                       WHERE status = 'completed' AND index_partition = ?"""
+            query_params: list = [job_id, partition]
+            if video_ids:
+                query += f" AND video_id IN ({','.join('?' * len(video_ids))})"
+                query_params.extend(video_ids)
+            cursor = await conn.execute(query, query_params)
+            await conn.execute(
+                "UPDATE reindex_jobs SET total_videos = ? WHERE job_id = ?",
+                (cursor.rowcount, job_id)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+        logger.info(f"Created reindex job {job_id} with params {params}")
+        return job_id
+
+    async def get_job(self, job_id: str) -> Optional[Dict]:
+        """Job row with per-status item counts"""
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """SELECT job_id, status, params, total_videos, error, created_at, updated_at
+                   FROM reindex_jobs WHERE job_id = ?""",
+                (job_id,)
+            )
+            job = await cursor.fetchone()
+            if not job:
+                return None
+            cursor = await conn.execute(
+                "SELECT status, COUNT(*) FROM reindex_items WHERE job_id = ? GROUP BY status",
+                (job_id,)
+            )
+            counts = {row[0]: row[1] for row in await cursor.fetchall()}
+        finally:
+            await conn.close()
+
+        return {
+            "job_id": job[0],
+            "status": job[1],
+            "params": json.loads(job[2]),
+            "total_videos": job[3],
+            "done_videos": counts.get("done", 0),
+            "failed_videos": counts.get("failed", 0),
+            "pending_videos": counts.get("pending", 0),
+            "error": job[4],
+            "created_at": job[5],
+            "updated_at": job[6],
+        }
+
+    async def list_jobs(self, limit: int = 20) -> List[Dict]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                "SELECT job_id FROM reindex_jobs ORDER BY created_at DESC, job_id DESC LIMIT ?",
+                (limit,)
+            )
+            job_ids = [row[0] for row in await cursor.fetchall()]
+        finally:
+            await conn.close()
+        return [await self.get_job(job_id) for job_id in job_ids]
+
+    async def mark_interrupted(self):
+        """Flag jobs left running by a previous process so they can be resumed"""
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                """UPDATE reindex_jobs SET status = 'interrupted', updated_at = CURRENT_TIMESTAMP
+                   WHERE status = 'running'"""
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+    async def _set_status(self, job_id: str, status: str, error: Optional[str] = None):
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                """UPDATE reindex_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+                   WHERE job_id = ?""",
+                (status, error, job_id)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+    def is_running(self, job_id: str) -> bool:
+        return job_id in self._running
+
+    async def run(self, job_id: str):
+        """
+        Process every video of a job that is not yet done
+
+        Safe to call again on an interrupted or failed job (resume); failed
+        videos are retried.
+        """
+        job = await self.get_job(job_id)
+        if job is None:
+            raise ValueError(f"Reindex job {job_id} not found")
+        if job_id in self._running:
+            raise ValueError(f"Reindex job {job_id} is already running")
+
+        params = job["params"]
+        generation = await index_manager.get_generation(params.get("generation_id") or index_manager.active.generation_id)
+        if generation is None or generation.status not in ("active", "building"):
+            raise ValueError(f"Index generation of reindex job {job_id} is no longer live")
+        chunker = ChunkingService(generation.chunk_size, generation.chunk_overlap)
+        batch_size = max(1, int(params.get("batch_size") or 256))
+        concurrency = max(1, int(params.get("concurrency") or 1))
+
+        self._running.add(job_id)
+        await self._set_status(job_id, "running")
+        try:
+            with tracer.start_trace("reindex", job_id=job_id):
+                while True:
+                    batches: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+                    workers = [
+                        asyncio.create_task(self._worker(job_id, generation, batches))
+                        for _ in range(concurrency)
+                    ]
+                    try:
+                        await self._produce(job_id, chunker, batch_size, batches)
+                    finally:
+                        for _ in workers:
+                            await batches.put(None)
+                        await asyncio.gather(*workers)
+
+                    # A new generation must hold every video before it is flipped
+                    # active, including ones that finished ingesting mid-build
+                    job = await self.get_job(job_id)
+                    if generation.status != "building" or job["failed_videos"]:
+                        break
+                    if not await self._add_missing_videos(job_id, generation):
+                        break
+
+            job = await self.get_job(job_id)
+            status = "failed" if job["failed_videos"] else "completed"
+            if status == "completed" and generation.status == "building":
+                # The retired generation is collected once the grace period has passed
+                generation = await index_manager.activate(generation.generation_id)
+            if generation.status == "active":
+                suggestion_service.refresh_answers(await self._done_videos(job_id))
+            await self._set_status(job_id, status)
+            logger.info(
+                f"Reindex job {job_id} {status}: {job['done_videos']} done, {job['failed_videos']} failed"
+            )
+        except (asyncio.CancelledError, KeyboardInterrupt):
+            await self._set_status(job_id, "interrupted")
+            raise
+        except Exception as e:
+            await self._set_status(job_id, "failed", str(e))
+            logger.error(f"Reindex job {job_id} failed: {e}")
+            raise
+        finally:
+            self._running.discard(job_id)
+
+    async def _done_videos(self, job_id: str) -> List[str]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                "SELECT video_id FROM reindex_items WHERE job_id = ? AND status = 'done'", (job_id,)
+            )
+            return [row[0] for row in await cursor.fetchall()]
+        finally:
+            await conn.close()
+
+    async def _add_missing_videos(self, job_id: str, generation: IndexGeneration) -> int:
+        """Queue completed videos that have no chunks in the generation yet"""
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """INSERT OR REPLACE INTO reindex_items (job_id, video_id, status)
+                   SELECT ?, v.video_id, 'pending' FROM videos v
+                   WHERE v.status = 'completed' AND v.index_partition = ? AND NOT EXISTS (
+                       SELECT 1 FROM chunks c WHERE c.generation_id = ? AND c.video_id = v.video_id
+                   )""",
+                (job_id, generation.index_partition, generation.generation_id)
+            )
+            added = cursor.rowcount
+            await conn.execute(
+                """UPDATE reindex_jobs SET total_videos = (SELECT COUNT(*) FROM reindex_items WHERE job_id = ?)
+                   WHERE job_id = ?""",
+                (job_id, job_id)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+        if added:
+            logger.info(f"Reindex job {job_id}: {added} videos missing from generation {generation.generation_id}")
+        return added
+
+    async def _produce(self, job_id: str, chunker: ChunkingService, batch_size: int, batches: asyncio.Queue):
+        """Stream transcripts page by page and queue cross-video embedding batches"""
+        batch: List[Dict] = []
+        batch_texts = 0
+        last_video_id = ""
+
+        while True:
+            conn = await db.get_connection()
+            try:
+                cursor = await conn.execute(
+                    """SELECT video_id FROM reindex_items
+                       WHERE job_id = ? AND status != 'done' AND video_id > ?
+                       ORDER BY video_id LIMIT ?""",
+                    (job_id, last_video_id, self.page_size)
+                )
+                video_ids = [row[0] for row in await cursor.fetchall()]
+                if not video_ids:
+                    break
+                last_video_id = video_ids[-1]
+
+                segments_by_video: Dict[str, List[Dict]] = {video_id: [] for video_id in video_ids}
+                with tracer.span("reindex.read", videos=len(video_ids)):
+                    cursor = await conn.execute(
+                        f"""SELECT video_id, text, start_time, end_time FROM transcripts
+                            WHERE video_id IN ({','.join('?' * len(video_ids))})
+                            ORDER BY video_id, segment_index""",
+                        video_ids
+                    )
+                    async for row in cursor:
+                        segments_by_video[row[0]].append({"text": row[1], "start": row[2], "end": row[3]})
+            finally:
+                await conn.close()
+
+            for video_id, segments in segments_by_video.items():
+                if not segments:
+                    # Never swap in an empty index for a video we cannot rebuild
+                    await self._mark_failed(job_id, video_id, "No stored transcript")
+                    continue
+                chunks = chunker.chunk_transcript(segments)
+                batch.append({"video_id": video_id, "chunks": chunks})
+                batch_texts += len(chunks)
+                if batch_texts >= batch_size:
+                    await batches.put(batch)
+                    batch, batch_texts = [], 0
+
+        if batch:
+            await batches.put(batch)
+
+    async def _worker(self, job_id: str, generation: IndexGeneration, batches: asyncio.Queue):
+        while True:
+            batch = await batches.get()
+            if batch is None:
+                return
+
+            texts = [chunk["text"] for item in batch for chunk in item["chunks"]]
+            try:
+                with tracer.span("reindex.embed", chunks=len(texts), videos=len(batch)):
+                    # The encoder releases the GIL, so workers embed in parallel threads
+                    embeddings = await asyncio.to_thread(
+                        embedding_service.generate_embeddings, texts, generation.embedding_model
+                    )
+            except Exception as e:
+                for item in batch:
+                    await self._mark_failed(job_id, item["video_id"], f"Embedding failed: {e}")
+                continue
+
+            offset = 0
+            for item in batch:
+                count = len(item["chunks"])
+                try:
+                    await self._swap(
+                        job_id, generation, item["video_id"], item["chunks"], embeddings[offset:offset + count]
+                    )
+                    videos_reindexed.labels(status="done").inc()
+                except Exception as e:
+                    logger.error(f"Reindex swap failed for {item['video_id']}: {e}")
+                    await self._mark_failed(job_id, item["video_id"], str(e))
+                offset += count
+
+    async def _swap(self, job_id: str, generation: IndexGeneration, video_id: str,
+                    chunks: List[Dict], embeddings: List[List[float]]):
+        """
+        Replace a video's vectors and chunk rows in a generation, marking its job item done
+
+        Old and new vectors coexist until the old ones are deleted; queries only
+        use hits backed by a ``chunks`` row, which flip in one transaction.
+        """
+        collection_name = generation.collection_name
+        with tracer.span("reindex.swap", chunks=len(chunks)):
+            conn = await db.get_connection()
+            try:
+                cursor = await conn.execute(
+                    "SELECT chunk_id FROM chunks WHERE generation_id = ? AND video_id = ?",
+                    (generation.generation_id, video_id)
+                )
+                old_ids = [row[0] for row in await cursor.fetchall()]
+
+                new_ids = await vector_store.add_chunks(video_id, chunks, embeddings, collection_name)
+                try:
+                    await conn.execute(
+                        "DELETE FROM chunks WHERE generation_id = ? AND video_id = ?",
+                        (generation.generation_id, video_id)
+                    )
+                    await conn.executemany(
+                        """INSERT INTO chunks
+                           (chunk_id, video_id, text, start_time, end_time, chunk_index, generation_id)
+                           VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                        [
+                            (chunk_id, video_id, chunk["text"] if settings.chunk_text_in_sqlite else "",
+                             chunk["start_time"], chunk["end_time"], chunk["chunk_index"],
+                             generation.generation_id)
+                            for chunk_id, chunk in zip(new_ids, chunks)
+                        ]
+                    )
+                    # Precomputed suggestion answers were retrieved from the replaced chunks
+                    await conn.execute(
+                        """UPDATE question_suggestions SET answer = NULL, timestamps = NULL
+                           WHERE video_id = ? AND answer_generation_id = ?""",
+                        (video_id, generation.generation_id)
+                    )
+                    await conn.execute(
+                        """UPDATE reindex_items SET status = 'done', chunk_count = ?, error = NULL
+                           WHERE job_id = ? AND video_id = ?""",
+                        (len(new_ids), job_id, video_id)
+                    )
+                    await conn.commit()
+                except Exception:
+                    await conn.rollback()
+                    await vector_store.delete_chunk_ids(new_ids, collection_name)
+                    raise
+            finally:
+                await conn.close()
+
+            # Old vectors no longer resolve to chunk rows; drop them
+            await vector_store.delete_chunk_ids(old_ids, collection_name)
+            chunks_indexed.inc(len(new_ids))
+
+    async def _mark_failed(self, job_id: str, video_id: str, error: str):
+        videos_reindexed.labels(status="failed").inc()
+        conn = await db.get_connection()
+        try:
+            await conn.execute(
+                "UPDATE reindex_items SET status = 'failed', error = ? WHERE job_id = ? AND video_id = ?",
+                (error, job_id, video_id)
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+
+# Singleton instance
+reindex_service = ReindexService()
@@ -0,0 +1,442 @@
+"""
+Background suggested-question generation, map-reduce over the whole video
+
+The ingestion pipeline enqueues a video here once it is marked completed
+instead of generating questions inline. One worker takes videos from a
+priority queue (new ingestions before the startup backfill) and waits
+while ingestions are running, up to ``settings.question_max_defer_seconds``,
+so it does not compete with foreground work. For each video:
+
+1. Select: k-means over the chunk embeddings of the active generation;
+   the chunk closest to each centroid represents its cluster, so every
+   region and topic of the timeline is covered, not just the opening.
+2. Map: candidate questions per representative chunk, requested
+   concurrently (``settings.question_concurrency``).
+3. Reduce: embed the candidates and keep them greedily, largest clusters
+   first, dropping any at least ``settings.question_dedupe_similarity``
+   similar to one already kept.
+4. Store the suggestions and pre-warm the answer path: their embeddings
+   go into the query embedding cache and their vector searches and the
+   transcript store are touched once.
+5. Answer: with ``settings.suggestion_answers`` each suggestion runs the
+   full /query pipeline and the answer is stored with its resolved
+   timestamps and the generation it was retrieved from; /query serves it
+   from the video lookup while that generation is active.
+
+A reindex clears the answers of each video as it is swapped (in-place
+rebuilds) or leaves them bound to the old generation (new generations),
+and queues an answers-only job once it finishes. The queue lives in
+memory; at startup completed videos without suggestions, or with answers
+missing or from an inactive generation, are queued again.
+"""
+from typing import Dict, List, Optional, Set
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.embedding_service import embedding_service
+from backend.services.index_generations import index_manager
+from backend.services.metrics import queue_depth
+from backend.services.progress import progress_bus
+from backend.services.question_generator import question_generator_service
+from backend.services.tracing import tracer
+from backend.services.transcript_store import transcript_store
+from backend.services.vector_store import vector_store
+import asyncio
+import itertools
+import json
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INGESTED = 0
+PRIORITY_BACKFILL = 10
+
+# Job kinds: the full map-reduce, or only (re)answering stored suggestions
+QUESTIONS = "questions"
+ANSWERS = "answers"
+
+KMEANS_ITERATIONS = 25
+IDLE_POLL_SECONDS = 1.0
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.where(norms == 0, 1.0, norms)
+
+
+def kmeans_representatives(embeddings: np.ndarray, k: int, seed: int = 0) -> List[tuple]:
+    """
+    Cluster normalized embeddings with k-means (k-means++ seeding)
+
+    Returns:
+        [(representative_row, cluster_size), ...], largest clusters first;
+        each representative is the member closest to its centroid
+    """
+    points = _normalize(np.asarray(embeddings, dtype=np.float32))
+    count = len(points)
+    k = min(k, count)
+    if k <= 0:
+        return []
+    if k == count:
+        return [(row, 1) for row in range(count)]
+
+    rng = np.random.default_rng(seed)
+    centroids = [points[rng.integers(count)]]
+    for _ in range(1, k):
+        distances = np.min(
+            np.linalg.norm(points[:, None, :] - np.asarray(centroids)[None, :, :], axis=2) ** 2, axis=1
+        )
+        total = distances.sum()
+        probabilities = distances / total if total > 0 else None
+        centroids.append(points[rng.choice(count, p=probabilities)])
+    centroids = np.asarray(centroids)
+
+    for _ in range(KMEANS_ITERATIONS):
+        distances = np.linalg.norm(points[:, None, :] - centroids[None, :, :], axis=2)
+        labels = distances.argmin(axis=1)
+        updated = np.asarray([
+            points[labels == cluster].mean(axis=0) if np.any(labels == cluster) else centroids[cluster]
+            for cluster in range(k)
+        ])
+        if np.allclose(updated, centroids):
+            break
+        centroids = updated
+
+    distances = np.linalg.norm(points[:, None, :] - centroids[None, :, :], axis=2)
+    labels = distances.argmin(axis=1)
+    representatives = []
+    for cluster in range(k):
+        members = np.flatnonzero(labels == cluster)
+        if len(members):
+            closest = members[distances[members, cluster].argmin()]
+            representatives.append((int(closest), len(members)))
+    representatives.sort(key=lambda item: -item[1])
+    return representatives
+
+
+def dedupe_questions(candidates: List[str], embeddings: np.ndarray, threshold: float, limit: int) -> List[int]:
+    """Indexes of the candidates kept in order, skipping near-duplicates of earlier ones"""
+    vectors = _normalize(np.asarray(embeddings, dtype=np.float32))
+    kept: List[int] = []
+    seen_text: Set[str] = set()
+    for i, question in enumerate(candidates):
+        key = question.strip().lower()
+        if not key or key in seen_text:
+            continue
+        if kept and float(np.max(vectors[kept] @ vectors[i])) >= threshold:
+            continue
+        kept.append(i)
+        seen_text.add(key)
+        if len(kept) >= limit:
+            break
+    return kept
+
+
+class SuggestionService:
+    """Low-priority queue and worker for suggested questions"""
+
+    def __init__(self):
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._queued: Set[tuple] = set()  # (video_id, kind) waiting in the queue
+        self._counter = itertools.count()
+        self._task: Optional[asyncio.Task] = None
+        self.running: Optional[str] = None
+
+    def _update_depth(self):
+        queue_depth.labels(queue="suggestions", state="pending").set(len(self._queued))
+        queue_depth.labels(queue="suggestions", state="processing").set(1 if self.running else 0)
+
+    def enqueue(self, video_id: str, priority: int = PRIORITY_INGESTED, kind: str = QUESTIONS):
+        """Schedule suggestion generation for a video (ignored if already queued)"""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if (video_id, kind) in self._queued or (video_id, QUESTIONS) in self._queued:
+            return
+        self._queued.add((video_id, kind))
+        self._queue.put_nowait((priority, next(self._counter), video_id, kind))
+        self._update_depth()
+
+    def refresh_answers(self, video_ids: List[str]):
+        """
+        Re-answer the stored suggestions of videos whose chunks changed (after a reindex)
+
+        Only the server runs the worker; elsewhere (the reindex CLI) this is a
+        no-op and the server's backfill picks the stale answers up when it
+        notices the finished job.
+        """
+        if not settings.suggestion_answers or self._task is None:
+            return
+        for video_id in video_ids:
+            self.enqueue(video_id, PRIORITY_BACKFILL, ANSWERS)
+
+    async def backfill(self):
+        """Enqueue work lost on restart: videos without suggestions or with stale answers"""
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """SELECT video_id FROM videos v WHERE status = 'completed'
+                   AND NOT EXISTS (SELECT 1 FROM question_suggestions q WHERE q.video_id = v.video_id)"""
+            )
+            missing = [row[0] for row in await cursor.fetchall()]
+            cursor = await conn.execute(
+                """SELECT v.video_id, v.index_partition, MIN(q.answer IS NOT NULL),
+                          MIN(q.answer_generation_id), MAX(q.answer_generation_id)
+                   FROM videos v JOIN question_suggestions q ON q.video_id = v.video_id
+                   WHERE v.status = 'completed' GROUP BY v.video_id"""
+            )
+            answered = await cursor.fetchall()
+        finally:
+            await conn.close()
+        for video_id in missing:
+            self.enqueue(video_id, PRIORITY_BACKFILL)
+
+        stale = []
+        if settings.suggestion_answers:
+            for video_id, partition, all_answered, min_generation, max_generation in answered:
+                generation = index_manager.active_for(partition) or index_manager.active
+                if not all_answered or min_generation != generation.generation_id or max_generation != min_generation:
+                    stale.append(video_id)
+            self.refresh_answers(stale)
+        if missing or stale:
+            logger.info(f"Queued suggested questions for {len(missing)} videos and answers for {len(stale)}")
+
+    async def _wait_for_idle(self):
+        """Defer to running ingestions, for at most settings.question_max_defer_seconds"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.question_max_defer_seconds
+        while progress_bus.snapshot() and loop.time() < deadline:
+            await asyncio.sleep(IDLE_POLL_SECONDS)
+
+    async def _worker(self):
+        while True:
+            _, _, video_id, kind = await self._queue.get()
+            try:
+                await self._wait_for_idle()
+                self._queued.discard((video_id, kind))
+                self.running = video_id
+                self._update_depth()
+                with tracer.start_trace(f"suggestion_{kind}", video_id=video_id):
+                    if kind == QUESTIONS:
+                        await self.generate(video_id)
+                    else:
+                        await self.answer(video_id)
+            except Exception as e:
+                logger.warning(f"Suggested {kind} failed for {video_id}: {e}")
+            finally:
+                self._queued.discard((video_id, kind))
+                self.running = None
+                self._update_depth()
+                self._queue.task_done()
+
+    def start(self):
+        """Start the worker (no-op when running)"""
+        if self._queue is None:
+            self._queue = asyncio.PriorityQueue()
+        if self._task is None:
+            self._task = asyncio.create_task(self._worker())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _video(self, video_id: str) -> Optional[tuple]:
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                "SELECT title, status, index_partition, youtube_url FROM videos WHERE video_id = ?", (video_id,)
+            )
+            return await cursor.fetchone()
+        finally:
+            await conn.close()
+
+    async def _chunk_texts(self, chunk_ids: List[str]) -> Dict[str, str]:
+        """Chunk text from SQLite for chunks stored without ChromaDB documents"""
+        if not chunk_ids:
+            return {}
+        conn = await db.get_connection()
+        try:
+            placeholders = ','.join('?' * len(chunk_ids))
+            cursor = await conn.execute(
+                f"SELECT chunk_id, text FROM chunks WHERE chunk_id IN ({placeholders})", chunk_ids
+            )
+            return {row[0]: row[1] for row in await cursor.fetchall()}
+        finally:
+            await conn.close()
+
+    async def generate(self, video_id: str) -> List[str]:
+        """Run the map-reduce for one video and store its suggestions"""
+        video = await self._video(video_id)
+        if video is None or video[1] != "completed":
+            return []
+        title = video[0] or "Unknown"
+        generation = index_manager.active_for(video[2]) or index_manager.active
+
+        with tracer.span("select_excerpts"):
+            vectors = await vector_store.get_video_vectors(video_id, generation.collection_name)
+            chunk_ids = vectors["ids"]
+            if not chunk_ids:
+                return []
+            # CPU-bound on long videos; keep it off the event loop serving foreground requests
+            representatives = await asyncio.to_thread(
+                kmeans_representatives,
+                np.asarray(vectors["embeddings"]), settings.question_clusters, settings.question_cluster_seed
+            )
+            documents = vectors.get("documents") or [None] * len(chunk_ids)
+            stored = await self._chunk_texts([chunk_ids[row] for row, _ in representatives if not documents[row]])
+            excerpts = [documents[row] or stored.get(chunk_ids[row], "") for row, _ in representatives]
+
+        semaphore = asyncio.Semaphore(max(settings.question_concurrency, 1))
+
+        async def map_excerpt(excerpt: str) -> List[str]:
+            if not excerpt:
+                return []
+            async with semaphore:
+                try:
+                    return await question_generator_service.generate_excerpt_questions(
+                        excerpt, title, settings.question_candidates_per_cluster
+                    )
+                except Exception as e:
+                    logger.warning(f"Question candidates failed for an excerpt of {video_id}: {e}")
+                    return []
+
+        with tracer.span("map_questions", excerpts=len(excerpts)):
+            per_excerpt = await asyncio.gather(*(map_excerpt(excerpt) for excerpt in excerpts))
+        # Excerpts are ordered largest cluster first, so the main topics lead the suggestions
+        candidates = [question for questions in per_excerpt for question in questions]
+        if not candidates:
+            return []
+
+        with tracer.span("reduce_questions", candidates=len(candidates)):
+            embeddings = await asyncio.to_thread(
+                embedding_service.generate_embeddings, candidates, generation.embedding_model
+            )
+            kept = dedupe_questions(
+                candidates, np.asarray(embeddings), settings.question_dedupe_similarity, settings.question_count
+            )
+            questions = [candidates[i] for i in kept]
+
+        conn = await db.get_connection()
+        try:
+            await conn.execute("DELETE FROM question_suggestions WHERE video_id = ?", (video_id,))
+            await conn.executemany(
+                "INSERT INTO question_suggestions (video_id, question, display_order) VALUES (?, ?, ?)",
+                [(video_id, question, order) for order, question in enumerate(questions)]
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+        logger.info(
+            f"Stored {len(questions)} suggested questions for {video_id} "
+            f"({len(candidates)} candidates from {len(excerpts)} excerpts)"
+        )
+
+        with tracer.span("prewarm", questions=len(questions)):
+            await self.prewarm(video_id, generation, [(candidates[i], embeddings[i]) for i in kept])
+        if settings.suggestion_answers:
+            await self.answer(video_id)
+        return questions
+
+    async def prewarm(self, video_id: str, generation, questions: List[tuple]):
+        """Make the first query for each suggestion skip embedding and cold reads"""
+        await transcript_store.load(video_id)
+        for question, embedding in questions:
+            embedding_service.cache_query_embedding(question, embedding, generation.embedding_model)
+            await vector_store.query_similar(
+                query_embedding=embedding,
+                video_id=video_id,
+                collection_name=generation.collection_name
+            )
+
+    async def answer(self, video_id: str) -> int:
+        """
+        Run the /query pipeline for each stored suggestion and save the responses
+
+        Answers are only saved if the video's chunk rows in the generation are
+        unchanged since they were read: chunk ids only grow, so a reindex swap
+        or re-ingest that replaced them meanwhile makes the write a no-op.
+
+        Returns:
+            Number of answers stored
+        """
+        # backend.api.query imports the reindex service, which imports this module
+        from backend.api.query import answer_question
+
+        video = await self._video(video_id)
+        if video is None or video[1] != "completed":
+            return 0
+        generation = index_manager.active_for(video[2]) or index_manager.active
+
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                "SELECT id, question FROM question_suggestions WHERE video_id = ? ORDER BY id", (video_id,)
+            )
+            suggestions = await cursor.fetchall()
+            chunk_version = await self._chunk_version(conn, video_id, generation.generation_id)
+        finally:
+            await conn.close()
+
+        semaphore = asyncio.Semaphore(max(settings.question_concurrency, 1))
+
+        async def answer_one(question: str):
+            async with semaphore:
+                try:
+                    return await answer_question(video_id, question, video[3], generation)
+                except Exception as e:
+                    logger.warning(f"Precomputing the answer to a suggestion of {video_id} failed: {e}")
+                    return None
+
+        with tracer.span("answer_suggestions", questions=len(suggestions)):
+            responses = await asyncio.gather(*(answer_one(question) for _, question in suggestions))
+
+        rows = [
+            (
+                response.answer,
+                json.dumps([timestamp.model_dump() for timestamp in response.timestamps]),
+                response.sources_used,
+                generation.generation_id,
+                suggestion_id,
+                video_id,
+                generation.generation_id,
+                chunk_version
+            )
+            for (suggestion_id, _), response in zip(suggestions, responses)
+            if response is not None
+        ]
+        conn = await db.get_connection()
+        try:
+            changes_before = conn.total_changes
+            await conn.executemany(
+                """UPDATE question_suggestions
+                   SET answer = ?, timestamps = ?, sources_used = ?, answer_generation_id = ?,
+                       answered_at = CURRENT_TIMESTAMP
+                   WHERE id = ?
+                     AND (SELECT MAX(id) FROM chunks WHERE video_id = ? AND generation_id = ?) IS ?""",
+                rows
+            )
+            stored = conn.total_changes - changes_before
+            await conn.commit()
+        finally:
+            await conn.close()
+        if stored < len(rows):
+            logger.info(f"Discarded {len(rows) - stored} precomputed answers for {video_id}: chunks changed")
+        logger.info(f"Stored {stored} precomputed answers for {video_id} (generation {generation.generation_id})")
+        return stored
+
+    @staticmethod
+    async def _chunk_version(conn, video_id: str, generation_id: int) -> Optional[int]:
+        """Newest chunk row id of a video in a generation (changes whenever its chunks are replaced)"""
+        cursor = await conn.execute(
+            "SELECT MAX(id) FROM chunks WHERE video_id = ? AND generation_id = ?", (video_id, generation_id)
+        )
+        row = await cursor.fetchone()
+        return row[0] if row else None
+
+
+# Singleton instance
+suggestion_service = SuggestionService()
@@ -0,0 +1,289 @@
+"""
+Hierarchical summaries for coarse-to-fine retrieval over long videos
+
+Videos with at least ``settings.summary_min_chunks`` chunks get a summary
+per section (``settings.summary_section_chunks`` consecutive chunks) and a
+video-level summary written from the section summaries. Each summary is
+embedded and stored in ``video_summaries`` with its time span; the
+vectors are float32 blobs searched with numpy, a video has at most a few
+dozen of them.
+
+Sections are identified by time, not chunk_index, so summaries stay valid
+across reindexes with other chunk parameters; after an embedding model
+change they are re-embedded on first use.
+
+``RETRIEVAL_MODE=hierarchical`` queries call ``plan``: a broad question
+(closest to the video summary) is answered from the summaries alone,
+anything else searches chunks only inside the best matching sections.
+"""
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from backend.app.config import settings
+from backend.database.db import db
+from backend.services.context_expansion import merge_spans
+from backend.services.embedding_service import embedding_service
+from backend.services.providers import create_client, record_usage, record_error
+from backend.services.tracing import tracer
+import asyncio
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+SECTION = "section"
+VIDEO = "video"
+
+# Longest section text sent to the summary model
+MAX_SECTION_CHARS = 12000
+
+
+@dataclass
+class SummaryPlan:
+    """Outcome of the coarse retrieval step"""
+    broad: bool
+    summaries: List[Dict]  # Context entries for the LLM: text, start_time, end_time
+    sections: List[Dict] = field(default_factory=list)  # Sections to search chunks in (empty when broad)
+
+
+def _format_time(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+def build_sections(chunks: List[Dict], section_chunks: int) -> List[Dict]:
+    """Group consecutive chunks into sections with merged (de-duplicated) text"""
+    section_chunks = max(section_chunks, 1)
+    sections = []
+    for start in range(0, len(chunks), section_chunks):
+        span = merge_spans(chunks[start:start + section_chunks])[0]
+        sections.append({
+            "section_index": len(sections),
+            "text": span["text"],
+            "start_time": span["start_time"],
+            "end_time": span["end_time"],
+        })
+    return sections
+
+
+class SummaryService:
+    """Builds, stores and searches section and video summaries"""
+
+    def __init__(self):
+        self._client = None
+        self.model = settings.summary_model
+
+    @property
+    def client(self):
+        """Lazy initialization of the configured provider client"""
+        if self._client is None:
+            self._client = create_client(async_client=True)
+        return self._client
+
+    def wants_summaries(self, chunk_count: int) -> bool:
+        return settings.summary_min_chunks > 0 and chunk_count >= settings.summary_min_chunks
+
+    async def _complete(self, prompt: str, max_tokens: int) -> str:
+        try:
+            response = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {
+                        "role": "system",
+                        "content": "You summarize video transcripts accurately and concisely. Output only the summary."
+                    },
+                    {"role": "user", "content": prompt}
+                ],
+                temperature=0.2,
+                max_tokens=max_tokens,
+            )
+        except Exception as e:
+            record_error("summaries", e)
+            raise
+        record_usage("summaries", response)
+        return response.choices[0].message.content.strip()
+
+    async def summarize_section(self, title: str, section: Dict) -> str:
+        span = f"{_format_time(section['start_time'])}-{_format_time(section['end_time'])}"
+        prompt = f"""Summarize the part of the video titled "{title}" from {span} in 3 to 5 sentences.
+Name the main topics, claims and steps so the summary can be matched against viewer questions.
+
+Transcript:
+{section['text'][:MAX_SECTION_CHARS]}"""
+        with tracer.span("llm.summarize_section", section=section["section_index"]):
+            return await self._complete(prompt, max_tokens=300)
+
+    async def summarize_video(self, title: str, sections: List[Dict]) -> str:
+        outline = "\n".join(
+            f"[{_format_time(s['start_time'])}] {s['summary']}" for s in sections
+        )
+        prompt = f"""Summarize the whole video titled "{title}" in one paragraph of 4 to 6 sentences:
+what it is about, how it is structured and its main conclusions.
+
+Transcript:
+{outline}"""
+        with tracer.span("llm.summarize_video", sections=len(sections)):
+            return await self._complete(prompt, max_tokens=400)
+
+    async def build(self, video_id: str, title: str, chunks: List[Dict], embedding_model: str) -> List[Dict]:
+        """
+        Summarize and embed the sections and the whole video, replacing stored summaries
+
+        Args:
+            chunks: The video's chunks in chunk_index order
+            embedding_model: Model of the generation queries will embed with
+
+        Returns:
+            Stored summaries, the video summary first
+        """
+        sections = build_sections(chunks, settings.summary_section_chunks)
+        semaphore = asyncio.Semaphore(max(settings.summary_concurrency, 1))
+
+        async def summarize(section: Dict):
+            async with semaphore:
+                section["summary"] = await self.summarize_section(title, section)
+
+        await asyncio.gather(*(summarize(section) for section in sections))
+        video_summary = await self.summarize_video(title, sections)
+
+        summaries = [{
+            "level": VIDEO,
+            "section_index": 0,
+            "text": video_summary,
+            "start_time": sections[0]["start_time"],
+            "end_time": sections[-1]["end_time"],
+        }] + [
+            {
+                "level": SECTION,
+                "section_index": s["section_index"],
+                "text": s["summary"],
+                "start_time": s["start_time"],
+                "end_time": s["end_time"],
+            }
+            for s in sections
+        ]
+        embeddings = embedding_service.generate_embeddings([s["text"] for s in summaries], embedding_model)
+        for summary, embedding in zip(summaries, embeddings):
+            summary["embedding"] = np.asarray(embedding, dtype=np.float32)
+
+        await self._store(video_id, summaries, embedding_model)
+        logger.info(f"Stored {len(sections)} section summaries and a video summary for {video_id}")
+        return summaries
+
+    async def _store(self, video_id: str, summaries: List[Dict], embedding_model: str):
+        conn = await db.get_connection()
+        try:
+            await conn.execute("DELETE FROM video_summaries WHERE video_id = ?", (video_id,))
+            await conn.executemany(
+                """INSERT INTO video_summaries
+                   (video_id, level, section_index, text, start_time, end_time, embedding_model, embedding)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [
+                    (video_id, s["level"], s["section_index"], s["text"], s["start_time"], s["end_time"],
+                     embedding_model, s["embedding"].tobytes())
+                    for s in summaries
+                ]
+            )
+            await conn.commit()
+        finally:
+            await conn.close()
+
+    async def load(self, video_id: str, embedding_model: Optional[str] = None) -> List[Dict]:
+        """
+        Stored summaries of a video, the video summary first
+
+        With ``embedding_model``, summaries embedded by another model are
+        re-embedded and saved (e.g. after a reindex switched models).
+        """
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """SELECT id, level, section_index, text, start_time, end_time, embedding_model, embedding
+                   FROM video_summaries WHERE video_id = ? ORDER BY level, section_index""",
+                (video_id,)
+            )
+            rows = await cursor.fetchall()
+        finally:
+            await conn.close()
+        # Index order puts "section" before "video"; callers expect the video summary first
+        rows.sort(key=lambda row: row[1] != VIDEO)
+
+        summaries = [
+            {
+                "id": row[0],
+                "level": row[1],
+                "section_index": row[2],
+                "text": row[3],
+                "start_time": row[4],
+                "end_time": row[5],
+                "embedding_model": row[6],
+                "embedding": np.frombuffer(row[7], dtype=np.float32),
+            }
+            for row in rows
+        ]
+
+        stale = [s for s in summaries if embedding_model and s["embedding_model"] != embedding_model]
+        if stale:
+            embeddings = embedding_service.generate_embeddings([s["text"] for s in stale], embedding_model)
+            for summary, embedding in zip(stale, embeddings):
+                summary["embedding"] = np.asarray(embedding, dtype=np.float32)
+                summary["embedding_model"] = embedding_model
+            conn = await db.get_connection()
+            try:
+                await conn.executemany(
+                    "UPDATE video_summaries SET embedding_model = ?, embedding = ? WHERE id = ?",
+                    [(embedding_model, s["embedding"].tobytes(), s["id"]) for s in stale]
+                )
+                await conn.commit()
+            finally:
+                await conn.close()
+            logger.info(f"Re-embedded {len(stale)} summaries of {video_id} with {embedding_model}")
+        return summaries
+
+    async def plan(self, video_id: str, query_embedding: List[float], embedding_model: str) -> Optional[SummaryPlan]:
+        """
+        Coarse retrieval step: rank the sections against the query
+
+        Returns:
+            None when the video has no summaries (fall back to flat retrieval)
+        """
+        summaries = await self.load(video_id, embedding_model)
+        sections = [s for s in summaries if s["level"] == SECTION]
+        video = next((s for s in summaries if s["level"] == VIDEO), None)
+        if not sections or video is None:
+            return None
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        matrix = np.stack([video["embedding"]] + [s["embedding"] for s in sections])
+        norms = np.linalg.norm(matrix, axis=1) * (np.linalg.norm(query) or 1.0)
+        scores = matrix @ query / np.where(norms == 0, 1.0, norms)
+        video_score, section_scores = scores[0], scores[1:]
+
+        def entry(summary: Dict, label: str) -> Dict:
+            return {
+                "text": f"{label}: {summary['text']}",
+                "start_time": summary["start_time"],
+                "end_time": summary["end_time"],
+            }
+
+        if video_score >= section_scores.max():
+            # Broad question: the overview plus the best sections, no raw chunks
+            top = np.argsort(-section_scores)[:settings.summary_broad_sections]
+            return SummaryPlan(
+                broad=True,
+                summaries=[entry(video, "Video summary")] + [
+                    entry(sections[i], "Section summary") for i in sorted(top)
+                ]
+            )
+
+        top = np.argsort(-section_scores)[:max(settings.summary_top_sections, 1)]
+        chosen = [sections[i] for i in sorted(top)]
+        return SummaryPlan(
+            broad=False,
+            summaries=[entry(section, "Section summary") for section in chosen],
+            sections=chosen
+        )
+
+
+# Singleton instance
+summary_service = SummaryService()
@@ -0,0 +1,233 @@
+"""
+Lightweight request / pipeline tracing
+
+A trace is a flat list of timed spans kept in a context variable, so any
+service can open a span without threading a tracer through call signatures:
+
+    with tracer.span("embed_query"):
+        ...
+
+HTTP requests get a trace from ``TracingMiddleware`` (which also emits a
+``Server-Timing`` header); background jobs open their own with
+``tracer.start_trace``. When ``settings.trace_export_path`` is set, finished
+traces are appended to that file as OTLP/JSON (one ``ExportTraceServiceRequest``
+per line), the format read by the OpenTelemetry Collector ``otlpjsonfile``
+receiver.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional
+from backend.app.config import settings
+import json
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Span:
+    """A single timed operation"""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start_unix_ns: int
+    start: float
+    end: Optional[float] = None
+    attributes: Dict = field(default_factory=dict)
+    error: Optional[str] = None
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end if self.end is not None else time.perf_counter()
+        return (end - self.start) * 1000
+
+
+@dataclass
+class Trace:
+    """All spans recorded for one request or background job"""
+    name: str
+    trace_id: str
+    root: Span
+    spans: List[Span] = field(default_factory=list)
+
+    def server_timing(self) -> str:
+        """
+        Format finished spans as a ``Server-Timing`` header value
+
+        Spans with the same name (e.g. one per transcribed segment) are summed.
+        """
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            if span.end is not None:
+                totals[span.name] = totals.get(span.name, 0.0) + span.duration_ms
+        entries = [f"{name};dur={duration:.1f}" for name, duration in totals.items()]
+        entries.append(f"total;dur={self.root.duration_ms:.1f}")
+        return ", ".join(entries)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _new_id(num_bytes: int) -> str:
+    return os.urandom(num_bytes).hex()
+
+
+class OTLPFileExporter:
+    """Appends finished traces to a file as OTLP/JSON lines"""
+
+    def __init__(self, path: str, service_name: str = "youtube-semantic-search"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _attributes(attributes: Dict) -> List[Dict]:
+        encoded = []
+        for key, value in attributes.items():
+            if isinstance(value, bool):
+                encoded.append({"key": key, "value": {"boolValue": value}})
+            elif isinstance(value, int):
+                encoded.append({"key": key, "value": {"intValue": str(value)}})
+            elif isinstance(value, float):
+                encoded.append({"key": key, "value": {"doubleValue": value}})
+            else:
+                encoded.append({"key": key, "value": {"stringValue": str(value)}})
+        return encoded
+
+    def _span(self, trace: Trace, span: Span) -> Dict:
+        start_ns = span.start_unix_ns
+        end_ns = start_ns + int(span.duration_ms * 1_000_000)
+        encoded = {
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 2 if span is trace.root else 1,  # SERVER for the root, INTERNAL otherwise
+            "startTimeUnixNano": str(start_ns),
+            "endTimeUnixNano": str(end_ns),
+            "attributes": self._attributes(span.attributes),
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            encoded["parentSpanId"] = span.parent_id
+        return encoded
+
+    def export(self, trace: Trace):
+        payload = {
+            "resourceSpans": [{
+                "resource": {"attributes": self._attributes({"service.name": self.service_name})},
+                "scopeSpans": [{
+                    "scope": {"name": "backend.services.tracing"},
+                    "spans": [self._span(trace, span) for span in [trace.root, *trace.spans]],
+                }],
+            }]
+        }
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload) + "\n")
+        except OSError as e:
+            logger.warning(f"Failed to export trace {trace.trace_id}: {e}")
+
+
+class Tracer:
+    """Creates traces and spans bound to the current async context"""
+
+    def __init__(self):
+        self.exporter = OTLPFileExporter(settings.trace_export_path) if settings.trace_export_path else None
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Register ``listener(span)`` to be called whenever a span finishes"""
+        self._listeners.append(listener)
+
+    @property
+    def current_trace(self) -> Optional[Trace]:
+        return _current_trace.get()
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes) -> Iterator[Trace]:
+        """Start a new trace (nested traces replace the outer one until they exit)"""
+        root = Span(
+            name=name,
+            span_id=_new_id(8),
+            parent_id=None,
+            start_unix_ns=time.time_ns(),
+            start=time.perf_counter(),
+            attributes=attributes,
+        )
+        trace = Trace(name=name, trace_id=_new_id(16), root=root)
+        trace_token = _current_trace.set(trace)
+        span_token = _current_span.set(root)
+        try:
+            yield trace
+        except BaseException as e:
+            root.error = str(e)
+            raise
+        finally:
+            root.end = time.perf_counter()
+            _current_span.reset(span_token)
+            _current_trace.reset(trace_token)
+            if self.exporter:
+                self.exporter.export(trace)
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Optional[Span]]:
+        """
+        Time a block of work inside the current trace
+
+        Outside of a trace the span is only passed to listeners (metrics),
+        so instrumented services stay cheap when called from scripts.
+        """
+        trace = _current_trace.get()
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            span_id=_new_id(8),
+            parent_id=parent.span_id if parent else None,
+            start_unix_ns=time.time_ns(),
+            start=time.perf_counter(),
+            attributes=attributes,
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.error = str(e)
+            raise
+        finally:
+            span.end = time.perf_counter()
+            _current_span.reset(token)
+            if trace is not None:
+                trace.spans.append(span)
+            for listener in self._listeners:
+                listener(span)
+
+
+# Singleton instance
+tracer = Tracer()
+
+
+class TracingMiddleware:
+    """ASGI middleware that traces each HTTP request and adds ``Server-Timing``"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with tracer.start_trace(f"{scope['method']} {scope['path']}", path=scope["path"]) as trace:
+            async def send_with_timing(message):
+                if message["type"] == "http.response.start":
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            await self.app(scope, receive, send_with_timing)
@@ -0,0 +1,193 @@
+"""
+Memory-mapped columnar transcript store
+
+Each video's transcript is kept under ``settings.transcript_store_path/<video_id>/``
+as four files written once at ingestion:
+
+    starts.npy   float64[n]    segment start times (sorted)
+    ends.npy     float64[n]    segment end times
+    offsets.npy  int64[n + 1]  byte offsets of each segment in text.bin
+    text.bin     uint8         packed UTF-8 text of all segments
+
+All four are memory-mapped on open, so a timestamp resolves to its segment
+by binary search over ``starts`` and time-range reads slice the arrays
+without touching SQLite. Videos ingested before the store existed are
+materialised from the ``transcripts`` table on first access.
+"""
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+from backend.app.config import settings
+from backend.database.db import db
+import numpy as np
+import os
+import shutil
+import threading
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class VideoTranscript:
+    """Read-only view over one video's memory-mapped transcript columns"""
+
+    def __init__(self, directory: Path):
+        self.starts = np.load(directory / "starts.npy", mmap_mode="r")
+        self.ends = np.load(directory / "ends.npy", mmap_mode="r")
+        self.offsets = np.load(directory / "offsets.npy", mmap_mode="r")
+        text_path = directory / "text.bin"
+        # np.memmap cannot map an empty file
+        self._text = np.memmap(text_path, dtype=np.uint8, mode="r") if text_path.stat().st_size else b""
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def text(self, index: int) -> str:
+        start, end = int(self.offsets[index]), int(self.offsets[index + 1])
+        return bytes(self._text[start:end]).decode("utf-8")
+
+    def segment(self, index: int) -> Dict:
+        return {
+            "index": index,
+            "text": self.text(index),
+            "start": float(self.starts[index]),
+            "end": float(self.ends[index]),
+        }
+
+    def segment_at(self, seconds: float) -> Optional[int]:
+        """Index of the segment playing at ``seconds`` (the last one starting at or before it)"""
+        if not len(self):
+            return None
+        index = int(np.searchsorted(self.starts, seconds, side="right")) - 1
+        return max(index, 0)
+
+    def range_indices(self, start: Optional[float] = None, end: Optional[float] = None) -> range:
+        """Indices of segments overlapping [start, end)"""
+        lo, hi = 0, len(self)
+        if end is not None:
+            hi = int(np.searchsorted(self.starts, end, side="left"))
+        if start is not None:
+            lo = self.segment_at(start) or 0
+            if lo < hi and self.ends[lo] <= start:
+                lo += 1
+        return range(lo, max(lo, hi))
+
+    def iter_range(self, start: Optional[float] = None, end: Optional[float] = None) -> Iterator[Dict]:
+        for index in self.range_indices(start, end):
+            yield self.segment(index)
+
+    def text_window(self, index: int, max_chars: int = 100) -> str:
+        """Text from segment ``index`` onwards, cut at ``max_chars``"""
+        parts, length = [], 0
+        while index < len(self) and length < max_chars:
+            text = self.text(index).strip()
+            parts.append(text)
+            length += len(text) + 1
+            index += 1
+        return " ".join(parts)[:max_chars]
+
+
+class TranscriptStore:
+    """Writes per-video column files and caches their memory maps"""
+
+    def __init__(self, root: str, max_open: int = 256):
+        self.root = Path(root)
+        self.max_open = max_open
+        self._open: "OrderedDict[str, VideoTranscript]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _directory(self, video_id: str) -> Path:
+        return self.root / video_id
+
+    def write(self, video_id: str, segments: List[Dict]):
+        """Write (or replace) a video's transcript columns"""
+        ordered = sorted(segments, key=lambda segment: segment["start"])
+        encoded = [segment["text"].encode("utf-8") for segment in ordered]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            offsets[1:] = np.cumsum([len(text) for text in encoded])
+
+        directory = self._directory(video_id)
+        tmp_directory = self.root / f".{video_id}.{os.getpid()}.tmp"
+        shutil.rmtree(tmp_directory, ignore_errors=True)
+        tmp_directory.mkdir(parents=True)
+        np.save(tmp_directory / "starts.npy", np.array([s["start"] for s in ordered], dtype=np.float64))
+        np.save(tmp_directory / "ends.npy", np.array([s["end"] for s in ordered], dtype=np.float64))
+        np.save(tmp_directory / "offsets.npy", offsets)
+        with open(tmp_directory / "text.bin", "wb") as f:
+            f.write(b"".join(encoded))
+
+        self.invalidate(video_id)
+        if directory.exists():
+            # Directories cannot be replaced atomically; move the old one aside first
+            old_directory = self.root / f".{video_id}.old"
+            shutil.rmtree(old_directory, ignore_errors=True)
+            os.replace(directory, old_directory)
+            os.replace(tmp_directory, directory)
+            shutil.rmtree(old_directory, ignore_errors=True)
+        else:
+            os.replace(tmp_directory, directory)
+
+    def invalidate(self, video_id: str, delete: bool = False):
+        """Forget the cached memory maps (and optionally the files) of a video"""
+        with self._lock:
+            self._open.pop(video_id, None)
+        if delete:
+            shutil.rmtree(self._directory(video_id), ignore_errors=True)
+
+    def video_ids(self) -> List[str]:
+        """Videos with column files on disk"""
+        if not self.root.exists():
+            return []
+        return [path.name for path in self.root.iterdir() if path.is_dir() and not path.name.startswith(".")]
+
+    def get(self, video_id: str) -> Optional[VideoTranscript]:
+        """Memory-mapped transcript, or None if the video has no column files"""
+        with self._lock:
+            transcript = self._open.get(video_id)
+            if transcript is not None:
+                self._open.move_to_end(video_id)
+                return transcript
+
+        directory = self._directory(video_id)
+        if not (directory / "offsets.npy").exists():
+            return None
+        transcript = VideoTranscript(directory)
+
+        with self._lock:
+            self._open[video_id] = transcript
+            while len(self._open) > self.max_open:
+                self._open.popitem(last=False)
+        return transcript
+
+    async def load(self, video_id: str) -> Optional[VideoTranscript]:
+        """
+        Memory-mapped transcript, building the column files from SQLite
+        the first time for videos ingested before the store existed
+
+        Returns None if the video has no stored transcript at all.
+        """
+        transcript = self.get(video_id)
+        if transcript is not None:
+            return transcript
+
+        conn = await db.get_connection()
+        try:
+            cursor = await conn.execute(
+                """SELECT text, start_time, end_time FROM transcripts
+                   WHERE video_id = ? ORDER BY segment_index""",
+                (video_id,)
+            )
+            rows = await cursor.fetchall()
+        finally:
+            await conn.close()
+
+        if not rows:
+            return None
+        self.write(video_id, [{"text": row[0], "start": row[1], "end": row[2]} for row in rows])
+        logger.info(f"Built column transcript store for {video_id} ({len(rows)} segments)")
+        return self.get(video_id)
+
+
+# Singleton instance
+transcript_store = TranscriptStore(settings.transcript_store_path)
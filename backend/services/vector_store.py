@@ -3,8 +3,9 @@ ChromaDB vector store wrapper
 """
 import chromadb
 from chromadb.config import Settings
-from typing import List, Dict
+from typing import List, Dict, Optional
 from backend.app.config import settings
+from backend.services.tracing import tracer
 import uuid
 import logging
 
@@ -19,22 +20,49 @@ class VectorStore:
         self.client = chromadb.PersistentClient(
             path=str(settings.get_chroma_dir())
         )
-        self.collection_name = "video_chunks"
-        self._ensure_collection()
+        self._collections = {}
+        self.set_active_collection("video_chunks")
     
-    def _ensure_collection(self):
-        """Create or get the main collection"""
-        self.collection = self.client.get_or_create_collection(
-            name=self.collection_name,
-            metadata={"description": "Video transcript chunks with timestamps"}
-        )
-        logger.info(f"Collection ready: {self.collection_name}")
+    def get_collection(self, name: Optional[str] = None):
+        """Create or get a collection (default: the active index generation's)"""
+        if name is None:
+            return self.collection
+        collection = self._collections.get(name)
+        if collection is None:
+            collection = self._collections[name] = self.client.get_or_create_collection(
+                name=name,
+                metadata={"description": "Video transcript chunks with timestamps"}
+            )
+            logger.info(f"Collection ready: {name}")
+        return collection
+    
+    def set_active_collection(self, name: str):
+        """Point queries and default writes at another collection (generation flip)"""
+        self.collection = self.get_collection(name)
+        self.collection_name = name
+    
+    def forget_collections(self, names: List[str]):
+        """Reopen these collections on next use (another process may have written to them)"""
+        for name in names:
+            self._collections.pop(name, None)
+        if self.collection_name in names:
+            self.set_active_collection(self.collection_name)
+    
+    def drop_collection(self, name: str):
+        """Delete a collection and everything in it"""
+        self._collections.pop(name, None)
+        try:
+            self.client.delete_collection(name)
+            logger.info(f"Dropped collection: {name}")
+        except Exception as e:
+            logger.warning(f"Failed to drop collection {name}: {e}")
     
     async def add_chunks(
         self,
         video_id: str,
         chunks: List[Dict],
-        embeddings: List[List[float]]
+        embeddings: List[List[float]],
+        collection_name: Optional[str] = None
     ) -> List[str]:
         """
         Add chunks with embeddings to ChromaDB
@@ -43,6 +71,7 @@ class VectorStore:
             video_id: Unique video identifier
             chunks: List of chunk dicts with text, start_time, end_time, chunk_index
             embeddings: Corresponding embedding vectors
+            collection_name: Target collection (default: active generation)
             
         Returns:
             List of generated chunk_ids
@@ -61,16 +90,17 @@ class VectorStore:
                 for chunk in chunks
             ]
             
-            # Prepare documents (text content)
-            documents = [chunk["text"] for chunk in chunks]
+            # Prepare documents (text content), unless chunk text lives in SQLite only
+            documents = [chunk["text"] for chunk in chunks] if settings.chunk_text_in_vector_store else None
             
             # Add to ChromaDB
-            self.collection.add(
-                ids=chunk_ids,
-                embeddings=embeddings,
-                documents=documents,
-                metadatas=metadatas
-            )
+            with tracer.span("vector.add", chunks=len(chunk_ids)):
+                self.get_collection(collection_name).add(
+                    ids=chunk_ids,
+                    embeddings=embeddings,
+                    documents=documents,
+                    metadatas=metadatas
+                )
             
             logger.info(f"Added {len(chunk_ids)} chunks to ChromaDB for video {video_id}")
             return chunk_ids
@@ -83,7 +113,10 @@ class VectorStore:
         self,
         query_embedding: List[float],
         video_id: str,
-        top_k: int = None
+        top_k: int = None,
+        collection_name: Optional[str] = None,
+        include_embeddings: bool = False,
+        where: Optional[Dict] = None
     ) -> Dict:
         """
         Query similar chunks for a given video
@@ -92,19 +125,27 @@ class VectorStore:
             query_embedding: Query embedding vector
             video_id: Filter by video_id
             top_k: Number of results (default from settings)
+            collection_name: Collection to search (default: active generation)
+            include_embeddings: Also return the chunk vectors (for MMR)
+            where: Extra metadata filter, combined with the video_id filter
             
         Returns:
-            Dict with ids, documents, metadatas, distances
+            Dict with ids, documents, metadatas, distances (and embeddings)
         """
         try:
             if top_k is None:
                 top_k = settings.top_k_results
             
-            results = self.collection.query(
-                query_embeddings=[query_embedding],
-                n_results=top_k,
-                where={"video_id": video_id}
-            )
+            include = ["documents", "metadatas", "distances"]
+            if include_embeddings:
+                include.append("embeddings")
+            with tracer.span("vector.query", top_k=top_k):
+                results = self.get_collection(collection_name).query(
+                    query_embeddings=[query_embedding],
+                    n_results=top_k,
+                    where={"$and": [{"video_id": video_id}, where]} if where else {"video_id": video_id},
+                    include=include
+                )
             
             logger.info(f"Retrieved {len(results['ids'][0])} results for video {video_id}")
             return results
@@ -113,15 +154,65 @@ class VectorStore:
             logger.error(f"Query failed: {e}")
             raise
     
-    async def delete_video_chunks(self, video_id: str):
+    async def get_video_vectors(self, video_id: str, collection_name: Optional[str] = None) -> Dict:
+        """ids, embeddings, documents and metadatas of every chunk of a video"""
+        return self.get_collection(collection_name).get(
+            where={"video_id": video_id},
+            include=["embeddings", "documents", "metadatas"]
+        )
+    
+    async def get_documents(self, chunk_ids: List[str], collection_name: Optional[str] = None) -> Dict[str, str]:
+        """Chunk text by id for chunks stored with documents"""
+        if not chunk_ids:
+            return {}
+        result = self.get_collection(collection_name).get(ids=chunk_ids, include=["documents"])
+        return {
+            chunk_id: document
+            for chunk_id, document in zip(result["ids"], result["documents"] or [])
+            if document is not None
+        }
+    
+    async def delete_video_chunks(self, video_id: str, collection_name: Optional[str] = None):
         """Delete all chunks for a video"""
         try:
-            self.collection.delete(where={"video_id": video_id})
+            self.get_collection(collection_name).delete(where={"video_id": video_id})
             logger.info(f"Deleted chunks for video {video_id}")
         except Exception as e:
             logger.error(f"Failed to delete chunks: {e}")
             raise
     
+    async def delete_chunk_ids(self, chunk_ids: List[str], collection_name: Optional[str] = None):
+        """Delete specific chunks by id"""
+        if not chunk_ids:
+            return
+        try:
+            self.get_collection(collection_name).delete(ids=chunk_ids)
+        except Exception as e:
+            logger.error(f"Failed to delete chunks: {e}")
+            raise
+    
+    async def delete_videos(self, video_ids: List[str], collection_name: Optional[str] = None):
+        """Delete all chunks of several videos in one call"""
+        if not video_ids:
+            return
+        try:
+            self.get_collection(collection_name).delete(where={"video_id": {"$in": video_ids}})
+        except Exception as e:
+            logger.error(f"Failed to delete chunks: {e}")
+            raise
+    
+    def iter_video_ids(self, collection_name: Optional[str] = None, page_size: int = 1000):
+        """Yield (chunk_id, video_id) for every vector in a collection, a page at a time"""
+        collection = self.get_collection(collection_name)
+        offset = 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            for chunk_id, metadata in zip(page["ids"], page["metadatas"]):
+                yield chunk_id, (metadata or {}).get("video_id")
+            if len(page["ids"]) < page_size:
+                break
+            offset += page_size
+    
     def check_health(self) -> bool:
         """Check if ChromaDB is accessible"""
         try:
@@ -2,8 +2,10 @@
 Whisper transcription service using Groq API
 """
 from typing import List, Dict
-from groq import AsyncGroq
 from backend.app.config import settings
+from backend.services.providers import create_client, record_error
+from backend.services.tracing import tracer
+from backend.services.metrics import whisper_upload_bytes, whisper_audio_seconds, whisper_upload_mb_per_audio_hour
 import logging
 
 logger = logging.getLogger(__name__)
@@ -12,16 +14,37 @@ logger = logging.getLogger(__name__)
 class WhisperService:
     """Handles audio transcription using Groq Whisper Large V3"""
     
+    model = "whisper-large-v3"
+    
     def __init__(self):
         self._client = None
     
+    @property
+    def cache_variant(self) -> str:
+        """Fetch cache key for transcripts produced by this provider/model"""
+        return f"{settings.llm_provider}/{self.model}"
+    
     def _get_client(self):
-        """Lazy initialization of Groq client"""
+        """Lazy initialization of the configured provider client"""
         if self._client is None:
-            from groq import AsyncGroq
-            self._client = AsyncGroq(api_key=settings.groq_api_key)
+            self._client = create_client(async_client=True)
         return self._client
     
+    def _record_upload(self, audio_file_path: str, response_dict: Dict, segments: List[Dict]):
+        """Upload volume metrics, labelled by container (e.g. ogg after transcoding)"""
+        import os
+        
+        size = os.path.getsize(audio_file_path)
+        audio_format = os.path.splitext(audio_file_path)[1].lstrip(".").lower() or "unknown"
+        seconds = response_dict.get('duration') or max((segment["end"] for segment in segments), default=0)
+        
+        whisper_upload_bytes.labels(format=audio_format).inc(size)
+        if seconds:
+            whisper_audio_seconds.labels(format=audio_format).inc(seconds)
+            whisper_upload_mb_per_audio_hour.labels(format=audio_format).observe(
+                size / (1024 * 1024) / (seconds / 3600)
+            )
+    
     async def transcribe_audio(self, audio_file_path: str) -> List[Dict]:
         """
         Transcribe audio file using Groq Whisper Large V3 with timestamps
@@ -49,10 +72,10 @@ class WhisperService:
             
             client = self._get_client()
             
-            with open(audio_file_path, "rb") as audio_file:
+            with open(audio_file_path, "rb") as audio_file, tracer.span("whisper.transcribe"):
                 # Groq Whisper Large V3 - fast and free
                 response = await client.audio.transcriptions.create(
-                    model="whisper-large-v3",
+                    model=self.model,
                     file=audio_file,
                     response_format="verbose_json"
                 )
@@ -81,10 +104,12 @@ class WhisperService:
                     "end": 0.0  # Unknown duration
                 })
             
+            self._record_upload(audio_file_path, response_dict, segments)
             logger.info(f"Transcription complete: {len(segments)} segments")
             return segments
             
         except Exception as e:
+            record_error("whisper", e)
             logger.error(f"Transcription failed: {e}")
             raise
 
@@ -2,8 +2,11 @@
 YouTube metadata extraction service
 """
 import yt_dlp
+import asyncio
 import logging
 from typing import Dict, Optional
+from backend.services.tracing import tracer
+from backend.services.fetch_cache import fetch_cache
 
 logger = logging.getLogger(__name__)
 
@@ -11,45 +14,88 @@ logger = logging.getLogger(__name__)
 class YouTubeMetadataService:
     """Extracts metadata from YouTube videos"""
     
-    @staticmethod
-    async def get_metadata(video_id: str) -> Dict[str, any]:
-        """
-        Extract video metadata without downloading
-        
-        Returns:
-            Dict with title, thumbnail_url, channel_name, upload_date, view_count, duration
-        """
+    def __init__(self):
+        # Extractions in progress, shared by concurrent callers for the same video
+        self._inflight: Dict[str, asyncio.Future] = {}
+    
+    def _extract_info(self, video_id: str) -> Dict[str, any]:
         ydl_opts = {
             'quiet': True,
             'no_warnings': True,
             'skip_download': True,
         }
         
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False)
+            return ydl.sanitize_info(info)
+    
+    async def get_info(self, video_id: str) -> Dict[str, any]:
+        """
+        Raw yt-dlp info dict for a video (no download)
+        
+        Served from the fetch cache when available, so the ingestion
+        pipeline and re-ingestion share a single extraction per video.
+        Concurrent calls (metadata and transcript steps run together)
+        wait for the same extraction.
+        """
+        info = fetch_cache.get(video_id, "ytdlp_info")
+        if info is not None:
+            return info
+        
+        inflight = self._inflight.get(video_id)
+        if inflight is not None:
+            return await asyncio.shield(inflight)
+        
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[video_id] = future
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(f"https://youtube.com/watch?v={video_id}", download=False)
-                
-                # Extract relevant metadata
-                metadata = {
-                    'title': info.get('title', 'Unknown'),
-                    'thumbnail_url': info.get('thumbnail') or info.get('thumbnails', [{}])[-1].get('url'),
-                    'channel_name': info.get('uploader') or info.get('channel'),
-                    'upload_date': info.get('upload_date'),  # Format: YYYYMMDD
-                    'view_count': info.get('view_count'),
-                    'duration': float(info.get('duration', 0)),
-                }
-                
-                # Format upload_date if available
-                if metadata['upload_date']:
-                    try:
-                        date_str = metadata['upload_date']
-                        formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
-                        metadata['upload_date'] = formatted_date
-                    except:
-                        pass
-                
-                logger.info(f"Retrieved metadata for {video_id}: {metadata['title']}")
-                return metadata
+            with tracer.span("youtube.metadata"):
+                info = await asyncio.to_thread(self._extract_info, video_id)
+            fetch_cache.put(video_id, "ytdlp_info", info)
+            future.set_result(info)
+            return info
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Waiters get the exception; mark it retrieved in case there are none
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(video_id, None)
+    
+    async def get_metadata(self, video_id: str) -> Dict[str, any]:
+        """
+        Extract video metadata without downloading
+        
+        Returns:
+            Dict with title, thumbnail_url, channel_name, upload_date, view_count, duration
+        """
+        try:
+            info = await self.get_info(video_id)
+            
+            # Extract relevant metadata
+            metadata = {
+                'title': info.get('title', 'Unknown'),
+                'thumbnail_url': info.get('thumbnail') or (info.get('thumbnails') or [{}])[-1].get('url'),
+                'channel_name': info.get('uploader') or info.get('channel'),
+                'upload_date': info.get('upload_date'),  # Format: YYYYMMDD
+                'view_count': info.get('view_count'),
+                'duration': float(info.get('duration') or 0),
+            }
+            
+            # Format upload_date if available
+            if metadata['upload_date']:
+                try:
+                    date_str = metadata['upload_date']
+                    formatted_date = f"{date_str[:4]}-{date_str[4:6]}-{date_str[6:8]}"
+                    metadata['upload_date'] = formatted_date
+                except:
+                    pass
+            
+            logger.info(f"Retrieved metadata for {video_id}: {metadata['title']}")
+            return metadata
                 
         except Exception as e:
             logger.error(f"Failed to get metadata for {video_id}: {e}")
@@ -1,7 +1,11 @@
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Badge } from '@/components/ui/badge'
+import { Button } from '@/components/ui/button'
+import { useDeleteVideo } from '@/hooks/useApi'
+import { adminEnabled } from '@/services/api'
 import { formatDuration } from '@/utils/video'
-import { Clock, Calendar, ExternalLink, Eye, User } from 'lucide-react'
+import { downloadTranscript } from '@/utils/export'
+import { Clock, Calendar, Download, ExternalLink, Eye, Loader2, Trash2, User } from 'lucide-react'
 import type { Video } from '@/types'
 
 interface VideoCardProps {
@@ -19,6 +23,14 @@ export function VideoCard({ video }: VideoCardProps) {
   const status = statusConfig[video.status] || statusConfig.pending
   const isCompleted = video.status === 'completed'
   const isProcessing = video.status === 'processing'
+  const isIngesting = isProcessing || video.status === 'pending'
+  const deleteMutation = useDeleteVideo()
+
+  const handleDelete = () => {
+    if (window.confirm(`Delete "${video.title || video.video_id}" and its transcript?`)) {
+      deleteMutation.mutate(video.video_id)
+    }
+  }
 
   return (
     <Card className="hover:shadow-md transition-shadow overflow-hidden">
@@ -85,6 +97,35 @@ export function VideoCard({ video }: VideoCardProps) {
           </a>
         )}
 
+        {!isIngesting && (isCompleted || adminEnabled) && (
+          <div className="flex items-center gap-2">
+            {isCompleted && (
+              <>
+                <Button variant="outline" size="sm" onClick={() => downloadTranscript(video.video_id, 'srt')}>
+                  <Download className="h-4 w-4 mr-1.5" />
+                  SRT
+                </Button>
+                <Button variant="outline" size="sm" onClick={() => downloadTranscript(video.video_id, 'vtt')}>
+                  <Download className="h-4 w-4 mr-1.5" />
+                  VTT
+                </Button>
+              </>
+            )}
+            {adminEnabled && (
+              <Button
+                variant="ghost"
+                size="sm"
+                className="ml-auto text-destructive hover:text-destructive"
+                onClick={handleDelete}
+                disabled={deleteMutation.isPending}
+                aria-label="Delete video"
+              >
+                {deleteMutation.isPending ? <Loader2 className="h-4 w-4 animate-spin" /> : <Trash2 className="h-4 w-4" />}
+              </Button>
+            )}
+          </div>
+        )}
+
         {isProcessing && (
           <div className="space-y-1">
             <div className="flex items-center justify-between text-xs text-muted-foreground">
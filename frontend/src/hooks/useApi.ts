@@ -1,29 +1,82 @@
-import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
-import { getVideos, getVideoById, ingestVideo, queryVideo, getVideoSuggestions } from '@/services/api'
-import type { IngestRequest, QueryRequest } from '@/services/api'
+import { useQuery, useInfiniteQuery, useMutation, useQueryClient } from '@tanstack/react-query'
+import type { InfiniteData, QueryClient } from '@tanstack/react-query'
+import {
+  getVideos, getVideoById, ingestVideo, deleteVideo, queryVideo, getVideoSuggestions, getAnalytics,
+  getProgressSocketUrl
+} from '@/services/api'
+import type { IngestRequest, QueryRequest, ProgressEvent, Video, VideoPage, VideoListParams } from '@/services/api'
 import toast from 'react-hot-toast'
 import { useEffect } from 'react'
 
-export const useVideos = () => {
+// Apply an update to the loaded pages of every cached video list
+const updateVideoPages = (queryClient: QueryClient, update: (videos: Video[]) => Video[]) => {
+  queryClient.setQueriesData<InfiniteData<VideoPage>>({ queryKey: ['videos'] }, (data) =>
+    data && { ...data, pages: data.pages.map(page => ({ ...page, videos: update(page.videos) })) }
+  )
+}
+
+// Pages through the library with the backend's keyset cursor; only the pages
+// loaded so far (via fetchNextPage) are refetched on invalidation
+export const useVideos = (params: VideoListParams = {}) => {
   const queryClient = useQueryClient()
   
-  const query = useQuery({
-    queryKey: ['videos'],
-    queryFn: getVideos,
+  const query = useInfiniteQuery({
+    queryKey: ['videos', params],
+    queryFn: ({ pageParam }) => getVideos(params, pageParam),
+    initialPageParam: null as string | null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor,
+    select: (data) => ({
+      videos: data.pages.flatMap(page => page.videos),
+      total: data.pages[0]?.total ?? 0,
+    }),
   })
 
-  // Auto-refresh every 2 seconds if there are processing videos
+  // Follow live progress over the WebSocket feed while anything is ingesting
+  const hasActiveVideos = !!query.data?.videos.some(v => v.status === 'processing' || v.status === 'pending')
+
   useEffect(() => {
-    const hasProcessingVideos = query.data?.some(v => v.status === 'processing')
-    
-    if (hasProcessingVideos) {
-      const interval = setInterval(() => {
+    if (!hasActiveVideos) return
+
+    const socket = new WebSocket(getProgressSocketUrl())
+
+    socket.onmessage = (message) => {
+      const data = JSON.parse(message.data)
+      if (data.type !== 'progress') return
+
+      const event = data as ProgressEvent & { type: string }
+      updateVideoPages(queryClient, (videos) =>
+        videos.map(v =>
+          v.video_id === event.video_id
+            ? {
+                ...v,
+                status: event.status ?? v.status,
+                progress_step: event.step ?? v.progress_step,
+                progress_percent: event.percent ?? v.progress_percent,
+              }
+            : v
+        )
+      )
+
+      // Metadata and counters change at the end of a job (or on deletion), so refetch once
+      if (event.status === 'completed' || event.status === 'failed' || event.status === 'deleted') {
         queryClient.invalidateQueries({ queryKey: ['videos'] })
-      }, 2000)
-      
-      return () => clearInterval(interval)
+        queryClient.invalidateQueries({ queryKey: ['analytics'] })
+      }
     }
-  }, [query.data, queryClient])
+
+    // Fall back to slow polling if the socket cannot be used
+    let fallback: ReturnType<typeof setInterval> | undefined
+    socket.onerror = () => {
+      fallback = setInterval(() => {
+        queryClient.invalidateQueries({ queryKey: ['videos'] })
+      }, 5000)
+    }
+
+    return () => {
+      socket.close()
+      if (fallback) clearInterval(fallback)
+    }
+  }, [hasActiveVideos, queryClient])
 
   return query
 }
@@ -43,6 +96,7 @@ export const useIngestVideo = () => {
     mutationFn: (data: IngestRequest) => ingestVideo(data),
     onSuccess: () => {
       queryClient.invalidateQueries({ queryKey: ['videos'] })
+      queryClient.invalidateQueries({ queryKey: ['analytics'] })
       toast.success('Video ingestion started!')
     },
     onError: (error: any) => {
@@ -51,6 +105,23 @@ export const useIngestVideo = () => {
   })
 }
 
+export const useDeleteVideo = () => {
+  const queryClient = useQueryClient()
+
+  return useMutation({
+    mutationFn: (videoId: string) => deleteVideo(videoId),
+    onSuccess: (_, videoId) => {
+      updateVideoPages(queryClient, (videos) => videos.filter(v => v.video_id !== videoId))
+      queryClient.removeQueries({ queryKey: ['video', videoId] })
+      queryClient.invalidateQueries({ queryKey: ['analytics'] })
+      toast.success('Video deleted')
+    },
+    onError: (error: any) => {
+      toast.error(error.response?.data?.detail || 'Failed to delete video')
+    },
+  })
+}
+
 export const useQueryVideo = () => {
   return useMutation({
     mutationFn: (data: QueryRequest) => queryVideo(data),
@@ -65,5 +136,22 @@ export const useVideoSuggestions = (videoId: string) => {
     queryKey: ['suggestions', videoId],
     queryFn: () => getVideoSuggestions(videoId),
     enabled: !!videoId,
+    // Suggestions are generated in the background after ingestion; poll for a few minutes
+    refetchInterval: (query) => {
+      const data = query.state.data
+      return data && data.length === 0 && query.state.dataUpdateCount < 60 ? 5000 : false
+    },
+  })
+}
+
+export const useAnalytics = () => {
+  return useQuery({
+    queryKey: ['analytics'],
+    queryFn: getAnalytics,
+    // Refresh while videos are being processed so counters stay current
+    refetchInterval: (query) => {
+      const counts = query.state.data?.status_counts
+      return counts && ((counts.processing || 0) + (counts.pending || 0)) > 0 ? 5000 : false
+    },
   })
 }
@@ -1,4 +1,4 @@
-import { useVideos } from '@/hooks/useApi'
+import { useAnalytics } from '@/hooks/useApi'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Skeleton } from '@/components/ui/skeleton'
 import { BarChart3, Video, CheckCircle2, Clock, TrendingUp } from 'lucide-react'
@@ -12,7 +12,7 @@ const STATUS_COLORS = {
 }
 
 export function AnalyticsPage() {
-  const { data: videos, isLoading } = useVideos()
+  const { data: analytics, isLoading } = useAnalytics()
 
   if (isLoading) {
     return (
@@ -37,12 +37,12 @@ export function AnalyticsPage() {
     )
   }
 
-  const totalVideos = videos?.length || 0
-  const completedVideos = videos?.filter(v => v.status === 'completed').length || 0
-  const processingVideos = videos?.filter(v => v.status === 'processing').length || 0
-  const failedVideos = videos?.filter(v => v.status === 'failed').length || 0
+  const totalVideos = analytics?.total_videos || 0
+  const completedVideos = analytics?.status_counts.completed || 0
+  const processingVideos = analytics?.status_counts.processing || 0
+  const failedVideos = analytics?.status_counts.failed || 0
 
-  const totalDuration = videos?.reduce((acc, v) => acc + (v.duration || 0), 0) || 0
+  const totalDuration = analytics?.total_duration || 0
   const totalHours = Math.floor(totalDuration / 3600)
   const totalMinutes = Math.floor((totalDuration % 3600) / 60)
 
@@ -52,21 +52,13 @@ export function AnalyticsPage() {
     { name: 'Failed', value: failedVideos, color: STATUS_COLORS.failed },
   ].filter(item => item.value > 0)
 
-  const recentVideos = videos
-    ?.sort((a, b) => new Date(b.created_at).getTime() - new Date(a.created_at).getTime())
-    .slice(0, 7)
-    .reverse()
-
-  const videosPerDay = recentVideos?.reduce((acc, video) => {
-    const date = new Date(video.created_at).toLocaleDateString('en-US', { month: 'short', day: 'numeric' })
-    const existing = acc.find(item => item.date === date)
-    if (existing) {
-      existing.count += 1
-    } else {
-      acc.push({ date, count: 1 })
-    }
-    return acc
-  }, [] as { date: string; count: number }[]) || []
+  const videosPerDay = analytics?.daily_ingestions.map(day => ({
+    date: new Date(`${day.date}T00:00:00`).toLocaleDateString('en-US', { month: 'short', day: 'numeric' }),
+    count: day.count,
+  })) || []
+
+  const topChannels = analytics?.top_channels || []
+  const stageTimings = analytics?.stage_timings.filter(stage => stage.stage !== 'transcribe_segment') || []
 
   return (
     <div className="max-w-6xl mx-auto space-y-6">
@@ -104,7 +96,7 @@ export function AnalyticsPage() {
           <CardContent>
             <div className="text-2xl font-bold">{completedVideos}</div>
             <p className="text-xs text-muted-foreground mt-1">
-              {totalVideos > 0 ? Math.round((completedVideos / totalVideos) * 100) : 0}% success rate
+              {Math.round(analytics?.success_rate || 0)}% success rate
             </p>
           </CardContent>
         </Card>
@@ -136,7 +128,7 @@ export function AnalyticsPage() {
               {totalHours > 0 ? `${totalHours}h ${totalMinutes}m` : `${totalMinutes}m`}
             </div>
             <p className="text-xs text-muted-foreground mt-1">
-              Indexed content
+              {analytics?.total_chunks || 0} chunks from {analytics?.total_segments || 0} segments
             </p>
           </CardContent>
         </Card>
@@ -216,6 +208,52 @@ export function AnalyticsPage() {
         </Card>
       </div>
 
+      {totalVideos > 0 && (
+        <div className="grid gap-6 md:grid-cols-2">
+          <Card>
+            <CardHeader>
+              <CardTitle>Top Channels</CardTitle>
+              <CardDescription>Channels with the most indexed videos</CardDescription>
+            </CardHeader>
+            <CardContent className="space-y-3">
+              {topChannels.length > 0 ? (
+                topChannels.map(channel => (
+                  <div key={channel.channel_name} className="flex items-center justify-between text-sm">
+                    <span className="truncate">{channel.channel_name}</span>
+                    <span className="text-muted-foreground whitespace-nowrap ml-4">
+                      {channel.completed_count}/{channel.video_count} videos · {Math.round(channel.total_duration / 60)}m
+                    </span>
+                  </div>
+                ))
+              ) : (
+                <p className="text-sm text-muted-foreground">No channel data yet</p>
+              )}
+            </CardContent>
+          </Card>
+
+          <Card>
+            <CardHeader>
+              <CardTitle>Ingestion Stages</CardTitle>
+              <CardDescription>Average time spent in each pipeline stage</CardDescription>
+            </CardHeader>
+            <CardContent className="space-y-3">
+              {stageTimings.length > 0 ? (
+                stageTimings.map(stage => (
+                  <div key={stage.stage} className="flex items-center justify-between text-sm">
+                    <span className="font-mono">{stage.stage}</span>
+                    <span className="text-muted-foreground whitespace-nowrap ml-4">
+                      {(stage.average_ms / 1000).toFixed(2)}s avg · {stage.run_count} runs
+                    </span>
+                  </div>
+                ))
+              ) : (
+                <p className="text-sm text-muted-foreground">No ingestion timings recorded yet</p>
+              )}
+            </CardContent>
+          </Card>
+        </div>
+      )}
+
       {totalVideos === 0 && (
         <Card>
           <CardContent className="pt-12 pb-12 flex flex-col items-center justify-center text-center space-y-4">
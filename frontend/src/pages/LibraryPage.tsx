@@ -2,10 +2,15 @@ import { useVideos } from '@/hooks/useApi'
 import { VideoCard } from '@/components/video/VideoCard'
 import { VideoCardSkeleton } from '@/components/video/VideoCardSkeleton'
 import { Card, CardContent } from '@/components/ui/card'
-import { AlertCircle, Library, VideoOff } from 'lucide-react'
+import { Button } from '@/components/ui/button'
+import { AlertCircle, Library, Loader2, VideoOff } from 'lucide-react'
 
 export function LibraryPage() {
-  const { data: videos, isLoading, isError, error } = useVideos()
+  const {
+    data: videoList, isLoading, isError, error, hasNextPage, fetchNextPage, isFetchingNextPage
+  } = useVideos()
+  const videos = videoList?.videos
+  const total = videoList?.total ?? 0
 
   if (isLoading) {
     return (
@@ -90,7 +95,7 @@ export function LibraryPage() {
             Video Library
           </h2>
           <p className="text-muted-foreground mt-2">
-            {videos.length} video{videos.length !== 1 ? 's' : ''} indexed
+            {total} video{total !== 1 ? 's' : ''} indexed
             {completedCount > 0 && ` • ${completedCount} ready to search`}
             {processingCount > 0 && ` • ${processingCount} processing`}
           </p>
@@ -102,6 +107,15 @@ export function LibraryPage() {
           <VideoCard key={video.video_id} video={video} />
         ))}
       </div>
+
+      {hasNextPage && (
+        <div className="flex justify-center">
+          <Button variant="outline" onClick={() => fetchNextPage()} disabled={isFetchingNextPage}>
+            {isFetchingNextPage && <Loader2 className="h-4 w-4 mr-2 animate-spin" />}
+            Load more
+          </Button>
+        </div>
+      )}
     </div>
   )
 }
@@ -22,12 +22,14 @@ export function SearchPage() {
   const [selectedVideoId, setSelectedVideoId] = useState<string>('')
   const scrollRef = useRef<HTMLDivElement>(null)
 
-  const { data: videos, isLoading: videosLoading } = useVideos()
+  const {
+    data: videoList, isLoading: videosLoading, hasNextPage, fetchNextPage, isFetchingNextPage
+  } = useVideos({ status: 'completed' })
   const queryMutation = useQueryVideo()
   const { data: suggestions } = useVideoSuggestions(selectedVideoId)
   const { messages, addMessage, currentVideoId, setCurrentVideoId } = useChatStore()
 
-  const completedVideos = videos?.filter(v => v.status === 'completed') || []
+  const completedVideos = videoList?.videos || []
 
   useEffect(() => {
     if (selectedVideoId && selectedVideoId !== currentVideoId) {
@@ -238,6 +240,17 @@ export function SearchPage() {
                   ))}
                 </SelectContent>
               </Select>
+              {hasNextPage && (
+                <Button
+                  variant="ghost"
+                  size="sm"
+                  className="w-full mt-2"
+                  onClick={() => fetchNextPage()}
+                  disabled={isFetchingNextPage}
+                >
+                  {isFetchingNextPage ? <Loader2 className="h-4 w-4 animate-spin" /> : 'Load more videos'}
+                </Button>
+              )}
             </CardContent>
           </Card>
 
@@ -2,6 +2,11 @@ import axios from 'axios'
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000'
 
+// Sent as X-Admin-Token on admin-only requests (deleting videos); unset hides those actions
+const ADMIN_TOKEN = import.meta.env.VITE_ADMIN_TOKEN
+
+export const adminEnabled = !!ADMIN_TOKEN
+
 export const api = axios.create({
   baseURL: API_BASE_URL,
   headers: {
@@ -9,6 +14,33 @@ export const api = axios.create({
   },
 })
 
+export interface ProgressEvent {
+  video_id: string
+  status?: string
+  step?: string | null
+  percent?: number | null
+  error?: string
+  ts: number
+}
+
+// WebSocket URL for the multiplexed ingestion progress feed
+export const getProgressSocketUrl = (): string =>
+  `${API_BASE_URL.replace(/^http/, 'ws')}/ws/progress`
+
+export type TranscriptExportFormat = 'srt' | 'vtt' | 'jsonl'
+
+// Streamed download URL for a video's transcript (or a time range of it)
+export const getTranscriptExportUrl = (
+  videoId: string,
+  format: TranscriptExportFormat,
+  range: { start?: number; end?: number } = {}
+): string => {
+  const params = new URLSearchParams({ format })
+  if (range.start !== undefined) params.set('start', String(range.start))
+  if (range.end !== undefined) params.set('end', String(range.end))
+  return `${API_BASE_URL}/videos/${videoId}/transcript?${params}`
+}
+
 export interface IngestRequest {
   youtube_url: string
 }
@@ -48,12 +80,41 @@ export interface Video {
   channel_name?: string
   upload_date?: string
   view_count?: number
+  language?: string
   status: string
   progress_step?: string
   progress_percent?: number
   created_at: string
 }
 
+export interface ChannelStats {
+  channel_name: string
+  video_count: number
+  completed_count: number
+  total_duration: number
+}
+
+export interface StageTiming {
+  stage: string
+  run_count: number
+  average_ms: number
+  max_ms: number
+}
+
+export interface Analytics {
+  total_videos: number
+  status_counts: Record<string, number>
+  success_rate: number
+  total_duration: number
+  completed_duration: number
+  average_duration: number
+  total_chunks: number
+  total_segments: number
+  top_channels: ChannelStats[]
+  stage_timings: StageTiming[]
+  daily_ingestions: { date: string; count: number }[]
+}
+
 // Ingest a new video
 export const ingestVideo = async (data: IngestRequest): Promise<IngestResponse> => {
   const response = await api.post('/ingest/', data)
@@ -66,11 +127,26 @@ export const queryVideo = async (data: QueryRequest): Promise<QueryResponse> =>
   return response.data
 }
 
-// Get all videos
-export const getVideos = async (): Promise<Video[]> => {
-  const response = await api.get('/videos/')
-  // Backend returns { videos: [...], total: number }
-  return response.data.videos || []
+export interface VideoPage {
+  videos: Video[]
+  total: number  // Videos matching the filters, across all pages
+  next_cursor: string | null
+}
+
+export interface VideoListParams {
+  status?: string
+  limit?: number
+}
+
+// Get one page of videos, newest first (pass the previous page's next_cursor to continue)
+export const getVideos = async (
+  params: VideoListParams = {},
+  cursor: string | null = null
+): Promise<VideoPage> => {
+  const response = await api.get('/videos/', {
+    params: { limit: 50, ...params, ...(cursor ? { cursor } : {}) },
+  })
+  return response.data
 }
 
 // Get video by ID
@@ -79,8 +155,19 @@ export const getVideoById = async (videoId: string): Promise<Video> => {
   return response.data
 }
 
+// Delete a video with its transcript, chunks and vectors
+export const deleteVideo = async (videoId: string): Promise<void> => {
+  await api.delete(`/videos/${videoId}`, { headers: { 'X-Admin-Token': ADMIN_TOKEN } })
+}
+
 // Get suggested questions for a video
 export const getVideoSuggestions = async (videoId: string): Promise<QuestionSuggestion[]> => {
   const response = await api.get(`/videos/${videoId}/suggestions`)
   return response.data
 }
+
+// Get aggregated library analytics
+export const getAnalytics = async (): Promise<Analytics> => {
+  const response = await api.get('/analytics')
+  return response.data
+}
@@ -7,6 +7,7 @@ export interface Video {
   channel_name?: string
   upload_date?: string
   view_count?: number
+  language?: string
   status: 'pending' | 'processing' | 'completed' | 'failed' | string
   progress_step?: string
   progress_percent?: number
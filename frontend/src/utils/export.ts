@@ -1,4 +1,5 @@
 import type { ChatMessage } from '@/types'
+import { getTranscriptExportUrl, type TranscriptExportFormat } from '@/services/api'
 
 interface ExportOptions {
   format: 'markdown' | 'text'
@@ -93,3 +94,17 @@ export function downloadFile(content: string, filename: string) {
   document.body.removeChild(a)
   URL.revokeObjectURL(url)
 }
+
+// The server streams the file, so the browser writes it to disk as it arrives
+export function downloadTranscript(
+  videoId: string,
+  format: TranscriptExportFormat,
+  range: { start?: number; end?: number } = {}
+) {
+  const a = document.createElement('a')
+  a.href = getTranscriptExportUrl(videoId, format, range)
+  a.download = `${videoId}.${format}`
+  document.body.appendChild(a)
+  a.click()
+  document.body.removeChild(a)
+}